@@ -1,10 +1,19 @@
 import unittest
+import os
+import tempfile
+import hmac
+import io
+import math
+import time
+import jslcomplete
+import json
+import re
 import logging
-from datetime import datetime
+from datetime import datetime, timezone
 import requests
 from jira import JIRAError
 from unittest.mock import MagicMock, patch, call, mock_open, Mock
-from jirasimplelib import read_config, create_jira_connection, create_jira_project, update_jira_project, delete_all_projects, get_stories_for_project, delete_all_stories_in_project, create_story, update_story_summary, update_story_status, update_story_description, add_comment_to_issues_in_range, read_story_details, delete_story, create_epic, update_epic, read_epic_details, add_story_to_epic, unlink_story_from_epic, delete_epic, list_epics, create_sprint, move_issues_to_sprint, start_sprint, get_stories_in_sprint, complete_stories_in_sprint, complete_sprint, get_sprints_for_board, update_sprint_summary, sprint_report, get_velocity, delete_sprint, delete_all_sprints, create_board, get_board_id
+from jirasimplelib import read_config, create_jira_connection, create_jira_project, update_jira_project, delete_all_projects, get_stories_for_project, delete_all_stories_in_project, create_story, update_story_summary, update_story_status, update_story_description, read_story_details, delete_story, create_epic, update_epic, read_epic_details, add_story_to_epic, unlink_story_from_epic, delete_epic, list_epics, create_sprint, move_issues_to_sprint, start_sprint, get_stories_in_sprint, complete_stories_in_sprint, complete_sprint, get_sprints_for_board, update_sprint_summary, sprint_report, delete_sprint, delete_all_sprints, create_board, get_board_id, ApiProfiler, ResponseCache, IssueRecord, search_issue_records, iter_json_array, issue_keys_in_range, resolve_issue_keys, BulkJournal, journal_path, IssueStore, LiveTable, WebhookReceiver, use_issue_store, load_sites, SiteOutput, IssueSearchIndex, parse_arguments, requested_commands, parse_jql, UnsupportedJql, DETAIL_FIELDS, completion_options, SessionStore, issue_transitions, TransitionArrays, issue_cycle_times, burndown, _remember_arguments, planned_sprints, main as jirasimplelib_main
 
 class TestReadConfig(unittest.TestCase):
     @patch('builtins.open', new_callable=mock_open, read_data='{"key": "value"}')
@@ -229,7 +238,7 @@ class TestDeleteAllStoriesInProject(unittest.TestCase):
     def test_delete_all_stories_in_project_failure(self, mock_logging):
         # Mock JIRA instance
         mock_jira = MagicMock()
-        mock_jira.search_issues.side_effect = Exception("Test Error")
+        mock_jira._session.get.side_effect = Exception("Test Error")
 
         # Call the function under test
         with self.assertRaises(Exception) as context:
@@ -237,21 +246,25 @@ class TestDeleteAllStoriesInProject(unittest.TestCase):
 
         # Assertions
         self.assertEqual(str(context.exception), "Test Error")
-        mock_jira.search_issues.assert_called_once_with('project=PROJECT_KEY')
+        self.assertEqual(mock_jira._session.get.call_args[1]['params']['jql'], 'project=PROJECT_KEY')
         mock_logging.error.assert_called_once_with("Error deleting stories in project: Test Error")
     @patch('jirasimplelib.logging')
     def test_delete_all_stories_in_project_success(self, mock_logging):
         # Mock JIRA instance
         mock_jira = MagicMock()
-        mock_issues = [MagicMock(key='ISSUE1'), MagicMock(key='ISSUE2')]  # Mock issues
-        mock_jira.search_issues.return_value = mock_issues
+        mock_jira._get_url.side_effect = lambda path: f"https://jira/rest/api/2/{path}"
+        mock_jira._session.get.return_value.iter_content.return_value = [
+            b'{"total": 2, "issues": [{"key": "ISSUE1"}, {"key": "ISSUE2"}]}'
+        ]  # Mock issues
 
         # Call the function under test
         result = delete_all_stories_in_project(mock_jira, 'PROJECT_KEY')
 
         # Assertions
         self.assertTrue(result)
-        mock_jira.search_issues.assert_called_once_with('project=PROJECT_KEY')
+        self.assertEqual(mock_jira._session.get.call_args[1]['params']['jql'], 'project=PROJECT_KEY')
+        mock_jira._session.delete.assert_any_call("https://jira/rest/api/2/issue/ISSUE1")
+        mock_jira._session.delete.assert_any_call("https://jira/rest/api/2/issue/ISSUE2")
         mock_logging.info.assert_any_call("Story deleted successfully. Key: ISSUE1")
         mock_logging.info.assert_any_call("Story deleted successfully. Key: ISSUE2")
         mock_logging.info.assert_called_with("All stories in Project PROJECT_KEY have been deleted.")
@@ -485,6 +498,25 @@ class TestReadStoryDetails(unittest.TestCase):
         ]
         for log_message in expected_logs:
             mock_logging.info.assert_any_call(log_message)
+
+    @patch('jirasimplelib.logging')
+    def test_read_story_details_sections(self, mock_logging):
+        jira = MagicMock()
+        story = jira.issue.return_value
+        story.key = 'STORY1'
+        comment = MagicMock(created='2024-02-28', body='Ready for review')
+        comment.author.displayName = 'Jane Smith'
+        story.fields.comment.comments = [comment]
+        link = MagicMock(spec=['type', 'outwardIssue'])
+        link.type.outward = 'blocks'
+        link.outwardIssue.key = 'STORY2'
+        story.fields.issuelinks = [link]
+        story.fields.subtasks = []
+        story.changelog.histories = []
+        read_story_details(jira, 'STORY1')
+        jira.issue.assert_called_once_with('STORY1', fields=','.join(DETAIL_FIELDS), expand='changelog,renderedFields')
+        mock_logging.info.assert_any_call("Comment: Jane Smith (2024-02-28): Ready for review")
+        mock_logging.info.assert_any_call("Link: blocks STORY2")
 def test_read_story_details_failure(self):
         # Mocking story details retrieval failure
         from jira import JIRAError
@@ -739,11 +771,14 @@ class TestGetStoriesInSprint(unittest.TestCase):
         # Mock the jira object
         jira_mock = MagicMock()
 
-        # Mock the search_issues method
-        jira_mock.search_issues.return_value = [
-            MagicMock(key="JST-1", fields=MagicMock(summary="Story 1")),
-            MagicMock(key="JST-2", fields=MagicMock(summary="Story 2"))
-        ]
+        # Mock the streamed search response (one page of raw JSON)
+        jira_mock._session.get.return_value.iter_content.return_value = [json.dumps({
+            "total": 2,
+            "issues": [
+                {"key": "JST-1", "fields": {"summary": "Story 1"}},
+                {"key": "JST-2", "fields": {"summary": "Story 2"}},
+            ],
+        }).encode()]
 
         # Call the function with mock objects
         sprint_id = "SPRINT-1"
@@ -752,14 +787,15 @@ class TestGetStoriesInSprint(unittest.TestCase):
         # Assertions
         self.assertIsNotNone(stories)  # Ensure that stories are not None
         self.assertEqual(len(stories), 2)  # Ensure that two stories are returned
-        jira_mock.search_issues.assert_called_once_with(f'sprint = {sprint_id} AND issuetype = Task')  # Ensure search_issues is called with the correct JQL
+        jira_mock._session.get.assert_called_once()
+        self.assertEqual(jira_mock._session.get.call_args[1]['params']['jql'], f'sprint = {sprint_id} AND issuetype = Task')  # Ensure search_issues is called with the correct JQL
 
     def test_no_stories_in_sprint(self):
         # Mock the jira object
         jira_mock = MagicMock()
 
-        # Mock the search_issues method to return an empty list
-        jira_mock.search_issues.return_value = []
+        # Mock the streamed search response with an empty page
+        jira_mock._session.get.return_value.iter_content.return_value = [b'{"total": 0, "issues": []}']
 
         # Call the function with mock objects
         sprint_id = "SPRINT-1"
@@ -768,7 +804,8 @@ class TestGetStoriesInSprint(unittest.TestCase):
         # Assertions
         self.assertIsNotNone(stories)  # Ensure that stories are not None
         self.assertEqual(len(stories), 0)  # Ensure that no stories are returned
-        jira_mock.search_issues.assert_called_once_with(f'sprint = {sprint_id} AND issuetype = Task')  # Ensure search_issues is called with the correct JQL
+        jira_mock._session.get.assert_called_once()
+        self.assertEqual(jira_mock._session.get.call_args[1]['params']['jql'], f'sprint = {sprint_id} AND issuetype = Task')  # Ensure search_issues is called with the correct JQL
 # #complete sprint
 class TestCompleteSprint(unittest.TestCase):
     def test_complete_sprint_success(self):
@@ -848,5 +885,563 @@ class TestDeleteAllProjects(unittest.TestCase):
         self.assertFalse(result)  # Deletion should fail due to exception
         jira_mock.projects.assert_called_once()  # Ensure projects is called
 
+class TestApiProfiler(unittest.TestCase):
+    def test_record_groups_by_endpoint(self):
+        profiler = ApiProfiler()
+
+        profiler.record('GET', 'https://x.atlassian.net/rest/api/2/issue/PROJ-1', 200, 0.02, 100, function='read_story_details')
+        profiler.record('GET', 'https://x.atlassian.net/rest/api/2/issue/PROJ-2?fields=summary', 200, 0.3, 50, function='read_story_details')
+        profiler.record('POST', 'https://x.atlassian.net/rest/agile/1.0/sprint/12/issue', 503, 0.01, 0, function='move_issues_to_sprint')
+
+        report = profiler.report()
+        self.assertEqual(report['requests'], 3)
+        self.assertEqual(report['bytes'], 150)
+        issue_stats = report['endpoints']['GET /rest/api/2/issue/{key}']
+        self.assertEqual(issue_stats['calls'], 2)
+        self.assertEqual(issue_stats['histogram']['<=50ms'], 1)
+        self.assertEqual(issue_stats['histogram']['<=500ms'], 1)
+        sprint_stats = report['endpoints']['POST /rest/agile/1.0/sprint/{id}/issue']
+        self.assertEqual(sprint_stats['errors'], 1)
+        self.assertEqual(sprint_stats['retries'], 1)
+        self.assertEqual(report['functions']['read_story_details']['calls'], 2)
+
+    def test_instrument_records_session_calls(self):
+        session = requests.Session()
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b'{"key": "PROJ-1"}'
+        session.send = MagicMock(return_value=response)
+        profiler = ApiProfiler()
+        profiler.instrument(session)
+
+        session.get('https://x.atlassian.net/rest/api/2/issue/PROJ-1')
+
+        report = profiler.report()
+        self.assertEqual(report['endpoints']['GET /rest/api/2/issue/{key}']['bytes'], 17)
+
+class TestBenchmarkCompare(unittest.TestCase):
+    def test_compare_flags_request_growth(self):
+        from benchmark import compare
+        baseline = [{'command': 'get_members', 'issues': 1000, 'wall_s': 1.0, 'requests': 11, 'peak_kb': 100.0}]
+        results = [{'command': 'get_members', 'issues': 1000, 'wall_s': 1.1, 'requests': 12, 'peak_kb': 100.0}]
+
+        regressions = compare(results, baseline, 0.25)
+
+        self.assertEqual(regressions, ['get_members (1000 issues): requests 11 -> 12'])
+
+    def test_compare_within_tolerance(self):
+        from benchmark import compare
+        baseline = [{'command': 'get_members', 'issues': 1000, 'wall_s': 1.0, 'requests': 11, 'peak_kb': 100.0}]
+        results = [{'command': 'get_members', 'issues': 1000, 'wall_s': 1.2, 'requests': 11, 'peak_kb': 120.0}]
+
+        self.assertEqual(compare(results, baseline, 0.25), [])
+
+class TestResponseCache(unittest.TestCase):
+    def make_response(self, url, headers=None):
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response.headers.update(headers or {})
+        response._content = b'{"id": 1}'
+        return response
+
+    def test_entry_without_validators_is_fresh_within_ttl(self):
+        cache = ResponseCache(ttl=60)
+        entry = cache.put('k', self.make_response('https://x.atlassian.net/rest/agile/1.0/sprint/1'))
+        self.assertTrue(cache.is_fresh(entry))
+        entry['stored_at'] -= 61
+        self.assertFalse(cache.is_fresh(entry))
+
+    def test_entry_with_etag_is_always_revalidated(self):
+        cache = ResponseCache(ttl=60)
+        entry = cache.put('k', self.make_response('https://x.atlassian.net/rest/api/2/project', {'ETag': '"abc"'}))
+        self.assertFalse(cache.is_fresh(entry))
+        self.assertEqual(entry['etag'], '"abc"')
+
+    def test_lru_eviction(self):
+        cache = ResponseCache(max_entries=2)
+        for key in ('a', 'b', 'c'):
+            cache.put(key, self.make_response(f'https://x.atlassian.net/rest/api/2/issue/P-{key}'))
+        self.assertEqual(list(cache.entries), ['b', 'c'])
+
+    def test_write_invalidates_family(self):
+        cache = ResponseCache()
+        cache.put('issue', self.make_response('https://x.atlassian.net/rest/api/2/issue/P-1'))
+        cache.put('project', self.make_response('https://x.atlassian.net/rest/api/2/project'))
+        cache.invalidate_for_write('https://x.atlassian.net/rest/api/2/issue/10001')
+        self.assertEqual(list(cache.entries), ['project'])
+
+class TestIssueRecord(unittest.TestCase):
+    def test_from_json(self):
+        record = IssueRecord.from_json({
+            "id": "10001",
+            "key": "JST-1",
+            "fields": {
+                "issuetype": {"name": "Task"},
+                "status": {"name": "Done"},
+                "assignee": {"displayName": "Jane Doe"},
+                "summary": "Story 1",
+            },
+        })
+        self.assertEqual(record.key, "JST-1")
+        self.assertEqual(record.status, "Done")
+        self.assertEqual(record.get("Assignee"), "Jane Doe")
+        self.assertEqual(record.get("Issue Type"), "Task")
+        self.assertIsNone(record.due_date)
+        with self.assertRaises(AttributeError):
+            record.extra = 1
+
+    def test_search_issue_records_pages_until_total(self):
+        jira_mock = MagicMock()
+        pages = [
+            {"total": 3, "issues": [{"key": "JST-1"}, {"key": "JST-2"}]},
+            {"total": 3, "issues": [{"key": "JST-3"}]},
+        ]
+        jira_mock._session.get.side_effect = [
+            MagicMock(iter_content=MagicMock(return_value=[json.dumps(page).encode()]))
+            for page in pages
+        ]
+        records = list(search_issue_records(jira_mock, "project = JST", ("summary",), page_size=2))
+        self.assertEqual([record.key for record in records], ["JST-1", "JST-2", "JST-3"])
+        self.assertEqual(jira_mock._session.get.call_args[1]["params"]["startAt"], 2)
+
+    def test_search_issue_records_prefetches_pages_in_order(self):
+        jira_mock = MagicMock()
+        pages = {
+            start: {"total": 5, "issues": [{"key": f"JST-{n}"} for n in range(start + 1, min(start + 2, 5) + 1)]}
+            for start in range(0, 5, 2)
+        }
+        jira_mock._session.get.side_effect = lambda url, params, stream: MagicMock(
+            iter_content=MagicMock(return_value=[json.dumps(pages[params["startAt"]]).encode()])
+        )
+        records = list(search_issue_records(jira_mock, "project = JST", ("summary",), page_size=2, workers=3))
+        self.assertEqual([record.key for record in records], ["JST-1", "JST-2", "JST-3", "JST-4", "JST-5"])
+        self.assertEqual(jira_mock._session.get.call_count, 3)
+
+    def test_resolve_issue_keys_in_chunks(self):
+        jira_mock = MagicMock()
+        jira_mock._session.get.side_effect = lambda url, params, stream: MagicMock(
+            iter_content=MagicMock(return_value=[json.dumps({"total": 1, "issues": [{"key": "JST-2"}]}).encode()])
+        )
+        keys = issue_keys_in_range("JST", "JST-1", "JST-5")
+        self.assertEqual(keys, ["JST-1", "JST-2", "JST-3", "JST-4", "JST-5"])
+        records = list(resolve_issue_keys(jira_mock, keys, chunk_size=3))
+        self.assertEqual(len(records), 2)
+        first, second = [c[1]["params"] for c in jira_mock._session.get.call_args_list]
+        self.assertEqual(first["jql"], "key in (JST-1, JST-2, JST-3) ORDER BY key ASC")
+        self.assertEqual(second["jql"], "key in (JST-4, JST-5) ORDER BY key ASC")
+        self.assertEqual(first["validateQuery"], "warn")
+
+    def test_iter_json_array_across_chunk_boundaries(self):
+        page = {"startAt": 0, "issues": [{"key": "JST-1", "fields": {"summary": "Caf\u00e9"}}, {"key": "JST-2"}], "total": 12345}
+        data = json.dumps(page, ensure_ascii=False).encode()
+        header = {}
+        issues = list(iter_json_array([data[i:i + 3] for i in range(0, len(data), 3)], "issues", header))
+        self.assertEqual(issues, page["issues"])
+        self.assertEqual(header, {"startAt": 0, "total": 12345})
+
+class TestBulkJournal(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = journal_path(self.directory.name, "move_issues_to_sprint", "JST", "JST-1", "JST-9", 3)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_resume_skips_completed_items(self):
+        journal = BulkJournal(self.path)
+        journal.plan(["JST-1", "JST-2", "JST-3"])
+        journal.complete(["JST-1"])
+        journal.close()
+        with open(self.path, "a") as f:
+            f.write('{"event": "completed", "items": ["JS')  # torn by a crash
+        resumed = BulkJournal(self.path, resume=True)
+        self.assertEqual(resumed.remaining(), ["JST-2", "JST-3"])
+        resumed.close()
+
+    def test_finished_or_fresh_journal_starts_over(self):
+        journal = BulkJournal(self.path)
+        journal.plan(["JST-1"])
+        journal.complete(["JST-1"])
+        journal.finish()
+        self.assertIsNone(BulkJournal(self.path, resume=True).planned)
+        self.assertIsNone(BulkJournal(self.path).planned)
+        self.assertTrue(os.path.basename(self.path).startswith("move_issues_to_sprint-JST-JST-1"))
+
+class TestIssueStoreAndLiveTable(unittest.TestCase):
+    def record(self, key, status):
+        return IssueRecord(key=key, status=status, summary=f"Summary {key}")
+
+    def test_store_notifies_only_on_change(self):
+        store = IssueStore()
+        events = []
+        store.subscribe(lambda event, old, new: events.append((event, (old or new).key)))
+        self.assertTrue(store.upsert(self.record("JST-1", "To Do")))
+        self.assertFalse(store.upsert(self.record("JST-1", "To Do")))
+        self.assertTrue(store.upsert(self.record("JST-1", "Done")))
+        self.assertTrue(store.remove("JST-1"))
+        self.assertEqual(events, [("upsert", "JST-1"), ("upsert", "JST-1"), ("remove", "JST-1")])
+
+    @patch('builtins.print')
+    def test_live_table_redraws_changed_lines(self, mock_print):
+        term = MagicMock(width=80, height=24)
+        table = LiveTable(term)
+        self.assertEqual(table.draw(["a", "b", "c"]), 3)
+        self.assertEqual(table.draw(["a", "B", "c"]), 1)
+        self.assertEqual(table.draw(["a"]), 2)
+
+    def test_aggregates_follow_store_changes(self):
+        store = IssueStore()
+        store.upsert(IssueRecord(key="JST-1", status="To Do", assignee="Ann", sprint_ids=(7,)))
+        store.upsert(IssueRecord(key="JST-2", status="To Do", sprint_ids=(7,)))
+        aggregates = store.aggregates()
+        self.assertEqual(aggregates.count(("project", "JST"), "status"), {"To Do": 2})
+        store.upsert(IssueRecord(key="JST-2", status="Done", assignee="Ann", sprint_ids=(7,)))
+        self.assertEqual(aggregates.count(("sprint", 7), "status"), {"To Do": 1, "Done": 1})
+        self.assertEqual(aggregates.count(("project", "JST"), "assignee"), {"Ann": 2})
+        store.remove("JST-1")
+        self.assertEqual(aggregates.count(("project", "JST"), "status"), {"Done": 1})
+
+class TestWebhookReceiver(unittest.TestCase):
+    # Trimmed copies of payloads Jira Cloud sent to a test webhook
+    ISSUE_UPDATED = {
+        "timestamp": 1711963385000,
+        "webhookEvent": "jira:issue_updated",
+        "issue_event_type_name": "issue_generic",
+        "issue": {
+            "id": "10042",
+            "key": "JST-42",
+            "fields": {
+                "issuetype": {"name": "Task"},
+                "status": {"name": "In Progress"},
+                "assignee": {"displayName": "Jane Doe"},
+                "summary": "Updated from a webhook",
+                "customfield_10020": [{"id": 7, "name": "JST Sprint 7", "state": "active", "boardId": 1}],
+            },
+        },
+        "changelog": {"items": [{"field": "status", "fromString": "To Do", "toString": "In Progress"}]},
+    }
+    ISSUE_DELETED = {"webhookEvent": "jira:issue_deleted", "issue": {"id": "10042", "key": "JST-42", "fields": {}}}
+    SPRINT_CLOSED = {"webhookEvent": "sprint_closed", "sprint": {"id": 7, "state": "closed"}}
+
+    def setUp(self):
+        self.store = IssueStore()
+        self.cache = ResponseCache()
+        self.receiver = WebhookReceiver(self.store, self.cache, secret="s3cret").start()
+
+    def tearDown(self):
+        self.receiver.stop()
+
+    def post(self, payload, secret="s3cret"):
+        body = json.dumps(payload).encode()
+        signature = "sha256=" + hmac.new(secret.encode(), body, "sha256").hexdigest()
+        return requests.post(self.receiver.url, data=body, headers={"X-Hub-Signature": signature})
+
+    def test_issue_events_update_store(self):
+        self.assertEqual(self.post(self.ISSUE_UPDATED).json(), {"applied": True})
+        record = self.store.get("JST-42")
+        self.assertEqual((record.status, record.sprint_ids), ("In Progress", (7,)))
+        self.post(self.ISSUE_DELETED)
+        self.assertNotIn("JST-42", self.store)
+
+    def test_sprint_event_invalidates_cache(self):
+        response = requests.Response()
+        response.status_code = 200
+        response.url = 'https://x.atlassian.net/rest/agile/1.0/sprint/7'
+        response._content = b'{}'
+        self.cache.put('sprint', response)
+        self.post(self.SPRINT_CLOSED)
+        self.assertEqual(len(self.cache.entries), 0)
+
+    def test_rejects_bad_signature(self):
+        self.assertEqual(self.post(self.ISSUE_UPDATED, secret="wrong").status_code, 401)
+        self.assertNotIn("JST-42", self.store)
+
+class TestSites(unittest.TestCase):
+    def test_load_sites(self):
+        with tempfile.TemporaryDirectory() as directory:
+            config = {"jira_url": "https://a.atlassian.net", "user": "u", "api_token": "t"}
+            with open(os.path.join(directory, "a.json"), "w") as f:
+                json.dump(config, f)
+            with open(os.path.join(directory, "sites.json"), "w") as f:
+                json.dump({"sites": ["a.json", dict(config, name="b")]}, f)
+            sites = load_sites([os.path.join(directory, "a.json"), os.path.join(directory, "sites.json")])
+        self.assertEqual([name for name, _ in sites], ["a.atlassian.net", "a.atlassian.net-2", "b"])
+        self.assertEqual(sites[2][1]["name"], "b")
+
+    def test_site_output_writes_whole_tagged_lines(self):
+        stream = io.StringIO()
+        output = SiteOutput(stream)
+        output.tag("a")
+        output.write("first ")
+        self.assertEqual(stream.getvalue(), "")
+        output.write("line\nsecond")
+        output.untag()
+        output.write("untagged\n")
+        self.assertEqual(stream.getvalue(), "[a] first line\n[a] second\nuntagged\n")
+
+    def test_site_output_tags_log_records_once(self):
+        output = SiteOutput(io.StringIO())
+        logger = logging.getLogger("jirasimplelib-sites-test")
+        logger.propagate = False
+        streams = [io.StringIO(), io.StringIO()]
+        handlers = [logging.StreamHandler(stream) for stream in streams]
+        for handler in handlers:
+            handler.addFilter(output.tag_record)
+            logger.addHandler(handler)
+        try:
+            output.tag("a")
+            logger.error("Failed %s", "twice")
+            output.untag()
+        finally:
+            for handler in handlers:
+                logger.removeHandler(handler)
+        self.assertEqual([stream.getvalue() for stream in streams], ["[a] Failed twice\n"] * 2)
+
+class TestIssueSearchIndex(unittest.TestCase):
+    def issue(self, issue_id, summary, description=None, comments=()):
+        return {
+            "id": str(issue_id),
+            "key": f"JST-{issue_id}",
+            "fields": {
+                "summary": summary,
+                "description": description,
+                "comment": {"comments": [{"body": body} for body in comments]},
+            },
+        }
+
+    def setUp(self):
+        self.index = IssueSearchIndex(":memory:")
+        self.index.add(
+            self.issue(1, "Login page times out", comments=["Seen on staging"]),
+            self.issue(2, "Update docs", "The login flow changed"),
+            self.issue(3, "Billing export", {"type": "doc", "content": [{"type": "paragraph", "content": [{"type": "text", "text": "CSV timeouts on login"}]}]}),
+        )
+
+    def tearDown(self):
+        self.index.close()
+
+    def test_summary_matches_rank_first(self):
+        self.assertEqual([hit["key"] for hit in self.index.search("login")], ["JST-1", "JST-2", "JST-3"])
+        self.assertEqual([hit["key"] for hit in self.index.search("staging")], ["JST-1"])
+        self.assertEqual([hit["key"] for hit in self.index.search("time*")], ["JST-1", "JST-3"])
+
+    def test_updates_and_removals(self):
+        self.index.add(self.issue(2, "Update docs", "Nothing about signing in"))
+        self.assertEqual([hit["key"] for hit in self.index.search("login")], ["JST-1", "JST-3"])
+        self.assertTrue(self.index.remove("JST-1"))
+        self.assertEqual(self.index.retain("JST", ["2"]), 1)
+        self.assertEqual(len(self.index), 1)
+
+    def test_search_needs_no_connection(self):
+        parser = parse_arguments()
+        self.assertEqual(requested_commands(parser, parser.parse_args(["--search", "login"])), [])
+        self.assertEqual(
+            requested_commands(parser, parser.parse_args(["--search", "login", "--list-projects"])),
+            ["list_projects"],
+        )
+
+class TestLocalJql(unittest.TestCase):
+    def setUp(self):
+        self.store = IssueStore()
+        for number, issue_type, status, assignee, sprint_ids in [
+            (1, "Task", "To Do", "Ann", (7,)),
+            (2, "Bug", "Done", None, (7,)),
+            (3, "Task", "In Progress", "Bob", ()),
+            (10, "Task", "Done", "Ann", (8,)),
+        ]:
+            self.store.upsert(IssueRecord(
+                key=f"JST-{number}", issue_type=issue_type, status=status, assignee=assignee,
+                assignee_ids=(assignee.lower(),) if assignee else (), summary=f"{issue_type} {number}",
+                sprint_ids=sprint_ids,
+            ))
+
+    def keys(self, jql_query):
+        return [record.key for record in parse_jql(jql_query).run(self.store)]
+
+    def test_clauses(self):
+        self.assertEqual(self.keys("project = JST AND issuetype = Task AND assignee = ann"), ["JST-1", "JST-10"])
+        self.assertEqual(self.keys("sprint in (7, 8) AND status != Done"), ["JST-1"])
+        self.assertEqual(self.keys("project = JST AND (assignee is EMPTY OR summary ~ 'task 3')"), ["JST-2", "JST-3"])
+        self.assertEqual(self.keys("project = JST AND NOT status in ('To Do', Done) ORDER BY key DESC"), ["JST-3"])
+        self.assertEqual(self.keys("project = JST ORDER BY status, key DESC"), ["JST-10", "JST-2", "JST-3", "JST-1"])
+
+    def test_empty_values_sort_as_greatest(self):
+        self.assertEqual(self.keys("project = JST ORDER BY assignee"), ["JST-1", "JST-10", "JST-3", "JST-2"])
+        self.assertEqual(self.keys("project = JST ORDER BY assignee DESC"), ["JST-2", "JST-3", "JST-1", "JST-10"])
+
+    def test_summary_words(self):
+        self.assertEqual(self.keys("summary ~ tas"), [])
+        self.assertEqual(self.keys("summary ~ 'tas*'"), ["JST-1", "JST-3", "JST-10"])
+        self.assertEqual(self.keys("summary ~ 1"), ["JST-1"])
+        self.assertEqual(self.keys("summary !~ task"), ["JST-2"])
+        self.store.upsert(IssueRecord(key="JST-4", issue_type="Task", status="Done", summary=None))
+        self.assertEqual(self.keys("summary is EMPTY"), ["JST-4"])
+        self.assertEqual(self.keys("summary is not EMPTY"), ["JST-1", "JST-2", "JST-3", "JST-10"])
+
+    def test_index_follows_store(self):
+        self.assertEqual(self.keys("status = Done"), ["JST-2", "JST-10"])
+        self.store.upsert(IssueRecord(key="JST-1", issue_type="Task", status="Done", sprint_ids=(7,)))
+        self.store.remove("JST-2")
+        self.assertEqual(self.keys("status = Done"), ["JST-1", "JST-10"])
+
+    def test_unsupported_jql(self):
+        for jql_query in ("assignee = currentUser()", "project = JST AND updated >= -5m", "status = Done ORDER BY rank", "summary = x"):
+            with self.assertRaises(UnsupportedJql):
+                parse_jql(jql_query)
+
+    def test_scopes(self):
+        self.assertEqual(list(parse_jql("project = jst AND sprint = 7").scopes()), [[("project", "JST")], [("sprint", 7)]])
+        self.assertEqual(list(parse_jql("project = JST OR sprint = 7").scopes()), [])
+        # A store synced for "jst" holds the project whatever the query's case
+        self.store.scopes[("project", "JST")] = self.store.scopes[("sprint", 7)] = 0
+        self.assertTrue(self.store.covers(("project", "jst")))
+        self.assertTrue(self.store.covers(("sprint", "7")))
+
+class TestCompletion(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "completion.json")
+        self.index = jslcomplete.update_index(
+            self.path,
+            options=completion_options(parse_arguments()),
+            values={"project": ["JST", "OTHER"], "issue": ["JST-1", "JST-2", "OTHER-1"], "sprint": ["7"]},
+        )
+
+    def test_update_index_keeps_most_recent_first(self):
+        with patch("jslcomplete.COMPLETION_LIMIT", 3):
+            index = jslcomplete.update_index(self.path, values={"issue": ["JST-3", "JST-1"]})
+        self.assertEqual(index["values"]["issue"], ["JST-1", "JST-3", "OTHER-1"])
+        self.assertEqual(jslcomplete.load_index(self.path), index)
+
+    def test_update_index_writes_only_changes(self):
+        with patch("jslcomplete.os.replace") as replace:
+            jslcomplete.update_index(self.path, options=self.index["options"], values={"issue": ["OTHER-1"]})
+            jslcomplete.update_index(self.path, values={})
+        replace.assert_not_called()
+        jslcomplete.update_index(self.path, values={"issue": ["JST-1"]})
+        self.assertEqual(jslcomplete.load_index(self.path)["values"]["issue"][0], "JST-1")
+
+    def test_failed_run_leaves_index_alone(self):
+        with patch("sys.argv", ["jsl", "--read-story-details", "JST-9"]), \
+                patch("jirasimplelib.create_jira_connection"), patch("jirasimplelib.initialize"), \
+                patch("jirasimplelib.run_commands", side_effect=JIRAError("Service unavailable", status_code=503)), \
+                patch("jirasimplelib._save_completions") as save:
+            with self.assertRaises(JIRAError):
+                jirasimplelib_main()
+        save.assert_not_called()
+
+    def test_complete_option_names(self):
+        self.assertEqual(jslcomplete.complete("jsl --read-s", 12, self.index), ["--read-story-details"])
+
+    def test_complete_values_by_kind(self):
+        line = "jsl --read-story-details JST-1 jst-"
+        self.assertEqual(jslcomplete.complete(line, len(line), self.index), ["JST-2", "JST-1"])
+        line = "python jsl --sprint-report 7 "
+        self.assertEqual(jslcomplete.complete(line, len(line), self.index, start=2), ["OTHER", "JST"])
+        line = "jsl --sprint-report 7 JST "
+        self.assertEqual(jslcomplete.complete(line, len(line), self.index), [])
+
+    def test_complete_option_equals_value(self):
+        line = "jsl --read-story-details=JST-"
+        self.assertEqual(jslcomplete.complete(line, len(line), self.index), ["JST-2", "JST-1"])
+        line = "jsl --sprint-report=7 "
+        self.assertEqual(jslcomplete.complete(line, len(line), self.index), ["OTHER", "JST"])
+
+    def test_plus_option_kinds_follow_argparse(self):
+        values = {}
+        with patch("jirasimplelib._completion_values", values):
+            args = parse_arguments().parse_args(["--cycle-time", "JST", "182", "--backup", "out", "JST", "OTHER"])
+            _remember_arguments(args, self.index["options"])
+        self.assertEqual(values, {"project": ["JST", "JST", "OTHER"]})
+        line = "jsl --backup out JST O"
+        self.assertEqual(jslcomplete.complete(line, len(line), self.index), ["OTHER"])
+
+class TestSessionStore(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.store = SessionStore(directory.name, "https://jsl-test.atlassian.net", "u")
+        self.server_info = {"versionNumbers": [1001, 0, 0], "deploymentType": "Cloud"}
+
+    def test_restores_cookies_and_server_info(self):
+        jira = MagicMock()
+        jira._session = requests.Session()
+        jira._session.cookies.set("atlassian.xsrf.token", "abc", domain="jsl-test.atlassian.net")
+        self.store.save(jira, self.server_info)
+        restored = MagicMock()
+        restored._session = requests.Session()
+        self.assertTrue(self.store.restore(restored))
+        self.assertEqual(restored._version, (1001, 0, 0))
+        self.assertEqual(restored.deploymentType, "Cloud")
+        self.assertEqual(restored._session.cookies.get("atlassian.xsrf.token"), "abc")
+
+    def test_expired_state_is_ignored(self):
+        jira = MagicMock()
+        jira._session = requests.Session()
+        self.store.save(jira, self.server_info)
+        self.store.max_age = 0
+        with patch("jirasimplelib.time.time", return_value=time.time() + 1):
+            self.assertFalse(self.store.restore(jira))
+
+
+class OffsetColonDatetime(datetime):
+    # fromisoformat as in Python 3.8-3.10, which rejects "+0000" offsets
+    @classmethod
+    def fromisoformat(cls, value):
+        if re.search(r"[+-]\d{4}$", value):
+            raise ValueError(f"Invalid isoformat string: {value!r}")
+        return super().fromisoformat(value)
+
+
+class TestChangelogEngine(unittest.TestCase):
+    def history(self, created, from_status, to_status):
+        return {"created": created, "items": [{"field": "status", "fromString": from_status, "toString": to_status}]}
+
+    def test_issue_transitions(self):
+        raw = {
+            "key": "JST-1",
+            "fields": {"created": "2024-01-01T00:00:00.000+0000", "status": {"name": "Done"}},
+            "changelog": {"histories": [
+                self.history("2024-01-03T00:00:00.000+0000", "In Progress", "Done"),
+                {"created": "2024-01-02T12:00:00.000+0000", "items": [{"field": "assignee", "toString": "x"}]},
+                self.history("2024-01-02T00:00:00.000+0000", "To Do", "In Progress"),
+            ]},
+        }
+        created, initial, changes = issue_transitions(raw)
+        self.assertEqual(initial, "To Do")
+        self.assertEqual([status for _, status in changes], ["In Progress", "Done"])
+        self.assertEqual(changes[1][0] - created, 2 * 86400)
+
+    @patch("jirasimplelib.datetime", OffsetColonDatetime)
+    def test_jira_timestamps_before_python_3_11(self):
+        raw = {
+            "key": "JST-1",
+            "fields": {"created": "2024-01-01T00:00:00.000+0000", "status": {"name": "Done"}},
+            "changelog": {"histories": [self.history("2024-01-02T00:00:00.000Z", "To Do", "Done")]},
+        }
+        created, _, changes = issue_transitions(raw)
+        self.assertEqual(created, datetime(2024, 1, 1, tzinfo=timezone.utc).timestamp())
+        self.assertEqual(changes[0][0] - created, 86400)
+        sprints = planned_sprints({"start": "2024-04-01", "name": "S{number}"}, 1)
+        self.assertEqual(sprints[0]["start"], datetime(2024, 4, 1, tzinfo=timezone.utc))
+
+    def test_cycle_times_and_burndown(self):
+        day = 86400
+        arrays = TransitionArrays([
+            ("JST-1", 0, "To Do", [(day, "In Progress"), (3 * day, "Done")]),
+            # Reopened: not done
+            ("JST-2", 0, "To Do", [(day, "Done"), (2 * day, "In Progress")]),
+            ("JST-3", day, "Done", []),
+        ])
+        lead_times, cycle_times = issue_cycle_times(arrays)
+        self.assertEqual(list(lead_times)[0], 3)
+        self.assertEqual(list(cycle_times)[0], 2)
+        self.assertTrue(math.isnan(list(lead_times)[1]))
+        self.assertEqual(list(lead_times)[2], 0)
+        self.assertEqual(burndown(arrays, 0, 4 * day), [(day, 1), (2 * day, 2), (3 * day, 1), (4 * day, 1)])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,236 @@
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import jirasimplelib
+from fakejira import FakeJiraServer
+
+# Offline benchmarks of representative jirasimplelib commands against a local
+# FakeJiraServer. Every command runs on a freshly generated dataset and reports
+# wall time, the number of HTTP requests the server received and the peak
+# Python memory allocated while it ran.
+#
+# python benchmark.py --issues 1000 10000 --latency-ms 5 --page-size 100
+# python benchmark.py --issues 1000 --json bench.json
+# python benchmark.py --issues 1000 --baseline bench.json --tolerance 0.25
+
+PROJECT_KEY = "BENCH"
+
+# Issues moved by the move_issues_to_sprint benchmark
+MOVE_RANGE = 100
+
+
+def _first_sprint(fake, state):
+    for sprint_id, sprint in fake.sprints.items():
+        if sprint["state"] == state:
+            return sprint_id
+    return next(iter(fake.sprints))
+
+
+def bench_get_stories_for_project(jira, fake):
+    return len(jirasimplelib.get_stories_for_project(jira, PROJECT_KEY) or [])
+
+
+def bench_move_issues_to_sprint(jira, fake):
+    last = min(MOVE_RANGE, fake.projects[PROJECT_KEY]["next_number"] - 1)
+    return jirasimplelib.move_issues_to_sprint(
+        jira,
+        PROJECT_KEY,
+        f"{PROJECT_KEY}-1",
+        f"{PROJECT_KEY}-{last}",
+        _first_sprint(fake, "active"),
+    )
+
+
+def bench_sprint_report(jira, fake):
+    return jirasimplelib.sprint_report(jira, _first_sprint(fake, "active"), PROJECT_KEY)
+
+
+def bench_get_members(jira, fake):
+    return len(jirasimplelib.get_members(jira, PROJECT_KEY) or [])
+
+
+def bench_delete_all_stories_in_project(jira, fake):
+    return jirasimplelib.delete_all_stories_in_project(jira, PROJECT_KEY)
+
+
+BENCHMARKS = {
+    "get_stories_for_project": bench_get_stories_for_project,
+    "move_issues_to_sprint": bench_move_issues_to_sprint,
+    "sprint_report": bench_sprint_report,
+    "get_members": bench_get_members,
+    "delete_all_stories_in_project": bench_delete_all_stories_in_project,
+}
+
+
+def run_benchmark(name, issues, latency_ms=0, page_size=100, gap_every=20, memory=True):
+    """
+    Run one benchmark on a fresh dataset.
+
+    :return: Dictionary with wall time, request count and peak memory
+    """
+    with FakeJiraServer(
+        issues=issues,
+        projects=(PROJECT_KEY,),
+        latency_ms=latency_ms,
+        page_size=page_size,
+        gap_every=gap_every,
+    ) as server, tempfile.TemporaryDirectory() as directory:
+        config = server.write_config(os.path.join(directory, "config.json"))
+        jira = jirasimplelib.create_jira_connection(config)
+        server.fake.reset_requests()
+        if memory:
+            tracemalloc.start()
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            BENCHMARKS[name](jira, server.fake)
+        wall = time.perf_counter() - started
+        peak = 0
+        if memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        return {
+            "command": name,
+            "issues": issues,
+            "latency_ms": latency_ms,
+            "page_size": page_size,
+            "wall_s": round(wall, 4),
+            "requests": server.fake.request_count(),
+            "peak_kb": round(peak / 1024, 1),
+        }
+
+
+def compare(results, baseline, tolerance):
+    """
+    Compare results with a previous run.
+
+    Request counts may not grow at all; wall time and peak memory may grow
+    by ``tolerance`` (a fraction) before they count as a regression.
+
+    :return: List of regression messages
+    """
+    previous = {(row["command"], row["issues"]): row for row in baseline}
+    regressions = []
+    for row in results:
+        old = previous.get((row["command"], row["issues"]))
+        if not old:
+            continue
+        label = f"{row['command']} ({row['issues']} issues)"
+        if row["requests"] > old["requests"]:
+            regressions.append(
+                f"{label}: requests {old['requests']} -> {row['requests']}"
+            )
+        if row["wall_s"] > old["wall_s"] * (1 + tolerance):
+            regressions.append(f"{label}: wall time {old['wall_s']}s -> {row['wall_s']}s")
+        if old["peak_kb"] and row["peak_kb"] > old["peak_kb"] * (1 + tolerance):
+            regressions.append(
+                f"{label}: peak memory {old['peak_kb']}KB -> {row['peak_kb']}KB"
+            )
+    return regressions
+
+
+def print_results(results):
+    headers = ["Command", "Issues", "Wall s", "Requests", "Peak KB"]
+    rows = [
+        [row["command"], row["issues"], row["wall_s"], row["requests"], row["peak_kb"]]
+        for row in results
+    ]
+    widths = [
+        max(len(str(value)) for value in [header] + [row[i] for row in rows])
+        for i, header in enumerate(headers)
+    ]
+    boundary = "+-" + "-+-".join("-" * width for width in widths) + "-+"
+    print(boundary)
+    print("| " + " | ".join(f"{h:<{widths[i]}}" for i, h in enumerate(headers)) + " |")
+    print(boundary)
+    for row in rows:
+        print("| " + " | ".join(f"{str(v):<{widths[i]}}" for i, v in enumerate(row)) + " |")
+    print(boundary)
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="jirasimplelib offline benchmarks")
+    parser.add_argument(
+        "--issues",
+        type=int,
+        nargs="+",
+        default=[1000],
+        help="Dataset sizes to run. Example: --issues 1000 10000 100000",
+    )
+    parser.add_argument(
+        "--commands",
+        nargs="+",
+        choices=sorted(BENCHMARKS),
+        default=list(BENCHMARKS),
+        help="Commands to benchmark (default: all)",
+    )
+    parser.add_argument("--latency-ms", type=float, default=0, help="Delay per request")
+    parser.add_argument(
+        "--page-size", type=int, default=100, help="Largest page the server returns"
+    )
+    parser.add_argument(
+        "--gap-every",
+        type=int,
+        default=20,
+        help="Leave every n-th issue key unused (0 for none)",
+    )
+    parser.add_argument(
+        "--no-memory",
+        action="store_true",
+        help="Skip peak memory tracing (it slows the run down)",
+    )
+    parser.add_argument("--json", metavar="file_path", help="Write results as JSON")
+    parser.add_argument(
+        "--baseline",
+        metavar="file_path",
+        help="Fail when results regress against this JSON file from an earlier run",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed growth of wall time and memory against the baseline",
+    )
+    return parser
+
+
+def main():
+    args = parse_arguments().parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+    # The jira client logs every 404 response body at ERROR level
+    logging.getLogger("jira").setLevel(logging.CRITICAL)
+    results = []
+    for issues in args.issues:
+        for name in args.commands:
+            results.append(
+                run_benchmark(
+                    name,
+                    issues,
+                    latency_ms=args.latency_ms,
+                    page_size=args.page_size,
+                    gap_every=args.gap_every,
+                    memory=not args.no_memory,
+                )
+            )
+    print_results(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for message in regressions:
+            print(f"REGRESSION: {message}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1343 @@
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+# In-memory stand-in for the Jira REST (api/2) and Agile (agile/1.0) endpoints
+# used by jirasimplelib. It is meant for benchmarks and request-count tests,
+# so it generates a deterministic dataset, keeps a log of every request and
+# can add artificial latency per request.
+
+ISSUE_TYPES = ("Story", "Task", "Bug")
+STATUSES = ("To Do", "In Progress", "Done")
+STATUS_CATEGORIES = {
+    "To Do": ("new", "To Do"),
+    "In Progress": ("indeterminate", "In Progress"),
+    "Done": ("done", "Done"),
+}
+EPIC_LINK_FIELD = "customfield_10014"
+START_DATE_FIELD = "customfield_10015"
+STORY_POINTS_FIELD = "customfield_10016"
+RANK_FIELD = "customfield_10019"
+SPRINT_FIELD = "customfield_10020"
+JIRA_DATE_FORMAT = "%Y-%m-%dT%H:%M:%S.000+0000"
+BASE_TIME = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+class FakeIssue:
+    __slots__ = (
+        "id",
+        "key",
+        "project",
+        "issue_type",
+        "status",
+        "assignee",
+        "reporter",
+        "summary",
+        "description",
+        "created",
+        "updated",
+        "sprint",
+        "epic",
+        "points",
+        "rank",
+        "comments",
+        "history",
+    )
+
+
+class FakeJira:
+    """
+    Deterministic dataset plus a request dispatcher that answers like Jira.
+
+    :param issues: Number of issues generated per project
+    :param projects: Keys of the generated projects
+    :param page_size: Largest page the search and agile endpoints return
+    :param latency_ms: Delay added to every request
+    :param gap_every: Leave every n-th issue key unused (deleted issues)
+    :param sprint_size: Number of issues per generated sprint
+    :param users: Number of generated users
+    :param seed: Random seed for the dataset
+    :param etags: Send ETag headers and answer If-None-Match with 304
+    """
+
+    def __init__(
+        self,
+        issues=1000,
+        projects=("BENCH",),
+        page_size=100,
+        latency_ms=0,
+        gap_every=0,
+        sprint_size=200,
+        users=25,
+        epics_per_project=None,
+        seed=1,
+        etags=True,
+    ):
+        self.base_url = "http://fake.jira"
+        self.etags = etags
+        self.page_size = page_size
+        self.latency = latency_ms / 1000.0
+        self.lock = threading.RLock()
+        self.requests = []
+        self.version = 0
+        self._search_cache = {}
+        self._next_id = 10000
+        self._next_sprint_id = 1
+        self.users = [
+            {
+                "accountId": f"user-{i}",
+                "displayName": f"User {i}",
+                "emailAddress": f"user{i}@example.com",
+                "name": f"user{i}",
+                "active": True,
+            }
+            for i in range(users)
+        ]
+        self.projects = {}
+        self.boards = {}
+        self.sprints = {}
+        self.issues = {}
+        self.issue_order = []
+        random_state = random.Random(seed)
+        for project_index, project_key in enumerate(projects):
+            self._generate_project(
+                random_state,
+                project_key,
+                project_index,
+                issues,
+                gap_every,
+                sprint_size,
+                epics_per_project,
+            )
+
+    # Dataset
+
+    def _generate_project(
+        self, rnd, project_key, project_index, count, gap_every, sprint_size, epics
+    ):
+        board_id = project_index + 1
+        self.projects[project_key] = {
+            "id": str(10000 + project_index),
+            "key": project_key,
+            "name": f"{project_key} project",
+            "next_number": 1,
+        }
+        self.boards[board_id] = {
+            "id": board_id,
+            "name": f"{project_key} board",
+            "type": "scrum",
+            "location": {"projectKey": project_key},
+        }
+        sprint_count = max(1, count // max(sprint_size, 1))
+        sprint_ids = []
+        for n in range(sprint_count):
+            state = "closed" if n < sprint_count - 2 else "active"
+            if n == sprint_count - 1:
+                state = "future"
+            sprint_ids.append(
+                self._add_sprint(
+                    board_id,
+                    f"{project_key} Sprint {n + 1}",
+                    state,
+                    BASE_TIME + timedelta(days=14 * n),
+                    BASE_TIME + timedelta(days=14 * (n + 1)),
+                )
+            )
+        epic_count = epics if epics is not None else max(1, count // 50)
+        epic_keys = []
+        number = 0
+        created = 0
+        while created < count:
+            number += 1
+            if gap_every and number % gap_every == 0:
+                continue
+            issue = FakeIssue()
+            issue.id = str(self._new_id())
+            issue.key = f"{project_key}-{number}"
+            issue.project = project_key
+            if len(epic_keys) < epic_count and created % 50 == 0:
+                issue.issue_type = "Epic"
+                epic_keys.append(issue.key)
+                issue.epic = None
+            else:
+                issue.issue_type = ISSUE_TYPES[rnd.randrange(len(ISSUE_TYPES))]
+                issue.epic = epic_keys[rnd.randrange(len(epic_keys))] if epic_keys else None
+            issue.status = STATUSES[rnd.randrange(len(STATUSES))]
+            assignee = rnd.randrange(len(self.users) + 1) if self.users else len(self.users)
+            issue.assignee = assignee if assignee < len(self.users) else None
+            issue.reporter = rnd.randrange(len(self.users)) if self.users else None
+            issue.summary = f"{issue.issue_type} number {number} for {project_key}"
+            issue.description = (
+                f"Generated {issue.issue_type.lower()} {number} with "
+                f"{rnd.choice(('login', 'billing', 'search', 'export', 'report'))} work"
+            )
+            issue.created = BASE_TIME + timedelta(minutes=7 * created)
+            issue.updated = issue.created + timedelta(hours=rnd.randrange(1, 240))
+            issue.sprint = (
+                sprint_ids[min(created // max(sprint_size, 1), len(sprint_ids) - 1)]
+                if issue.issue_type != "Epic"
+                else None
+            )
+            issue.points = rnd.choice((1, 2, 3, 5, 8, None))
+            issue.rank = f"0|i{created:07d}:"
+            issue.comments = None
+            issue.history = None
+            self._add_issue(issue)
+            created += 1
+        self.projects[project_key]["next_number"] = number + 1
+
+    def _new_id(self):
+        self._next_id += 1
+        return self._next_id
+
+    def _add_issue(self, issue):
+        self.issues[issue.key] = issue
+        self.issue_order.append(issue.key)
+
+    def _add_sprint(self, board_id, name, state, start, end):
+        sprint_id = self._next_sprint_id
+        self._next_sprint_id += 1
+        self.sprints[sprint_id] = {
+            "id": sprint_id,
+            "name": name,
+            "state": state,
+            "originBoardId": board_id,
+            "startDate": start.strftime(JIRA_DATE_FORMAT) if start else None,
+            "endDate": end.strftime(JIRA_DATE_FORMAT) if end else None,
+        }
+        return sprint_id
+
+    def _touch(self, issue):
+        issue.updated = datetime.now(timezone.utc)
+        self._changed()
+
+    def _changed(self):
+        self.version += 1
+        self._search_cache.clear()
+
+    def _histories(self, issue):
+        if issue.history is None:
+            history = []
+            stamp = issue.created
+            if issue.status in ("In Progress", "Done"):
+                stamp = stamp + timedelta(hours=2)
+                history.append((stamp, "To Do", "In Progress"))
+            if issue.status == "Done":
+                stamp = stamp + timedelta(hours=30)
+                history.append((stamp, "In Progress", "Done"))
+            issue.history = history
+        return issue.history
+
+    # Rendering
+
+    def _user(self, index):
+        return dict(self.users[index]) if index is not None else None
+
+    def _sprint_value(self, sprint_id):
+        sprint = self.sprints.get(sprint_id)
+        if not sprint:
+            return None
+        return [
+            {
+                "id": sprint["id"],
+                "name": sprint["name"],
+                "state": sprint["state"],
+                "boardId": sprint["originBoardId"],
+            }
+        ]
+
+    def render_issue(self, issue, fields=None, expand=None):
+        everything = not fields or "*all" in fields or "*navigable" in fields
+        wanted = set(fields or ())
+
+        def include(name):
+            return everything or name in wanted
+
+        project = self.projects.get(issue.project, {"id": "0", "key": issue.project})
+        rendered = {}
+        if include("summary"):
+            rendered["summary"] = issue.summary
+        if include("description"):
+            rendered["description"] = issue.description
+        if include("issuetype"):
+            rendered["issuetype"] = {
+                "name": issue.issue_type,
+                "subtask": False,
+                "id": str(ISSUE_TYPES.index(issue.issue_type) + 1)
+                if issue.issue_type in ISSUE_TYPES
+                else "10000",
+            }
+        if include("status"):
+            category_key, category_name = STATUS_CATEGORIES.get(
+                issue.status, ("indeterminate", "In Progress")
+            )
+            rendered["status"] = {
+                "name": issue.status,
+                "statusCategory": {"key": category_key, "name": category_name},
+            }
+        if include("assignee"):
+            rendered["assignee"] = self._user(issue.assignee)
+        if include("reporter"):
+            rendered["reporter"] = self._user(issue.reporter)
+        if include("project"):
+            rendered["project"] = {
+                "id": project["id"],
+                "key": issue.project,
+                "name": project.get("name", issue.project),
+            }
+        if include("created"):
+            rendered["created"] = issue.created.strftime(JIRA_DATE_FORMAT)
+        if include("updated"):
+            rendered["updated"] = issue.updated.strftime(JIRA_DATE_FORMAT)
+        if include("duedate"):
+            rendered["duedate"] = None
+        if include("resolutiondate"):
+            rendered["resolutiondate"] = (
+                issue.updated.strftime(JIRA_DATE_FORMAT) if issue.status == "Done" else None
+            )
+        if include(EPIC_LINK_FIELD):
+            rendered[EPIC_LINK_FIELD] = issue.epic
+        if include(START_DATE_FIELD):
+            rendered[START_DATE_FIELD] = None
+        if include(STORY_POINTS_FIELD):
+            rendered[STORY_POINTS_FIELD] = issue.points
+        if include(RANK_FIELD):
+            rendered[RANK_FIELD] = issue.rank
+        if include(SPRINT_FIELD):
+            rendered[SPRINT_FIELD] = self._sprint_value(issue.sprint)
+        if include("issuelinks"):
+            rendered["issuelinks"] = []
+        if include("subtasks"):
+            rendered["subtasks"] = []
+        if include("comment"):
+            comments = self._comments(issue)
+            rendered["comment"] = {
+                "comments": comments,
+                "maxResults": len(comments),
+                "total": len(comments),
+                "startAt": 0,
+            }
+        result = {
+            "expand": "renderedFields,names,schema,operations,editmeta,changelog",
+            "id": issue.id,
+            "self": f"{self.base_url}/rest/api/2/issue/{issue.id}",
+            "key": issue.key,
+            "fields": rendered,
+        }
+        expand = expand or ""
+        if "changelog" in expand:
+            histories = self._render_histories(issue)
+            result["changelog"] = {
+                "startAt": 0,
+                "maxResults": len(histories),
+                "total": len(histories),
+                "histories": histories,
+            }
+        if "renderedFields" in expand:
+            result["renderedFields"] = {
+                "description": f"<p>{issue.description}</p>",
+                "comment": {"comments": self._comments(issue)},
+            }
+        return result
+
+    def _comments(self, issue):
+        if issue.comments is None:
+            return []
+        return [
+            {
+                "id": str(i + 1),
+                "body": body,
+                "author": self._user(author),
+                "created": created.strftime(JIRA_DATE_FORMAT),
+            }
+            for i, (author, body, created) in enumerate(issue.comments)
+        ]
+
+    def _render_histories(self, issue):
+        return [
+            {
+                "id": str(i + 1),
+                "created": stamp.strftime(JIRA_DATE_FORMAT),
+                "author": self._user(issue.assignee),
+                "items": [
+                    {
+                        "field": "status",
+                        "fieldtype": "jira",
+                        "fromString": from_status,
+                        "toString": to_status,
+                    }
+                ],
+            }
+            for i, (stamp, from_status, to_status) in enumerate(self._histories(issue))
+        ]
+
+    def render_sprint(self, sprint):
+        return dict(sprint, self=f"{self.base_url}/rest/agile/1.0/sprint/{sprint['id']}")
+
+    # Search
+
+    def search(self, jql):
+        with self.lock:
+            cached = self._search_cache.get(jql)
+            if cached is not None:
+                return cached
+            condition, order = parse_jql(jql)
+            matches = [
+                key
+                for key in self.issue_order
+                if key in self.issues and condition(self, self.issues[key])
+            ]
+            if order:
+                for field, descending in reversed(order):
+                    matches.sort(
+                        key=lambda key: _sort_value(self, self.issues[key], field),
+                        reverse=descending,
+                    )
+            if len(self._search_cache) > 16:
+                self._search_cache.clear()
+            self._search_cache[jql] = matches
+            return matches
+
+    # Dispatch
+
+    def handle(self, method, url, body=None, headers=None):
+        """
+        Answer one request.
+
+        :param method: HTTP method
+        :param url: Request URL or path (including the query string)
+        :param body: Request body as bytes or str
+        :param headers: Request headers
+        :return: Tuple of (status code, headers dict, body bytes)
+        """
+        parsed = urlparse(url)
+        path = parsed.path.rstrip("/")
+        # Jira accepts list parameters such as fields either repeated or comma separated
+        query = {
+            key: ",".join(values) if key in ("fields", "expand") else values[-1]
+            for key, values in parse_qs(parsed.query).items()
+        }
+        if isinstance(body, bytes):
+            body = body.decode("utf-8")
+        payload = json.loads(body) if body else {}
+        with self.lock:
+            self.requests.append((method.upper(), path))
+        if self.latency:
+            time.sleep(self.latency)
+        for route_method, pattern, handler in self._routes():
+            if route_method != method.upper():
+                continue
+            match = pattern.match(path)
+            if match:
+                try:
+                    with self.lock:
+                        status, result = handler(query, payload, *match.groups())
+                except LookupError as e:
+                    status, result = 404, {"errorMessages": [str(e)], "errors": {}}
+                except ValueError as e:
+                    status, result = 400, {"errorMessages": [str(e)], "errors": {}}
+                status, response_headers, content = self._response(status, result)
+                if self.etags and method.upper() == "GET" and status == 200:
+                    etag = f'"{hashlib.md5(content).hexdigest()}"'
+                    response_headers["ETag"] = etag
+                    if_none_match = {
+                        name.lower(): value for name, value in (headers or {}).items()
+                    }.get("if-none-match")
+                    if if_none_match == etag:
+                        return 304, {"ETag": etag}, b""
+                return status, response_headers, content
+        return self._response(404, {"errorMessages": [f"No route for {method} {path}"]})
+
+    def _response(self, status, result):
+        content = b"" if result is None else json.dumps(result).encode("utf-8")
+        response_headers = {"Content-Type": "application/json;charset=UTF-8"}
+        return status, response_headers, content
+
+    def _routes(self):
+        api = r"/rest/api/(?:2|latest)"
+        agile = r"/rest/agile/1\.0"
+        return (
+            ("GET", re.compile(rf"^{api}/serverInfo$"), self._server_info),
+            ("GET", re.compile(rf"^{api}/myself$"), self._myself),
+            ("GET", re.compile(rf"^{api}/field$"), self._fields),
+            ("GET", re.compile(rf"^{api}/search$"), self._search),
+            ("POST", re.compile(rf"^{api}/search$"), self._search_post),
+            ("GET", re.compile(rf"^{api}/project$"), self._list_projects),
+            ("POST", re.compile(rf"^{api}/project$"), self._create_project),
+            ("GET", re.compile(rf"^{api}/project/([^/]+)$"), self._get_project),
+            ("DELETE", re.compile(rf"^{api}/project/([^/]+)$"), self._delete_project),
+            ("GET", re.compile(rf"^{api}/user$"), self._get_user),
+            ("POST", re.compile(rf"^{api}/issue$"), self._create_issue),
+            ("POST", re.compile(rf"^{api}/issue/bulk$"), self._create_issues),
+            ("GET", re.compile(rf"^{api}/issue/([^/]+)$"), self._get_issue),
+            ("PUT", re.compile(rf"^{api}/issue/([^/]+)$"), self._update_issue),
+            ("DELETE", re.compile(rf"^{api}/issue/([^/]+)$"), self._delete_issue),
+            ("GET", re.compile(rf"^{api}/issue/([^/]+)/transitions$"), self._transitions),
+            ("POST", re.compile(rf"^{api}/issue/([^/]+)/transitions$"), self._transition),
+            ("GET", re.compile(rf"^{api}/issue/([^/]+)/comment$"), self._get_comments),
+            ("POST", re.compile(rf"^{api}/issue/([^/]+)/comment$"), self._add_comment),
+            ("GET", re.compile(rf"^{api}/issue/([^/]+)/changelog$"), self._changelog),
+            ("GET", re.compile(rf"^{agile}/board$"), self._list_boards),
+            ("POST", re.compile(rf"^{agile}/board$"), self._create_board),
+            ("GET", re.compile(rf"^{agile}/board/(\d+)$"), self._get_board),
+            ("GET", re.compile(rf"^{agile}/board/(\d+)/sprint$"), self._board_sprints),
+            ("GET", re.compile(rf"^{agile}/board/(\d+)/backlog$"), self._board_backlog),
+            ("GET", re.compile(rf"^{agile}/board/(\d+)/issue$"), self._board_issues),
+            ("POST", re.compile(rf"^{agile}/sprint$"), self._create_sprint),
+            ("GET", re.compile(rf"^{agile}/sprint/(\d+)$"), self._get_sprint),
+            ("PUT", re.compile(rf"^{agile}/sprint/(\d+)$"), self._update_sprint),
+            ("POST", re.compile(rf"^{agile}/sprint/(\d+)$"), self._update_sprint),
+            ("DELETE", re.compile(rf"^{agile}/sprint/(\d+)$"), self._delete_sprint),
+            ("POST", re.compile(rf"^{agile}/sprint/(\d+)/issue$"), self._move_to_sprint),
+            ("GET", re.compile(rf"^{agile}/sprint/(\d+)/issue$"), self._sprint_issues),
+            ("POST", re.compile(rf"^{agile}/epic/([^/]+)/issue$"), self._move_to_epic),
+        )
+
+    def _server_info(self, query, payload):
+        return 200, {
+            "baseUrl": self.base_url,
+            "version": "1001.0.0",
+            "versionNumbers": [1001, 0, 0],
+            "deploymentType": "Cloud",
+            "serverTitle": "Fake Jira",
+        }
+
+    def _myself(self, query, payload):
+        return 200, self._user(0)
+
+    def _fields(self, query, payload):
+        fields = [
+            ("summary", "Summary", ["summary"]),
+            ("description", "Description", ["description"]),
+            ("issuetype", "Issue Type", ["issuetype", "type"]),
+            ("status", "Status", ["status"]),
+            ("assignee", "Assignee", ["assignee"]),
+            ("reporter", "Reporter", ["reporter"]),
+            ("project", "Project", ["project"]),
+            ("created", "Created", ["created", "createdDate"]),
+            ("updated", "Updated", ["updated", "updatedDate"]),
+            ("comment", "Comment", ["comment"]),
+            (EPIC_LINK_FIELD, "Epic Link", ["cf[10014]", "Epic Link"]),
+            (STORY_POINTS_FIELD, "Story point estimate", ["cf[10016]"]),
+            (RANK_FIELD, "Rank", ["cf[10019]", "Rank"]),
+            (SPRINT_FIELD, "Sprint", ["cf[10020]", "Sprint"]),
+        ]
+        return 200, [
+            {"id": field_id, "name": name, "custom": field_id.startswith("customfield"), "clauseNames": clauses}
+            for field_id, name, clauses in fields
+        ]
+
+    def _search(self, query, payload):
+        fields = query.get("fields")
+        return self._search_page(
+            query.get("jql", ""),
+            int(query.get("startAt", 0)),
+            query.get("maxResults"),
+            fields.split(",") if fields else None,
+            query.get("expand"),
+            query.get("validateQuery", "true"),
+        )
+
+    def _search_post(self, query, payload):
+        return self._search_page(
+            payload.get("jql", ""),
+            int(payload.get("startAt", 0)),
+            payload.get("maxResults"),
+            payload.get("fields"),
+            payload.get("expand"),
+            str(payload.get("validateQuery", "true")),
+        )
+
+    def _search_page(self, jql, start_at, max_results, fields, expand, validate):
+        max_results = int(max_results) if max_results not in (None, "") else 50
+        max_results = min(max_results, self.page_size)
+        warnings = []
+        if str(validate).lower() in ("true", "strict"):
+            for key in _quoted_keys(jql):
+                if key not in self.issues:
+                    raise ValueError(
+                        f"An issue with key '{key}' does not exist for field 'key'."
+                    )
+        else:
+            warnings = [
+                f"An issue with key '{key}' does not exist for field 'key'."
+                for key in _quoted_keys(jql)
+                if key not in self.issues
+            ]
+        matches = self.search(jql)
+        page = matches[start_at : start_at + max_results]
+        result = {
+            "expand": "schema,names",
+            "startAt": start_at,
+            "maxResults": max_results,
+            "total": len(matches),
+            "issues": [self.render_issue(self.issues[key], fields, expand) for key in page],
+        }
+        if warnings:
+            result["warningMessages"] = warnings
+        return 200, result
+
+    def _list_projects(self, query, payload):
+        return 200, [
+            {"id": project["id"], "key": key, "name": project["name"]}
+            for key, project in self.projects.items()
+        ]
+
+    def _get_project(self, query, payload, key):
+        for project_key, project in self.projects.items():
+            if key in (project_key, project["id"]):
+                return 200, {"id": project["id"], "key": project_key, "name": project["name"]}
+        raise LookupError(f"No project could be found with key '{key}'.")
+
+    def _create_project(self, query, payload):
+        key = payload["key"]
+        if key in self.projects:
+            raise ValueError(f"A project with that project key already exists.")
+        self.projects[key] = {
+            "id": str(10000 + len(self.projects)),
+            "key": key,
+            "name": payload.get("name", key),
+            "next_number": 1,
+        }
+        self._changed()
+        return 201, {"id": self.projects[key]["id"], "key": key}
+
+    def _delete_project(self, query, payload, key):
+        if key not in self.projects:
+            raise LookupError(f"No project could be found with key '{key}'.")
+        del self.projects[key]
+        for issue_key in [k for k, issue in self.issues.items() if issue.project == key]:
+            del self.issues[issue_key]
+        self.issue_order = [k for k in self.issue_order if k in self.issues]
+        self._changed()
+        return 204, None
+
+    def _get_user(self, query, payload):
+        wanted = query.get("accountId") or query.get("username") or query.get("key")
+        for user in self.users:
+            if wanted in (user["accountId"], user["name"], user["emailAddress"]):
+                return 200, user
+        raise LookupError(f"The user named '{wanted}' does not exist")
+
+    def _issue(self, key_or_id):
+        issue = self.issues.get(key_or_id)
+        if issue is None:
+            for candidate in self.issues.values():
+                if candidate.id == key_or_id:
+                    return candidate
+            raise LookupError("Issue does not exist or you do not have permission to see it.")
+        return issue
+
+    def _get_issue(self, query, payload, key):
+        fields = query.get("fields")
+        return 200, self.render_issue(
+            self._issue(key), fields.split(",") if fields else None, query.get("expand")
+        )
+
+    def _new_issue(self, fields):
+        project_value = fields.get("project")
+        project_key = (
+            project_value.get("key") if isinstance(project_value, dict) else project_value
+        )
+        if project_key not in self.projects:
+            for key, project in self.projects.items():
+                if isinstance(project_value, dict) and project_value.get("id") == project["id"]:
+                    project_key = key
+        if project_key not in self.projects:
+            raise ValueError("project: valid project is required")
+        project = self.projects[project_key]
+        issue = FakeIssue()
+        issue.id = str(self._new_id())
+        issue.key = f"{project_key}-{project['next_number']}"
+        project["next_number"] += 1
+        issue.project = project_key
+        issuetype = fields.get("issuetype") or {}
+        issue.issue_type = issuetype.get("name", "Task") if isinstance(issuetype, dict) else issuetype
+        issue.status = "To Do"
+        issue.assignee = self._user_index(fields.get("assignee"))
+        issue.reporter = 0 if self.users else None
+        issue.summary = fields.get("summary", "")
+        issue.description = fields.get("description")
+        issue.created = issue.updated = datetime.now(timezone.utc)
+        issue.sprint = None
+        issue.epic = fields.get(EPIC_LINK_FIELD)
+        issue.points = fields.get(STORY_POINTS_FIELD)
+        issue.rank = f"1|z{len(self.issue_order):07d}:"
+        issue.comments = None
+        issue.history = []
+        self._add_issue(issue)
+        self._changed()
+        return issue
+
+    def _create_issue(self, query, payload):
+        issue = self._new_issue(payload.get("fields", {}))
+        return 201, {"id": issue.id, "key": issue.key, "self": f"{self.base_url}/rest/api/2/issue/{issue.id}"}
+
+    def _create_issues(self, query, payload):
+        created = []
+        errors = []
+        for index, update in enumerate(payload.get("issueUpdates", [])):
+            try:
+                issue = self._new_issue(update.get("fields", {}))
+                created.append(
+                    {"id": issue.id, "key": issue.key, "self": f"{self.base_url}/rest/api/2/issue/{issue.id}"}
+                )
+            except ValueError as e:
+                errors.append(
+                    {"status": 400, "elementErrors": {"errorMessages": [str(e)]}, "failedElementNumber": index}
+                )
+        return 201, {"issues": created, "errors": errors}
+
+    def _user_index(self, value):
+        if not value:
+            return None
+        wanted = value.get("accountId") or value.get("name") if isinstance(value, dict) else value
+        for index, user in enumerate(self.users):
+            if wanted in (user["accountId"], user["name"], user["emailAddress"], user["displayName"]):
+                return index
+        raise ValueError(f"User '{wanted}' does not exist.")
+
+    def _update_issue(self, query, payload, key):
+        issue = self._issue(key)
+        fields = dict(payload.get("fields", {}))
+        for name, operations in payload.get("update", {}).items():
+            for operation in operations:
+                if "set" in operation:
+                    fields[name] = operation["set"]
+        for name, value in fields.items():
+            if name == "summary":
+                issue.summary = value
+            elif name == "description":
+                issue.description = value
+            elif name == "assignee":
+                issue.assignee = self._user_index(value)
+            elif name == "reporter":
+                issue.reporter = self._user_index(value)
+            elif name == EPIC_LINK_FIELD:
+                issue.epic = value
+            elif name == STORY_POINTS_FIELD:
+                issue.points = value
+        self._touch(issue)
+        return 204, None
+
+    def _delete_issue(self, query, payload, key):
+        issue = self._issue(key)
+        del self.issues[issue.key]
+        self.issue_order.remove(issue.key)
+        self._changed()
+        return 204, None
+
+    def _transitions(self, query, payload, key):
+        self._issue(key)
+        return 200, {
+            "transitions": [
+                {"id": str(index + 11), "name": status, "to": {"name": status}}
+                for index, status in enumerate(STATUSES)
+            ]
+        }
+
+    def _transition(self, query, payload, key):
+        issue = self._issue(key)
+        transition_id = int(payload.get("transition", {}).get("id", 0)) - 11
+        if not 0 <= transition_id < len(STATUSES):
+            raise ValueError("Transition id is not valid.")
+        new_status = STATUSES[transition_id]
+        self._histories(issue).append((datetime.now(timezone.utc), issue.status, new_status))
+        issue.status = new_status
+        self._touch(issue)
+        return 204, None
+
+    def _get_comments(self, query, payload, key):
+        comments = self._comments(self._issue(key))
+        return 200, {"comments": comments, "total": len(comments), "startAt": 0, "maxResults": len(comments)}
+
+    def _add_comment(self, query, payload, key):
+        issue = self._issue(key)
+        if issue.comments is None:
+            issue.comments = []
+        issue.comments.append((0, payload.get("body", ""), datetime.now(timezone.utc)))
+        self._touch(issue)
+        return 201, self._comments(issue)[-1]
+
+    def _changelog(self, query, payload, key):
+        histories = self._render_histories(self._issue(key))
+        start_at = int(query.get("startAt", 0))
+        max_results = min(int(query.get("maxResults", 100)), self.page_size)
+        page = histories[start_at : start_at + max_results]
+        return 200, {
+            "startAt": start_at,
+            "maxResults": max_results,
+            "total": len(histories),
+            "isLast": start_at + max_results >= len(histories),
+            "values": page,
+        }
+
+    def _paged_values(self, query, values):
+        start_at = int(query.get("startAt", 0))
+        max_results = min(int(query.get("maxResults", 50)), self.page_size)
+        page = values[start_at : start_at + max_results]
+        return 200, {
+            "startAt": start_at,
+            "maxResults": max_results,
+            "total": len(values),
+            "isLast": start_at + max_results >= len(values),
+            "values": page,
+        }
+
+    def _list_boards(self, query, payload):
+        boards = list(self.boards.values())
+        if query.get("name"):
+            boards = [board for board in boards if query["name"] in board["name"]]
+        if query.get("type"):
+            boards = [board for board in boards if board["type"] == query["type"]]
+        if query.get("projectKeyOrId"):
+            boards = [
+                board
+                for board in boards
+                if board["location"]["projectKey"] == query["projectKeyOrId"]
+            ]
+        return self._paged_values(query, boards)
+
+    def _create_board(self, query, payload):
+        board_id = max(self.boards, default=0) + 1
+        location = payload.get("location", {})
+        self.boards[board_id] = {
+            "id": board_id,
+            "name": payload.get("name", f"Board {board_id}"),
+            "type": payload.get("type", "scrum"),
+            "location": {"projectKey": location.get("projectKeyOrId")},
+        }
+        self._changed()
+        return 201, self.boards[board_id]
+
+    def _board(self, board_id):
+        board = self.boards.get(int(board_id))
+        if board is None:
+            raise LookupError(f"Board {board_id} does not exist.")
+        return board
+
+    def _get_board(self, query, payload, board_id):
+        return 200, self._board(board_id)
+
+    def _board_sprints(self, query, payload, board_id):
+        if self._board(board_id)["type"] != "scrum":
+            raise ValueError("The board does not support sprints")
+        states = query.get("state", "").split(",") if query.get("state") else None
+        sprints = [
+            self.render_sprint(sprint)
+            for sprint in self.sprints.values()
+            if sprint["originBoardId"] == int(board_id)
+            and (states is None or sprint["state"] in states)
+        ]
+        return self._paged_values(query, sprints)
+
+    def _board_issue_page(self, query, keys):
+        fields = query.get("fields")
+        fields = fields.split(",") if fields else None
+        start_at = int(query.get("startAt", 0))
+        max_results = min(int(query.get("maxResults", 50)), self.page_size)
+        page = keys[start_at : start_at + max_results]
+        return 200, {
+            "expand": "schema,names",
+            "startAt": start_at,
+            "maxResults": max_results,
+            "total": len(keys),
+            "issues": [
+                self.render_issue(self.issues[key], fields, query.get("expand"))
+                for key in page
+            ],
+        }
+
+    def _board_keys(self, board_id, backlog):
+        project_key = self._board(board_id)["location"]["projectKey"]
+        open_sprints = {
+            sprint_id
+            for sprint_id, sprint in self.sprints.items()
+            if sprint["state"] in ("active", "future")
+        }
+        keys = [
+            key
+            for key in self.issue_order
+            if self.issues[key].project == project_key
+            and self.issues[key].issue_type != "Epic"
+            and (
+                not backlog
+                or (
+                    self.issues[key].status != "Done"
+                    and self.issues[key].sprint not in open_sprints
+                )
+            )
+        ]
+        keys.sort(key=lambda key: self.issues[key].rank)
+        return keys
+
+    def _board_backlog(self, query, payload, board_id):
+        return self._board_issue_page(query, self._board_keys(board_id, True))
+
+    def _board_issues(self, query, payload, board_id):
+        keys = self._board_keys(board_id, False)
+        if query.get("jql"):
+            matches = set(self.search(query["jql"]))
+            keys = [key for key in keys if key in matches]
+        return self._board_issue_page(query, keys)
+
+    def _create_sprint(self, query, payload):
+        board_id = int(payload.get("originBoardId"))
+        self._board(board_id)
+        sprint_id = self._add_sprint(board_id, payload.get("name", "Sprint"), "future", None, None)
+        sprint = self.sprints[sprint_id]
+        for name in ("startDate", "endDate", "goal"):
+            if payload.get(name):
+                sprint[name] = payload[name]
+        self._changed()
+        return 201, self.render_sprint(sprint)
+
+    def _sprint(self, sprint_id):
+        sprint = self.sprints.get(int(sprint_id))
+        if sprint is None:
+            raise LookupError(f"Sprint {sprint_id} does not exist.")
+        return sprint
+
+    def _get_sprint(self, query, payload, sprint_id):
+        return 200, self.render_sprint(self._sprint(sprint_id))
+
+    def _update_sprint(self, query, payload, sprint_id):
+        sprint = self._sprint(sprint_id)
+        for name in ("name", "state", "startDate", "endDate", "goal"):
+            if payload.get(name) is not None:
+                sprint[name] = payload[name]
+        self._changed()
+        return 200, self.render_sprint(sprint)
+
+    def _delete_sprint(self, query, payload, sprint_id):
+        self._sprint(sprint_id)
+        del self.sprints[int(sprint_id)]
+        for issue in self.issues.values():
+            if issue.sprint == int(sprint_id):
+                issue.sprint = None
+        self._changed()
+        return 204, None
+
+    def _move_to_sprint(self, query, payload, sprint_id):
+        self._sprint(sprint_id)
+        keys = payload.get("issues", [])
+        if len(keys) > 50:
+            raise ValueError("Cannot move more than 50 issues at once.")
+        for key in keys:
+            issue = self._issue(key)
+            issue.sprint = int(sprint_id)
+            self._touch(issue)
+        return 204, None
+
+    def _sprint_issues(self, query, payload, sprint_id):
+        self._sprint(sprint_id)
+        keys = [key for key in self.issue_order if self.issues[key].sprint == int(sprint_id)]
+        return self._board_issue_page(query, keys)
+
+    def _move_to_epic(self, query, payload, epic_key):
+        epic = self._issue(epic_key)
+        for key in payload.get("issues", []):
+            issue = self._issue(key)
+            issue.epic = epic.key
+            self._touch(issue)
+        return 204, None
+
+    # Request log
+
+    def request_count(self):
+        with self.lock:
+            return len(self.requests)
+
+    def reset_requests(self):
+        with self.lock:
+            self.requests = []
+
+
+# JQL subset used by the fake search endpoint
+
+_JQL_TOKEN = re.compile(
+    r"""\s*(?:(?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')|(?P<op>!=|>=|<=|!~|=|~|>|<|\(|\)|,)|(?P<word>[^\s=!~<>(),"']+))"""
+)
+
+
+def _tokenize(jql):
+    tokens = []
+    position = 0
+    jql = jql.strip()
+    while position < len(jql):
+        match = _JQL_TOKEN.match(jql, position)
+        if not match or match.end() == position:
+            raise ValueError(f"Error in the JQL Query: unexpected character at {position}")
+        position = match.end()
+        if match.group("string") is not None:
+            tokens.append(("value", match.group("string")[1:-1]))
+        elif match.group("op") is not None:
+            tokens.append(("op", match.group("op")))
+        else:
+            tokens.append(("word", match.group("word")))
+    return tokens
+
+
+def _quoted_keys(jql):
+    match = re.search(r"\bkey\s+in\s*\(([^)]*)\)", jql, re.IGNORECASE)
+    if not match:
+        return []
+    return [value.strip().strip("'\"") for value in match.group(1).split(",") if value.strip()]
+
+
+def parse_jql(jql):
+    """
+    Parse a JQL string into (condition, order_by).
+
+    ``condition`` is a callable taking (fake, issue); ``order_by`` is a list
+    of (field, descending) tuples.
+    """
+    tokens = _tokenize(jql)
+    order = []
+    for index, token in enumerate(tokens):
+        if (
+            token[0] == "word"
+            and token[1].lower() == "order"
+            and index + 1 < len(tokens)
+            and tokens[index + 1][1].lower() == "by"
+        ):
+            order_tokens = tokens[index + 2 :]
+            tokens = tokens[:index]
+            current = None
+            for kind, value in order_tokens:
+                if kind == "op" and value == ",":
+                    current = None
+                elif value.lower() in ("asc", "desc") and current is not None:
+                    order[-1] = (order[-1][0], value.lower() == "desc")
+                else:
+                    current = value.lower()
+                    order.append((current, False))
+            break
+    if not tokens:
+        return (lambda fake, issue: True), order
+    parser = _JqlParser(tokens)
+    condition = parser.parse_or()
+    if parser.position != len(tokens):
+        raise ValueError(f"Error in the JQL Query: unexpected '{tokens[parser.position][1]}'")
+    return condition, order
+
+
+class _JqlParser:
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.position = 0
+
+    def peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else (None, None)
+
+    def take(self):
+        token = self.peek()
+        self.position += 1
+        return token
+
+    def parse_or(self):
+        left = self.parse_and()
+        while self.peek()[0] == "word" and self.peek()[1].lower() == "or":
+            self.take()
+            right = self.parse_and()
+            left = (lambda a, b: lambda fake, issue: a(fake, issue) or b(fake, issue))(left, right)
+        return left
+
+    def parse_and(self):
+        left = self.parse_not()
+        while self.peek()[0] == "word" and self.peek()[1].lower() == "and":
+            self.take()
+            right = self.parse_not()
+            left = (lambda a, b: lambda fake, issue: a(fake, issue) and b(fake, issue))(left, right)
+        return left
+
+    def parse_not(self):
+        if self.peek()[0] == "word" and self.peek()[1].lower() == "not":
+            self.take()
+            inner = self.parse_not()
+            return lambda fake, issue: not inner(fake, issue)
+        return self.parse_clause()
+
+    def parse_clause(self):
+        if self.peek() == ("op", "("):
+            self.take()
+            inner = self.parse_or()
+            if self.take() != ("op", ")"):
+                raise ValueError("Error in the JQL Query: expected ')'")
+            return inner
+        field = self.take()[1]
+        if field is None:
+            raise ValueError("Error in the JQL Query: expected a field")
+        field = field.lower()
+        kind, operator = self.take()
+        if operator is None:
+            raise ValueError("Error in the JQL Query: expected an operator")
+        operator = operator.lower()
+        if operator == "not" and self.peek()[1] and self.peek()[1].lower() == "in":
+            self.take()
+            operator = "not in"
+        if operator == "is":
+            negate = False
+            if self.peek()[1] and self.peek()[1].lower() == "not":
+                self.take()
+                negate = True
+            value = self.take()[1]
+            if value is None or value.lower() not in ("empty", "null"):
+                raise ValueError("Error in the JQL Query: expected EMPTY")
+            return lambda fake, issue: (_field_values(fake, issue, field) == []) != negate
+        if operator in ("in", "not in"):
+            if self.take() != ("op", "("):
+                raise ValueError("Error in the JQL Query: expected '('")
+            values = []
+            while self.peek() != ("op", ")"):
+                token = self.take()
+                if token[0] is None:
+                    raise ValueError("Error in the JQL Query: expected ')'")
+                if token != ("op", ","):
+                    values.append(token[1].lower())
+            self.take()
+            wanted = set(values)
+            if operator == "in":
+                return lambda fake, issue: any(v in wanted for v in _field_values(fake, issue, field))
+            return lambda fake, issue: not any(v in wanted for v in _field_values(fake, issue, field))
+        value = self.take()[1]
+        if value is None:
+            raise ValueError("Error in the JQL Query: expected a value")
+        value = value.lower()
+        if operator == "=":
+            return lambda fake, issue: value in _field_values(fake, issue, field)
+        if operator == "!=":
+            return lambda fake, issue: value not in _field_values(fake, issue, field)
+        if operator in ("~", "!~"):
+            terms = [term for term in re.split(r"\W+", value) if term]
+
+            def contains(fake, issue):
+                text = " ".join(_field_values(fake, issue, field))
+                return all(term in text for term in terms)
+
+            if operator == "~":
+                return contains
+            return lambda fake, issue: not contains(fake, issue)
+        if operator in (">", ">=", "<", "<="):
+            bound = _parse_jql_date(value)
+            compare = {
+                ">": lambda a: a > bound,
+                ">=": lambda a: a >= bound,
+                "<": lambda a: a < bound,
+                "<=": lambda a: a <= bound,
+            }[operator]
+            return lambda fake, issue: any(
+                compare(stamp) for stamp in _date_values(issue, field)
+            )
+        raise ValueError(f"Error in the JQL Query: unsupported operator '{operator}'")
+
+
+def _parse_jql_date(value):
+    relative = re.fullmatch(r"([-+]?\d+)([mhdw])", value.strip())
+    if relative:
+        unit = {"m": "minutes", "h": "hours", "d": "days", "w": "weeks"}[relative.group(2)]
+        return datetime.now(timezone.utc) + timedelta(**{unit: int(relative.group(1))})
+    for date_format in ("%Y/%m/%d %H:%M", "%Y-%m-%d %H:%M", "%Y/%m/%d", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(value, date_format).replace(tzinfo=timezone.utc)
+        except ValueError:
+            pass
+    raise ValueError(f"Error in the JQL Query: date value '{value}' is invalid")
+
+
+def _date_values(issue, field):
+    if field in ("updated", "updateddate"):
+        return [issue.updated]
+    if field in ("created", "createddate"):
+        return [issue.created]
+    return []
+
+
+def _field_values(fake, issue, field):
+    if field == "project":
+        project = fake.projects.get(issue.project, {})
+        return [issue.project.lower(), project.get("id", ""), project.get("name", "").lower()]
+    if field in ("issuetype", "type"):
+        return [issue.issue_type.lower()]
+    if field == "status":
+        return [issue.status.lower()]
+    if field in ("statuscategory",):
+        return [STATUS_CATEGORIES.get(issue.status, ("", ""))[1].lower()]
+    if field in ("assignee", "reporter"):
+        index = issue.assignee if field == "assignee" else issue.reporter
+        if index is None:
+            return []
+        user = fake.users[index]
+        return [
+            user["accountId"].lower(),
+            user["displayName"].lower(),
+            user["emailAddress"].lower(),
+            user["name"].lower(),
+        ]
+    if field == "sprint":
+        sprint = fake.sprints.get(issue.sprint)
+        return [str(issue.sprint), sprint["name"].lower()] if sprint else []
+    if field in ("epic link", "cf[10014]", "parent", "parentepic"):
+        return [issue.epic.lower()] if issue.epic else []
+    if field in ("key", "issuekey", "id"):
+        return [issue.key.lower(), issue.id]
+    if field == "summary":
+        return [issue.summary.lower()]
+    if field == "description":
+        return [issue.description.lower()] if issue.description else []
+    if field == "text":
+        comments = " ".join(body for _, body, _ in issue.comments or ())
+        return [f"{issue.summary} {issue.description or ''} {comments}".lower()]
+    return []
+
+
+def _sort_value(fake, issue, field):
+    if field in ("key", "issuekey"):
+        return (issue.project, int(issue.key.rsplit("-", 1)[1]))
+    if field in ("updated", "created"):
+        return _date_values(issue, field)[0]
+    if field == "rank":
+        return issue.rank
+    values = _field_values(fake, issue, field)
+    return values[0] if values else ""
+
+
+# Recording transport
+
+
+class FakeJiraAdapter(BaseAdapter):
+    """
+    requests transport adapter that answers from a FakeJira without sockets.
+
+    Every request also lands in ``fake.requests`` in the order it was sent.
+    """
+
+    def __init__(self, fake):
+        super().__init__()
+        self.fake = fake
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        status, headers, content = self.fake.handle(
+            request.method, request.url, request.body, dict(request.headers)
+        )
+        response = requests.Response()
+        response.status_code = status
+        response.headers = CaseInsensitiveDict(headers)
+        response.headers["Content-Length"] = str(len(content))
+        response._content = content
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        response.reason = "OK" if status < 400 else "Error"
+        return response
+
+    def close(self):
+        pass
+
+
+def connect(fake, user="bench@example.com", api_token="token"):
+    """
+    Return a JIRA client whose session talks to ``fake`` through a FakeJiraAdapter.
+    """
+    from jira import JIRA
+
+    jira = JIRA(
+        basic_auth=(user, api_token),
+        options={"server": fake.base_url},
+        get_server_info=False,
+        max_retries=0,
+    )
+    jira._session.mount(fake.base_url, FakeJiraAdapter(fake))
+    return jira
+
+
+def recording_session(fake):
+    """
+    Return a plain requests session bound to ``fake``, for code that calls the
+    requests module directly.
+    """
+    session = requests.Session()
+    session.mount(fake.base_url, FakeJiraAdapter(fake))
+    return session
+
+
+# HTTP front end
+
+
+class FakeJiraServer:
+    """
+    Serve a FakeJira over HTTP on localhost.
+
+    Use it as a context manager; ``url`` holds the server address once started.
+    """
+
+    def __init__(self, fake=None, host="127.0.0.1", port=0, **dataset_options):
+        self.fake = fake or FakeJira(**dataset_options)
+        self.host = host
+        self.port = port
+        self.httpd = None
+        self.thread = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.httpd.server_port}"
+
+    def start(self):
+        fake = self.fake
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def _serve(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else None
+                status, headers, content = fake.handle(
+                    self.command, self.path, body, dict(self.headers)
+                )
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                if content and self.command != "HEAD":
+                    self.wfile.write(content)
+
+            do_GET = do_POST = do_PUT = do_DELETE = do_HEAD = _serve
+
+        self.httpd = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.httpd.daemon_threads = True
+        fake.base_url = self.url
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
+
+    def write_config(self, file_path, user="bench@example.com", api_token="token"):
+        with open(file_path, "w") as f:
+            json.dump({"jira_url": self.url, "user": user, "api_token": api_token}, f)
+        return file_path
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
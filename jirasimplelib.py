@@ -1,12 +1,57 @@
+# PYTHON_ARGCOMPLETE_OK
+import os
+import sys
+
+if "_ARGCOMPLETE" in os.environ and __name__ == "__main__":
+    # Shell completion: answer from the local index before the slow imports below
+    import jslcomplete
+
+    jslcomplete.autocomplete()
+
 import blessed
 from blessed import Terminal
 import logging
 from jira import JIRA, JIRAError
 from jira.exceptions import JIRAError
+from jira.resources import Issue
 import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+import array
+import codecs
+import contextlib
+import contextvars
+import functools
+import gzip
 import json
-import os
+import math
+import queue
+import re
+import sqlite3
+import hashlib
+import hmac
+import threading
+import time
 import argparse
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+import jslcomplete
+
+try:
+    import numpy
+except ImportError:
+    # Changelog reports fall back to plain Python loops
+    numpy = None
+
+try:
+    import zstandard
+except ImportError:
+    # Backups are gzip-compressed only
+    zstandard = None
 
 
 # Load credentials from JSON file
@@ -33,26 +78,725 @@ logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 logger = logging.getLogger(__name__)
 
 
+# Upper bounds (in milliseconds) of the latency histogram buckets kept per endpoint
+PROFILE_LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Status codes the jira ResilientSession retries on
+RETRY_STATUS_CODES = (429, 503)
+
+_ISSUE_KEY_PATTERN = re.compile(r"^[A-Z][A-Z0-9_]+-\d+$")
+
+# Profiler that records the raw requests calls made outside of a JIRA session
+_active_profiler = None
+
+# RunPlan of the CLI invocation in progress, see run_commands. A context
+# variable so every site of a --sites run keeps its own plan
+_active_plan = contextvars.ContextVar("_active_plan", default=None)
+
+# IssueStore that project and sprint reads answer from, see use_issue_store
+_active_store = None
+
+# Values a CLI run saw for the shell completion index, see remember_completions
+_completion_values = None
+
+
+def _endpoint_template(url):
+    # Collapse ids and issue keys so that calls to the same endpoint are grouped
+    path = urlparse(url or "").path
+    segments = []
+    for segment in path.split("/"):
+        if segment.isdigit() and segments and segments[-1] not in ("api", "agile"):
+            segments.append("{id}")
+        elif _ISSUE_KEY_PATTERN.match(segment):
+            segments.append("{key}")
+        else:
+            segments.append(segment)
+    return "/".join(segments) or "/"
+
+
+# Public function a worker thread is doing work for; set by the parallel search
+_profiled_function = contextvars.ContextVar("_profiled_function", default=None)
+
+# Public helpers whose requests are attributed to the function that called them
+_PROFILER_PASSTHROUGH = {"search_issue_records", "iter_json_array"}
+
+
+def _calling_function():
+    # Innermost public function of this module on the current stack
+    function = _profiled_function.get()
+    if function:
+        return function
+    frame = sys._getframe(1)
+    while frame is not None:
+        code = frame.f_code
+        func = globals().get(code.co_name)
+        if (
+            getattr(func, "__code__", None) is code
+            and not code.co_name.startswith("_")
+            and code.co_name != "main"
+            and code.co_name not in _PROFILER_PASSTHROUGH
+        ):
+            return code.co_name
+        frame = frame.f_back
+    return "<unknown>"
+
+
+class ApiProfiler:
+    """
+    Collect call counts, latency histograms, response sizes and retries
+    for every HTTP request made against Jira.
+
+    Requests are grouped by endpoint (method plus the URL path with ids and
+    issue keys collapsed) and by the public function of this module that
+    issued them.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.endpoints = {}
+        self.functions = {}
+        self.started = time.perf_counter()
+
+    def instrument(self, session):
+        """
+        Wrap the ``send`` method of a requests session so every attempt,
+        including the ones retried by the jira ResilientSession, is recorded.
+
+        :param session: requests.Session (for a JIRA object, ``jira._session``)
+        :return: The session
+        """
+        send = session.send
+        profiler = self
+
+        def profiled_send(request, **kwargs):
+            started = time.perf_counter()
+            try:
+                response = send(request, **kwargs)
+            except Exception:
+                profiler.record(
+                    request.method, request.url, None, time.perf_counter() - started, 0
+                )
+                raise
+            profiler.record(
+                request.method,
+                request.url,
+                response.status_code,
+                time.perf_counter() - started,
+                _response_size(response),
+                cached=getattr(response, "from_cache", False),
+            )
+            return response
+
+        session.send = profiled_send
+        return session
+
+    def record(self, method, url, status, elapsed, size, cached=False, function=None):
+        endpoint = f"{(method or 'GET').upper()} {_endpoint_template(url)}"
+        function = function or _calling_function()
+        elapsed_ms = elapsed * 1000
+        with self._lock:
+            stats = self.endpoints.get(endpoint)
+            if stats is None:
+                stats = self.endpoints[endpoint] = {
+                    "calls": 0,
+                    "errors": 0,
+                    "retries": 0,
+                    "cached": 0,
+                    "bytes": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "histogram": [0] * (len(PROFILE_LATENCY_BUCKETS_MS) + 1),
+                }
+            stats["calls"] += 1
+            stats["bytes"] += size
+            stats["total_ms"] += elapsed_ms
+            stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+            if cached:
+                stats["cached"] += 1
+            if status is None or status >= 400:
+                stats["errors"] += 1
+            if status is None or status in RETRY_STATUS_CODES:
+                stats["retries"] += 1
+            bucket = len(PROFILE_LATENCY_BUCKETS_MS)
+            for i, bound in enumerate(PROFILE_LATENCY_BUCKETS_MS):
+                if elapsed_ms <= bound:
+                    bucket = i
+                    break
+            stats["histogram"][bucket] += 1
+
+            per_function = self.functions.setdefault(
+                function, {"calls": 0, "bytes": 0, "total_ms": 0.0, "endpoints": {}}
+            )
+            per_function["calls"] += 1
+            per_function["bytes"] += size
+            per_function["total_ms"] += elapsed_ms
+            per_function["endpoints"][endpoint] = (
+                per_function["endpoints"].get(endpoint, 0) + 1
+            )
+
+    def report(self):
+        """
+        Return the collected statistics as a JSON serialisable dictionary.
+        """
+        with self._lock:
+            endpoints = {
+                endpoint: dict(
+                    stats,
+                    histogram=dict(
+                        zip(
+                            [f"<={bound}ms" for bound in PROFILE_LATENCY_BUCKETS_MS]
+                            + [f">{PROFILE_LATENCY_BUCKETS_MS[-1]}ms"],
+                            stats["histogram"],
+                        )
+                    ),
+                    avg_ms=round(stats["total_ms"] / stats["calls"], 2),
+                    total_ms=round(stats["total_ms"], 2),
+                    max_ms=round(stats["max_ms"], 2),
+                )
+                for endpoint, stats in self.endpoints.items()
+            }
+            functions = {
+                name: dict(
+                    stats,
+                    endpoints=dict(stats["endpoints"]),
+                    total_ms=round(stats["total_ms"], 2),
+                )
+                for name, stats in self.functions.items()
+            }
+        return {
+            "wall_ms": round((time.perf_counter() - self.started) * 1000, 2),
+            "requests": sum(stats["calls"] for stats in endpoints.values()),
+            "bytes": sum(stats["bytes"] for stats in endpoints.values()),
+            "endpoints": endpoints,
+            "functions": functions,
+        }
+
+    def dump_json(self, file_path):
+        with open(file_path, "w") as f:
+            json.dump(self.report(), f, indent=2)
+        logging.info(f"API profile written to {file_path}")
+
+    def print_report(self):
+        term = blessed.Terminal()
+        report = self.report()
+        print(
+            term.bold(
+                f"API profile: {report['requests']} requests, "
+                f"{report['bytes']} bytes in {report['wall_ms']} ms"
+            )
+        )
+        headers = ["Endpoint", "Calls", "Errors", "Retries", "Bytes", "Avg ms", "Max ms"]
+        rows = [
+            (
+                endpoint,
+                stats["calls"],
+                stats["errors"],
+                stats["retries"],
+                stats["bytes"],
+                stats["avg_ms"],
+                stats["max_ms"],
+            )
+            for endpoint, stats in sorted(
+                report["endpoints"].items(), key=lambda item: -item[1]["total_ms"]
+            )
+        ]
+        _print_table(term, headers, rows)
+        headers = ["Function", "Calls", "Bytes", "Total ms"]
+        rows = [
+            (name, stats["calls"], stats["bytes"], stats["total_ms"])
+            for name, stats in sorted(
+                report["functions"].items(), key=lambda item: -item[1]["total_ms"]
+            )
+        ]
+        _print_table(term, headers, rows)
+
+
+def _table_lines(term, headers, rows):
+    max_lengths = [len(header) for header in headers]
+    for row in rows:
+        for i, value in enumerate(row):
+            max_lengths[i] = max(max_lengths[i], len(str(value)))
+    boundary = term.green(
+        "+-" + "-+-".join("-" * length for length in max_lengths) + "-+"
+    )
+    lines = [
+        boundary,
+        f"| {' | '.join(f'{header:<{max_lengths[i]}}' for i, header in enumerate(headers))} |",
+        boundary,
+    ]
+    for row in rows:
+        lines.append(
+            f"| {' | '.join(f'{str(value):<{max_lengths[i]}}' for i, value in enumerate(row))} |"
+        )
+    lines.append(boundary)
+    return lines
+
+
+def _print_table(term, headers, rows):
+    for line in _table_lines(term, headers, rows):
+        print(line)
+
+
+def _response_size(response):
+    # Prefer the declared length so streamed bodies are not read here
+    length = response.headers.get("Content-Length") if response.headers else None
+    if length and length.isdigit():
+        return int(length)
+    content = getattr(response, "_content", None)
+    return len(content) if isinstance(content, bytes) else 0
+
+
+# GET endpoints whose responses may be served from the ResponseCache
+CACHEABLE_PATHS = (
+    re.compile(r"/rest/api/(2|latest)/(serverInfo|field|project|project/[^/]+)$"),
+    re.compile(r"/rest/api/(2|latest)/issue/[^/]+$"),
+    re.compile(r"/rest/agile/1\.0/board$"),
+    re.compile(r"/rest/agile/1\.0/board/\d+(/sprint)?$"),
+    re.compile(r"/rest/agile/1\.0/sprint/\d+$"),
+)
+
+# Cached resource families dropped when a write touches a given family
+CACHE_INVALIDATES = {
+    "issue": ("issue",),
+    "epic": ("issue",),
+    "sprint": ("sprint", "board", "issue"),
+    "board": ("board",),
+    "project": ("project", "board"),
+}
+
+
+def _resource_family(url):
+    # First path segment after the API version, e.g. "issue" or "sprint"
+    match = re.search(r"/rest/(?:api/(?:2|latest)|agile/1\.0)/([^/?]+)", url)
+    return match.group(1) if match else None
+
+
+class ResponseCache:
+    """
+    Size-bounded LRU cache of GET responses.
+
+    Entries that came with an ETag or Last-Modified header are revalidated
+    with a conditional request (a 304 answer costs no body); entries without
+    validators are served without a request until ``ttl`` seconds have
+    passed. When ``cache_dir`` is given, entries are also written there so
+    later runs can reuse them.
+
+    :param max_entries: Most responses kept in memory (and on disk)
+    :param max_bytes: Most response body bytes kept in memory
+    :param ttl: Seconds an entry without validators stays fresh
+    :param cache_dir: Directory for the on-disk copy (optional)
+    """
+
+    def __init__(self, max_entries=512, max_bytes=32 * 1024 * 1024, ttl=60, cache_dir=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.cache_dir = cache_dir
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._disk_lock = threading.RLock()
+        self._disk_families = None
+        if cache_dir:
+            os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+
+    def key(self, request):
+        # Include the credentials so a shared cache_dir never mixes users
+        auth = request.headers.get("Authorization", "")
+        return hashlib.sha1(f"{auth}\n{request.url}".encode("utf-8")).hexdigest()
+
+    def cacheable(self, request):
+        if request.method != "GET":
+            return False
+        path = urlparse(request.url).path
+        return any(pattern.search(path) for pattern in CACHEABLE_PATHS)
+
+    def get(self, key):
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                return entry
+        entry = self._read_disk(key)
+        if entry is not None:
+            self._store(key, entry)
+        return entry
+
+    def is_fresh(self, entry):
+        if entry.get("etag") or entry.get("last_modified"):
+            return False
+        return time.time() - entry["stored_at"] < self.ttl
+
+    def put(self, key, response):
+        entry = {
+            "url": response.url,
+            "family": _resource_family(response.url or ""),
+            "status": response.status_code,
+            "headers": dict(response.headers),
+            "content": response.content.decode("latin-1"),
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "stored_at": time.time(),
+        }
+        self._store(key, entry)
+        self._write_disk(key, entry)
+        return entry
+
+    def touch(self, key, entry):
+        entry["stored_at"] = time.time()
+        self._write_disk(key, entry)
+
+    def _store(self, key, entry):
+        with self._lock:
+            previous = self.entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous["content"])
+            self.entries[key] = entry
+            self.size += len(entry["content"])
+            while self.entries and (
+                len(self.entries) > self.max_entries or self.size > self.max_bytes
+            ):
+                _, evicted = self.entries.popitem(last=False)
+                self.size -= len(evicted["content"])
+
+    def invalidate(self, families=None):
+        """
+        Drop cached entries of the given resource families (all when None).
+        """
+        with self._lock:
+            for key in list(self.entries):
+                entry = self.entries[key]
+                if families is None or entry["family"] in families:
+                    self.size -= len(entry["content"])
+                    del self.entries[key]
+        if self.cache_dir:
+            with self._disk_lock:
+                for key, family in list(self._disk_index().items()):
+                    if families is None or family is None or family in families:
+                        self._remove_disk(key)
+
+    def invalidate_for_write(self, url):
+        family = _resource_family(url)
+        self.invalidate(CACHE_INVALIDATES.get(family, (family,)))
+
+    def _disk_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _disk_index(self):
+        # Family of every entry on disk, read once and then kept up to date
+        if self._disk_families is None:
+            self._disk_families = {}
+            names = [name for name in os.listdir(self.cache_dir) if name.endswith(".json")]
+            names.sort(key=lambda name: os.path.getmtime(os.path.join(self.cache_dir, name)))
+            for name in names:
+                try:
+                    with open(os.path.join(self.cache_dir, name)) as f:
+                        family = json.load(f).get("family")
+                except (OSError, ValueError):
+                    family = None
+                self._disk_families[name[: -len(".json")]] = family
+        return self._disk_families
+
+    def _remove_disk(self, key):
+        self._disk_index().pop(key, None)
+        try:
+            os.remove(self._disk_path(key))
+        except OSError:
+            pass
+
+    def _read_disk(self, key):
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._disk_path(key)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_disk(self, key, entry):
+        if not self.cache_dir:
+            return
+        path = self._disk_path(key)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with self._disk_lock:
+            fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w") as f:
+                json.dump(entry, f)
+            os.replace(temp_path, path)
+            index = self._disk_index()
+            index.pop(key, None)
+            index[key] = entry["family"]
+            # Dictionary order doubles as write order, so the oldest entries go first
+            while len(index) > self.max_entries:
+                self._remove_disk(next(iter(index)))
+
+    def response(self, entry, request):
+        response = requests.Response()
+        response.status_code = entry["status"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response._content = entry["content"].encode("latin-1")
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.reason = "OK"
+        response.from_cache = True
+        return response
+
+
+class CachingAdapter(requests.adapters.BaseAdapter):
+    """
+    Transport adapter that answers cacheable GETs from a ResponseCache and
+    forwards everything else to the adapter it wraps.
+    """
+
+    def __init__(self, cache, adapter):
+        super().__init__()
+        self.cache = cache
+        self.adapter = adapter
+
+    def send(self, request, **kwargs):
+        if not self.cache.cacheable(request):
+            if request.method in ("POST", "PUT", "DELETE"):
+                self.cache.invalidate_for_write(request.url)
+            return self.adapter.send(request, **kwargs)
+
+        key = self.cache.key(request)
+        entry = self.cache.get(key)
+        if entry is not None:
+            if self.cache.is_fresh(entry):
+                self.cache.hits += 1
+                return self.cache.response(entry, request)
+            if entry.get("etag"):
+                request.headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                request.headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = self.adapter.send(request, **kwargs)
+        if response.status_code == 304 and entry is not None:
+            self.cache.revalidated += 1
+            self.cache.touch(key, entry)
+            cached = self.cache.response(entry, request)
+            cached.elapsed = response.elapsed
+            return cached
+        self.cache.misses += 1
+        if response.status_code == 200:
+            self.cache.put(key, response)
+        return response
+
+    def close(self):
+        self.adapter.close()
+
+
+def enable_response_cache(jira, cache=None, **cache_options):
+    """
+    Serve repeated metadata and issue reads of a JIRA object from a cache.
+
+    :param jira: JIRA object
+    :param cache: Existing ResponseCache to share (optional)
+    :param cache_options: ResponseCache arguments used when no cache is given
+    :return: The ResponseCache
+    """
+    cache = cache or ResponseCache(**cache_options)
+    session = jira._session
+    for prefix, adapter in list(session.adapters.items()):
+        if not isinstance(adapter, CachingAdapter):
+            session.mount(prefix, CachingAdapter(cache, adapter))
+    return cache
+
+
+def enable_profiling(jira=None, profiler=None):
+    """
+    Start recording API calls.
+
+    :param jira: JIRA object whose session should be instrumented (optional)
+    :param profiler: Existing ApiProfiler to reuse (optional)
+    :return: The active ApiProfiler
+    """
+    global _active_profiler
+    profiler = profiler or _active_profiler or ApiProfiler()
+    if jira is not None:
+        profiler.instrument(jira._session)
+    _active_profiler = profiler
+    return profiler
+
+
+def disable_profiling():
+    global _active_profiler
+    _active_profiler = None
+
+
+def _record_raw_response(method, response, started):
+    # Record a call made with the bare requests module
+    if _active_profiler is None:
+        return
+    _active_profiler.record(
+        method,
+        response.url,
+        response.status_code,
+        time.perf_counter() - started,
+        _response_size(response),
+    )
+
+
 def read_config(filename):
     with open(filename, "r") as f:
         config = json.load(f)
     return config
 
 
-def create_jira_connection(config_file):
+# Where --session-dir keeps session state between runs, see SessionStore
+DEFAULT_SESSION_DIR = os.path.join(os.path.expanduser("~"), ".jirasimplelib", "sessions")
+
+# Seconds saved server info is trusted before the handshake runs again
+SESSION_MAX_AGE = 24 * 60 * 60
+
+
+class SessionStore:
+    """
+    Session state of one site and user kept between runs: the cookies the
+    server set, its server info and deployment type. A connection restored
+    from it skips the server-info handshake. The file holds no credentials
+    and only its owner can read it.
+
+    Without the handshake, bad credentials first show on the run's first
+    request; a 401 answer clears the saved state so the next run
+    authenticates from scratch.
+    """
+
+    def __init__(self, session_dir, jira_url, user, max_age=SESSION_MAX_AGE):
+        self.session_dir = session_dir
+        self.max_age = max_age
+        digest = hashlib.sha256(f"{jira_url.rstrip('/')}\n{user}".encode("utf-8")).hexdigest()
+        self.path = os.path.join(session_dir, f"{digest[:32]}.json")
+
+    def load(self):
+        try:
+            with open(self.path) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - state.get("saved_at", 0) > self.max_age:
+            return None
+        return state
+
+    def restore(self, jira):
+        """
+        :return: True if the saved state was applied to jira
+        """
+        state = self.load()
+        if not state or not state.get("server_info"):
+            return False
+        _apply_server_info(jira, state["server_info"])
+        now = time.time()
+        for cookie in state.get("cookies", ()):
+            if cookie.get("expires") is None or cookie["expires"] > now:
+                jira._session.cookies.set(**cookie)
+        jira._session.hooks["response"].append(self._rejected)
+        return True
+
+    def _rejected(self, response, *args, **kwargs):
+        # Response hook of a restored session: forget the state if the credentials fail
+        if response.status_code == 401:
+            self.clear()
+            logging.error(
+                "Jira rejected the credentials; the saved session was cleared, check the API token."
+            )
+
+    def save(self, jira, server_info=None):
+        state = self.load() or {}
+        state["server_info"] = server_info or state.get("server_info")
+        if not state["server_info"]:
+            return
+        state["saved_at"] = time.time()
+        state["cookies"] = [
+            {
+                "name": cookie.name,
+                "value": cookie.value,
+                "domain": cookie.domain,
+                "path": cookie.path,
+                "secure": cookie.secure,
+                "expires": cookie.expires,
+            }
+            for cookie in jira._session.cookies
+        ]
+        os.makedirs(self.session_dir, mode=0o700, exist_ok=True)
+        temp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump(state, f)
+        os.replace(temp_path, self.path)
+
+    def clear(self):
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(self.path)
+
+
+def save_session(jira):
+    # Keep the cookies a run collected for the next one
+    session = getattr(jira, "_session_store", None)
+    if session is None:
+        return
+    try:
+        session.save(jira)
+    except OSError as e:
+        logging.debug(f"Could not save the Jira session: {e}")
+
+
+def _load_server_info(jira):
+    # Same handshake the JIRA constructor performs when get_server_info=True
+    server_info = jira.server_info()
+    _apply_server_info(jira, server_info)
+    return server_info
+
+
+def _apply_server_info(jira, server_info):
+    jira._version = tuple(server_info["versionNumbers"])
+    jira.deploymentType = server_info.get("deploymentType")
+
+
+def create_jira_connection(config_file, profiler=None, session_dir=None):
     try:
-        with open(config_file, "r") as file:
-            config_data = json.load(file)
-            jira_url = config_data.get("jira_url")
-            user = config_data.get("user")
-            api_token = config_data.get("api_token")
+        if isinstance(config_file, dict):
+            # Inline config from a site list, see load_sites
+            config_data = config_file
+        else:
+            with open(config_file, "r") as file:
+                config_data = json.load(file)
+        jira_url = config_data.get("jira_url")
+        user = config_data.get("user")
+        api_token = config_data.get("api_token")
 
-            if not all([jira_url, user, api_token]):
-                raise ValueError("Missing or incomplete configuration data")
+        if not all([jira_url, user, api_token]):
+            raise ValueError("Missing or incomplete configuration data")
 
+        if profiler is None and session_dir is None:
             jira = JIRA(basic_auth=(user, api_token), options={"server": jira_url})
-            logging.info("Jira connection established successfully.")
-            return jira
+        else:
+            # Instrument the session before the server-info handshake so it is recorded too
+            jira = JIRA(
+                basic_auth=(user, api_token),
+                options={"server": jira_url},
+                get_server_info=False,
+            )
+            if profiler is not None:
+                enable_profiling(jira, profiler)
+            session = SessionStore(session_dir, jira_url, user) if session_dir else None
+            jira._session_store = session
+            if session is not None and session.restore(jira):
+                # Credentials are checked by the first request, see SessionStore
+                logging.info("Jira connection restored from the saved session.")
+                return jira
+            server_info = _load_server_info(jira)
+            if session is not None:
+                try:
+                    session.save(jira, server_info)
+                except OSError as e:
+                    logging.debug(f"Could not save the Jira session: {e}")
+        logging.info("Jira connection established successfully.")
+        return jira
     except FileNotFoundError:
         logging.error(f"Config file not found: {config_file}")
     except ValueError as ve:
@@ -63,130 +807,1880 @@ def create_jira_connection(config_file):
         logging.error(f"Error creating Jira connection: {e}")
     return None
 
-    # Function to create a new project in Jira
+    # Function to create a new project in Jira
+
+
+def create_jira_project(jira, project_name, project_key):
+    if not jira:
+        logging.error("Failed to create project: Jira connection not established.")
+        return False
+
+    # Attempt to create the project
+    try:
+        project = jira.create_project(project_key, project_name)
+        logging.info(
+            f"Project '{project_name}' created successfully with key '{project_key}'."
+        )
+        return project
+    except JIRAError as e:
+        logging.error(f"Error creating project: {e}")
+        return None
+
+
+def update_jira_project(jira, project_key, new_name=None, new_key=None):
+    if not jira:
+        logging.error("Failed to update project: Jira connection not established.")
+        return False
+
+    if not new_name and not new_key:
+        logging.error("Failed to update project: No new name or key provided.")
+        return False
+
+    try:
+        project = jira.project(project_key)
+        if new_name:
+            project.update(name=new_name)
+            logging.info(f"Project name updated to '{new_name}' successfully.")
+        if new_key:
+            project.update(key=new_key)
+            logging.info(f"Project key updated to '{new_key}' successfully.")
+        return True
+    except JIRAError as e:
+        logging.error(f"Error updating project: {e}")
+        return False
+    except Exception as e:
+        logging.error(f"Error updating project: {e}")
+        return False
+
+
+# list of all projects
+def list_projects(jira):
+    try:
+        projects = jira.projects()
+        for project in projects:
+            print(f"Project Key: {project.key}, Name: {project.name}")
+        return projects
+    except JIRAError as e:
+        print(f"Error listing projects: {e}")
+        return None
+
+
+def delete_all_projects(jira):
+    try:
+        # Get all projects
+        projects = jira.projects()
+
+        # Iterate over projects
+        for project in projects:
+            # Delete project
+            jira.delete_project(project.key)
+            logging.info(f"Project {project.key} deleted successfully.")
+
+        logging.info("All projects have been deleted.")
+        return True
+    except Exception as e:
+        logging.error(f"Error deleting projects: {e}")
+        return False
+
+
+def delete_project(jira, project_key):
+    try:
+        # Delete project
+        jira.delete_project(project_key)
+        logging.info(f"Project {project_key} deleted successfully.")
+        return True
+    except Exception as e:
+        logging.error(f"Error deleting project {project_key}: {e}")
+        return False
+
+
+# Largest page Jira Cloud returns for a search
+SEARCH_PAGE_SIZE = 100
+
+# Bytes read from a streamed search response at a time
+SEARCH_CHUNK_SIZE = 64 * 1024
+
+# Search pages fetched concurrently by project-wide scans
+SEARCH_WORKERS = 4
+
+EPIC_LINK_FIELD = "customfield_10014"
+SPRINT_FIELD = "customfield_10020"
+RANK_FIELD = "customfield_10019"
+STORY_POINTS_FIELD = "customfield_10016"
+START_DATE_FIELD = "customfield_10015"
+
+# Issue types listed by get_stories_for_project
+STORY_ISSUE_TYPES = ("Bug", "Task", "Story")
+
+# Issue fields requested by search_issue_records; everything else stays on the server
+ISSUE_RECORD_FIELDS = (
+    "issuetype",
+    "status",
+    "assignee",
+    "summary",
+    "duedate",
+    "updated",
+    START_DATE_FIELD,
+    EPIC_LINK_FIELD,
+    SPRINT_FIELD,
+    STORY_POINTS_FIELD,
+)
+
+
+class IssueRecord:
+    """
+    Lightweight, read-only view of an issue returned by the listing functions.
+
+    Holds only the projected fields as plain values instead of the nested
+    Resource objects and raw JSON kept by jira.resources.Issue.
+    """
+
+    __slots__ = (
+        "id",
+        "key",
+        "issue_type",
+        "status",
+        "status_category",
+        "assignee",
+        "assignee_ids",
+        "summary",
+        "due_date",
+        "updated",
+        "start_date",
+        "epic_link",
+        "sprint_ids",
+        "story_points",
+        "rank",
+    )
+
+    # Column names used by render_tui and the older dictionary results
+    ALIASES = {
+        "Issue Type": "issue_type",
+        "Issue Key": "key",
+        "Status": "status",
+        "Assignee": "assignee",
+        "Summary": "summary",
+    }
+
+    def __init__(self, **values):
+        for name in self.__slots__:
+            setattr(self, name, values.get(name))
+
+    @classmethod
+    def from_json(cls, raw):
+        fields = raw.get("fields") or {}
+        return cls(
+            id=raw.get("id"),
+            key=raw.get("key"),
+            issue_type=_field_name(fields.get("issuetype")),
+            status=_field_name(fields.get("status")),
+            status_category=_status_category_key(fields.get("status")),
+            assignee=(fields.get("assignee") or {}).get("displayName"),
+            assignee_ids=_user_ids(fields.get("assignee")),
+            summary=fields.get("summary"),
+            due_date=fields.get("duedate"),
+            updated=fields.get("updated"),
+            start_date=fields.get(START_DATE_FIELD),
+            epic_link=fields.get(EPIC_LINK_FIELD),
+            sprint_ids=_sprint_ids(fields.get(SPRINT_FIELD)),
+            story_points=fields.get(STORY_POINTS_FIELD),
+            rank=fields.get(RANK_FIELD),
+        )
+
+    @property
+    def project_key(self):
+        return self.key.rsplit("-", 1)[0] if self.key else None
+
+    def get(self, name, default=None):
+        return getattr(self, self.ALIASES.get(name, name), default)
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __eq__(self, other):
+        if not isinstance(other, IssueRecord):
+            return NotImplemented
+        return self.as_dict() == other.as_dict()
+
+    def __repr__(self):
+        return f"IssueRecord(key={self.key!r}, summary={self.summary!r})"
+
+
+def _field_name(value):
+    return value.get("name") if isinstance(value, dict) else value
+
+
+def _status_category_key(value):
+    # "new", "indeterminate" or "done"
+    if not isinstance(value, dict):
+        return None
+    return (value.get("statusCategory") or {}).get("key")
+
+
+def _user_ids(value):
+    # Identifiers JQL accepts for a user besides the display name
+    if not isinstance(value, dict):
+        return ()
+    return tuple(
+        value[name] for name in ("accountId", "name", "emailAddress") if value.get(name)
+    )
+
+
+def _sprint_ids(value):
+    # The sprint field holds sprint objects, or "...[id=5,...]" strings on older servers
+    ids = []
+    for sprint in value or ():
+        if isinstance(sprint, dict):
+            ids.append(int(sprint["id"]))
+        else:
+            match = re.search(r"\bid=(\d+)", str(sprint))
+            if match:
+                ids.append(int(match.group(1)))
+    return tuple(ids)
+
+
+class _JsonStreamReader:
+    """
+    Reads JSON values one at a time from an iterable of byte chunks.
+
+    Only the text that has not been consumed yet is kept in memory.
+    """
+
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.decoder = json.JSONDecoder()
+        self.text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self.buffer = ""
+        self.position = 0
+        self.exhausted = False
+
+    def _fill(self):
+        if self.exhausted:
+            return False
+        self.buffer = self.buffer[self.position :]
+        self.position = 0
+        for chunk in self.chunks:
+            text = self.text_decoder.decode(chunk)
+            if text:
+                self.buffer += text
+                return True
+        self.buffer += self.text_decoder.decode(b"", final=True)
+        self.exhausted = True
+        return False
+
+    def peek(self):
+        while True:
+            while (
+                self.position < len(self.buffer)
+                and self.buffer[self.position] in " \t\n\r"
+            ):
+                self.position += 1
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if not self._fill() and self.position >= len(self.buffer):
+                raise ValueError("Unexpected end of JSON stream")
+
+    def next_char(self):
+        char = self.peek()
+        self.position += 1
+        return char
+
+    def expect(self, char):
+        found = self.next_char()
+        if found != char:
+            raise ValueError(f"Expected {char!r} in JSON stream, found {found!r}")
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.position)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number at the end of the buffer may continue in the next chunk
+            if end < len(self.buffer) or not self._fill():
+                self.position = end
+                return value
+
+
+def iter_json_array(chunks, array_key, header=None):
+    """
+    Incrementally parse a JSON object and yield the items of one of its arrays.
+
+    :param chunks: Iterable of bytes, e.g. response.iter_content()
+    :param array_key: Top-level key of the array to stream
+    :param header: Optional dictionary that receives the other top-level members
+    """
+    reader = _JsonStreamReader(chunks)
+    header = {} if header is None else header
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+    while True:
+        key = reader.value()
+        reader.expect(":")
+        if key == array_key:
+            reader.expect("[")
+            if reader.peek() == "]":
+                reader.next_char()
+            else:
+                while True:
+                    yield reader.value()
+                    separator = reader.next_char()
+                    if separator == "]":
+                        break
+                    if separator != ",":
+                        raise ValueError(f"Unexpected {separator!r} in JSON array")
+        else:
+            header[key] = reader.value()
+        separator = reader.next_char()
+        if separator == "}":
+            return
+        if separator != ",":
+            raise ValueError(f"Unexpected {separator!r} in JSON object")
+
+
+def _stream_search_page(
+    jira, jql_query, start_at, page_size, fields, header, validate_query=None, expand=None
+):
+    # Stream one search page; the page's total and other members land in header
+    params = {
+        "jql": jql_query,
+        "startAt": start_at,
+        "maxResults": page_size,
+        # An empty field list would make Jira return every navigable field
+        "fields": ",".join(fields) or "key",
+    }
+    if validate_query:
+        params["validateQuery"] = validate_query
+    if expand:
+        params["expand"] = expand
+    response = jira._session.get(jira._get_url("search"), params=params, stream=True)
+    try:
+        yield from iter_json_array(
+            response.iter_content(SEARCH_CHUNK_SIZE), "issues", header
+        )
+    finally:
+        response.close()
+
+
+def _fetch_search_page(jira, jql_query, start_at, page_size, fields, validate_query, expand):
+    return list(
+        _stream_search_page(
+            jira, jql_query, start_at, page_size, fields, {}, validate_query, expand
+        )
+    )
+
+
+def _search_pages_in_parallel(
+    jira, jql_query, fields, page_size, start_at, total, workers, validate_query, expand
+):
+    # Fetch the pages after the first one concurrently, at most `workers` pages
+    # ahead of the consumer, and yield their issues in order
+    offsets = iter(range(start_at, total, page_size))
+    function = _calling_function()
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+
+        def submit_next():
+            for offset in offsets:
+                context = contextvars.copy_context()
+                context.run(_profiled_function.set, function)
+                pending.append(
+                    executor.submit(
+                        context.run,
+                        _fetch_search_page,
+                        jira,
+                        jql_query,
+                        offset,
+                        page_size,
+                        fields,
+                        validate_query,
+                        expand,
+                    )
+                )
+                return
+
+        try:
+            for _ in range(workers):
+                submit_next()
+            while pending:
+                issues = pending.popleft().result()
+                submit_next()
+                yield from issues
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def search_issue_records(
+    jira,
+    jql_query,
+    fields=ISSUE_RECORD_FIELDS,
+    page_size=SEARCH_PAGE_SIZE,
+    workers=1,
+    validate_query=None,
+):
+    """
+    Run a JQL search and yield an IssueRecord per matching issue.
+
+    Pages through every result with startAt, asking only for ``fields``. Each
+    response is parsed from the byte stream as it arrives, so the first issue
+    is available before the page has finished downloading and only one
+    issue's JSON is held at a time.
+
+    With ``workers`` above 1 the first page tells how many issues match and
+    the remaining pages are then fetched by a thread pool, still yielded in
+    order.
+
+    :param jira: JIRA connection
+    :param jql_query: JQL query string
+    :param fields: Issue fields to request
+    :param page_size: Issues per search request
+    :param workers: Pages fetched concurrently after the first one
+    :param validate_query: Jira validateQuery mode ("strict", "warn" or "none")
+    """
+    for raw in _search_issue_json(
+        jira, jql_query, fields, page_size, validate_query, workers=workers
+    ):
+        yield IssueRecord.from_json(raw)
+
+
+def _search_issue_json(
+    jira,
+    jql_query,
+    fields,
+    page_size=SEARCH_PAGE_SIZE,
+    validate_query=None,
+    expand=None,
+    workers=1,
+):
+    # The pager behind search_issue_records, yielding the raw issues for
+    # callers that need fields IssueRecord does not keep
+    start_at = 0
+    while True:
+        page = {}
+        count = 0
+        for raw in _stream_search_page(
+            jira, jql_query, start_at, page_size, fields, page, validate_query, expand
+        ):
+            count += 1
+            yield raw
+        start_at += count
+        total = page.get("total", 0)
+        if not count or start_at >= total:
+            break
+        if workers > 1:
+            # Step by the page size the server actually used, it may cap maxResults
+            yield from _search_pages_in_parallel(
+                jira, jql_query, fields, count, start_at, total, workers, validate_query, expand
+            )
+            break
+
+
+# Issues per page of the Agile board endpoints
+BOARD_PAGE_SIZE = 50
+
+# Issue fields requested by board_issue_records
+BOARD_ISSUE_FIELDS = ISSUE_RECORD_FIELDS + (RANK_FIELD,)
+
+
+def _stream_board_page(jira, board_id, source, start_at, page_size, fields, header, jql=None):
+    # Stream one page of a board's "backlog" or "issue" listing, in rank order
+    params = {
+        "startAt": start_at,
+        "maxResults": page_size,
+        "fields": ",".join(fields) or "key",
+    }
+    if jql:
+        params["jql"] = jql
+    url = jira._get_url(f"board/{board_id}/{source}", base=jira.AGILE_BASE_URL)
+    response = jira._session.get(url, params=params, stream=True)
+    try:
+        yield from iter_json_array(
+            response.iter_content(SEARCH_CHUNK_SIZE), "issues", header
+        )
+    finally:
+        response.close()
+
+
+def board_issue_records(
+    jira,
+    board_id,
+    backlog=False,
+    fields=BOARD_ISSUE_FIELDS,
+    jql=None,
+    page_size=BOARD_PAGE_SIZE,
+    start_at=0,
+):
+    """
+    Yield an IssueRecord per issue of a board, in the board's rank order.
+
+    Reads the Agile board endpoints page by page, asking only for ``fields``
+    and parsing each page from the byte stream, so a backlog of any size is
+    walked with one issue in memory at a time. Records carry the issue's
+    rank when ``fields`` includes RANK_FIELD.
+
+    :param jira: JIRA connection
+    :param board_id: Board ID
+    :param backlog: Only the backlog (issues in no open sprint) instead of every board issue
+    :param fields: Issue fields to request
+    :param jql: Extra JQL filter applied by the board endpoint
+    :param page_size: Issues per request
+    :param start_at: Rank position to start from
+    """
+    source = "backlog" if backlog else "issue"
+    while True:
+        page = {}
+        count = 0
+        for raw in _stream_board_page(
+            jira, board_id, source, start_at, page_size, fields, page, jql
+        ):
+            count += 1
+            yield IssueRecord.from_json(raw)
+        start_at += count
+        if not count or start_at >= page.get("total", 0):
+            break
+
+
+# Where the CLI keeps the journals of bulk operations
+DEFAULT_JOURNAL_DIR = os.path.join(os.path.expanduser("~"), ".jirasimplelib", "journals")
+
+
+class BulkJournal:
+    """
+    Append-only journal of a bulk operation, one JSON object per line.
+
+    The "planned" entry lists every item the operation will touch and each
+    "completed" entry the items done since. Opened with resume=True, an
+    unfinished journal is read back so the operation can skip the search
+    and every completed item; otherwise the journal starts over.
+    """
+
+    def __init__(self, path, resume=False):
+        self.path = path
+        self.planned = None
+        self.completed = set()
+        if resume and os.path.exists(path):
+            self._load()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(path, "a" if self.planned is not None else "w")
+
+    def _load(self):
+        finished = False
+        with open(self.path) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # The last line may be torn if the process died mid-write
+                    continue
+                event = entry.get("event")
+                if event == "planned":
+                    self.planned = entry["items"]
+                    self.completed = set()
+                    finished = False
+                elif event == "completed":
+                    self.completed.update(entry["items"])
+                elif event == "finished":
+                    finished = True
+        if finished:
+            self.planned = None
+            self.completed = set()
+
+    def _write(self, entry):
+        entry["time"] = round(time.time(), 3)
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+
+    def remaining(self):
+        return [item for item in self.planned if item not in self.completed]
+
+    def plan(self, items):
+        self.planned = list(items)
+        self._write({"event": "planned", "items": self.planned})
+
+    def complete(self, items):
+        items = list(items)
+        self.completed.update(items)
+        self._write({"event": "completed", "items": items})
+
+    def finish(self):
+        self._write({"event": "finished"})
+        self.close()
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+def journal_path(directory, operation, *params):
+    """
+    Path of the journal for one bulk operation and its parameters.
+
+    :param directory: Journal directory
+    :param operation: Operation name, e.g. delete_all_stories_in_project
+    :param params: Parameters that identify the run
+    :return: File path
+    """
+    name = "-".join([operation] + [str(param) for param in params])
+    return os.path.join(directory, re.sub(r"[^A-Za-z0-9_.-]", "_", name) + ".jsonl")
+
+
+def _journaled_items(journal, build_plan):
+    # Items still to process: the unfinished plan of a resumed journal, or a new plan
+    if journal is not None and journal.planned is not None:
+        remaining = journal.remaining()
+        logging.info(
+            f"Resuming from {journal.path}: {len(journal.planned) - len(remaining)} "
+            f"of {len(journal.planned)} items already done."
+        )
+        return remaining
+    items = build_plan()
+    if journal is not None:
+        journal.plan(items)
+    return items
+
+
+def issue_keys_in_range(project_key, start_issue_key, end_issue_key):
+    """
+    Build the keys PROJ-start .. PROJ-end, bounds included.
+
+    :param project_key: Project key
+    :param start_issue_key: First key, e.g. PROJ-10
+    :param end_issue_key: Last key, e.g. PROJ-20
+    :return: List of issue keys
+    """
+    start_issue_number = int(start_issue_key.split("-")[1])
+    end_issue_number = int(end_issue_key.split("-")[1])
+    return [
+        f"{project_key}-{number}"
+        for number in range(start_issue_number, end_issue_number + 1)
+    ]
+
+
+def resolve_issue_keys(jira, issue_keys, fields=(), chunk_size=SEARCH_PAGE_SIZE):
+    """
+    Yield an IssueRecord for every key in ``issue_keys`` that exists.
+
+    Keys are looked up with one ``key in (...)`` search per chunk instead of
+    one request per key. Deleted keys are skipped, and a key of an issue that
+    was moved to another project resolves to the issue's current key.
+
+    :param jira: JIRA connection
+    :param issue_keys: Iterable of issue keys
+    :param fields: Issue fields to return with each record
+    :param chunk_size: Keys per search, at most the search page size
+    """
+    keys = list(dict.fromkeys(issue_keys))
+    for i in range(0, len(keys), chunk_size):
+        chunk = keys[i : i + chunk_size]
+        jql_query = f"key in ({', '.join(chunk)}) ORDER BY key ASC"
+        # "warn" makes Jira skip unknown keys instead of rejecting the query
+        yield from search_issue_records(
+            jira, jql_query, fields, page_size=chunk_size, validate_query="warn"
+        )
+
+
+class RunPlan:
+    """
+    Work shared by the commands of one CLI invocation.
+
+    Project-wide searches requested by more than one command are merged into
+    a single scan whose records every consumer filters locally, and issues
+    read with _get_issue are kept in an identity map so each key is fetched
+    at most once. Any write request sent while the plan is active clears
+    both, so a command never sees data from before an earlier write.
+    """
+
+    def __init__(self):
+        # project key -> list of (issue types or None for all, fields)
+        self.consumers = {}
+        self.scans = {}
+        self.issues = {}
+
+    def add_project_scan(self, project_key, fields, issue_types=None):
+        """
+        Register a command that reads issues of a project.
+
+        :param project_key: Project key
+        :param fields: Issue fields the command needs
+        :param issue_types: Issue type names it reads, None for every type
+        """
+        self.consumers.setdefault(project_key, []).append((issue_types, tuple(fields)))
+
+    def _scan_shape(self, project_key):
+        # Union of the fields and issue types (None for all) of the consumers
+        consumers = self.consumers[project_key]
+        fields = ["issuetype"]
+        for _, consumer_fields in consumers:
+            fields.extend(f for f in consumer_fields if f not in fields)
+        if not all(issue_types for issue_types, _ in consumers):
+            return fields, None
+        issue_types = []
+        for consumer_types, _ in consumers:
+            issue_types.extend(t for t in consumer_types if t not in issue_types)
+        return fields, issue_types
+
+    def covers(self, project_key, fields, issue_types=None):
+        """
+        Whether a search can be answered from the shared scan of a project.
+
+        Only projects read by more than one command are scanned, and the scan
+        must include every field and issue type the search asks for.
+        """
+        if len(self.consumers.get(project_key, ())) < 2:
+            return False
+        scan_fields, scan_types = self._scan_shape(project_key)
+        if not set(fields) <= set(scan_fields):
+            return False
+        return scan_types is None or (
+            issue_types is not None and set(issue_types) <= set(scan_types)
+        )
+
+    def project_records(self, jira, project_key):
+        # One scan per project with the union of the fields and issue types
+        if project_key not in self.scans:
+            fields, issue_types = self._scan_shape(project_key)
+            jql_query = f'project = "{project_key}"'
+            if issue_types:
+                jql_query += f" AND issuetype in ({', '.join(issue_types)})"
+            self.scans[project_key] = list(
+                search_issue_records(
+                    jira, jql_query, fields, workers=SEARCH_WORKERS
+                )
+            )
+        return self.scans[project_key]
+
+    def issue(self, jira, issue_key, fields=None, expand=None):
+        # A detail read (fields/expand) and a plain read are different entries
+        entry = (issue_key, fields, expand)
+        if entry not in self.issues:
+            if fields is None and expand is None:
+                self.issues[entry] = jira.issue(issue_key)
+            else:
+                self.issues[entry] = jira.issue(issue_key, fields=fields, expand=expand)
+        return self.issues[entry]
+
+    def clear(self):
+        self.scans.clear()
+        self.issues.clear()
+
+    @contextlib.contextmanager
+    def activate(self, jira):
+        """
+        Make this the active plan and watch the session for writes.
+        """
+        session = jira._session
+        send = session.send
+        plan = self
+
+        def watched_send(request, **kwargs):
+            if request.method.upper() != "GET" and not urlparse(
+                request.url
+            ).path.endswith("/search"):
+                plan.clear()
+            return send(request, **kwargs)
+
+        session.send = watched_send
+        token = _active_plan.set(self)
+        try:
+            yield self
+        finally:
+            _active_plan.reset(token)
+            session.send = send
+            self.clear()
+
+
+def _get_issue(jira, issue_key, fields=None, expand=None):
+    # jira.issue() through the identity map of the active RunPlan, if any
+    plan = _active_plan.get()
+    if plan is not None:
+        return plan.issue(jira, issue_key, fields, expand)
+    if fields is None and expand is None:
+        return jira.issue(issue_key)
+    return jira.issue(issue_key, fields=fields, expand=expand)
+
+
+def _project_issue_records(
+    jira, project_key, jql_query, fields, issue_types=None, workers=1
+):
+    # Records from the active issue store or plan's shared project scan, or a search of our own
+    local = _local_records(jql_query)
+    if local is not None:
+        return local
+    plan = _active_plan.get()
+    if plan is not None and plan.covers(project_key, fields, issue_types):
+        return (
+            record
+            for record in plan.project_records(jira, project_key)
+            if issue_types is None or record.issue_type in issue_types
+        )
+    return search_issue_records(jira, jql_query, fields, workers=workers)
+
+
+class IssueStore:
+    """
+    In-memory set of IssueRecords keyed by issue key.
+
+    Listeners registered with subscribe() are called as
+    ``listener(event, old, new)`` for every change, where event is
+    "upsert" or "remove" and old/new are the records before and after.
+
+    With ``max_age`` set, a project or sprint synced longer ago than that
+    many seconds no longer counts as held; leave it None for stores kept
+    current by a WebhookReceiver.
+    """
+
+    def __init__(self, max_age=None):
+        self.records = {}
+        self.listeners = []
+        self.lock = threading.RLock()
+        self.max_age = max_age
+        # ("project", key) and ("sprint", id) scopes held completely, with the time they were synced
+        self.scopes = {}
+        self._aggregates = None
+        self._index = None
+
+    def covers(self, *scopes):
+        now = time.time()
+        scopes = [_store_scope(scope) for scope in scopes]
+        return any(
+            scope in self.scopes
+            and (self.max_age is None or now - self.scopes[scope] <= self.max_age)
+            for scope in scopes
+        )
+
+    def subscribe(self, listener):
+        self.listeners.append(listener)
+        return listener
+
+    def _notify(self, event, old, new):
+        for listener in self.listeners:
+            listener(event, old, new)
+
+    def upsert(self, record):
+        """
+        Add or replace a record.
+
+        :return: True when the store changed
+        """
+        with self.lock:
+            old = self.records.get(record.key)
+            if old == record:
+                return False
+            self.records[record.key] = record
+            self._notify("upsert", old, record)
+            return True
+
+    def remove(self, issue_key):
+        with self.lock:
+            old = self.records.pop(issue_key, None)
+            if old is None:
+                return False
+            self._notify("remove", old, None)
+            return True
+
+    def get(self, issue_key):
+        return self.records.get(issue_key)
+
+    def aggregates(self):
+        """
+        IssueAggregates of this store, built on first use and kept current
+        from then on.
+        """
+        with self.lock:
+            if self._aggregates is None:
+                self._aggregates = IssueAggregates(self)
+            return self._aggregates
+
+    def index(self):
+        """
+        IssueIndex of this store, built on first use and kept current from
+        then on.
+        """
+        with self.lock:
+            if self._index is None:
+                self._index = IssueIndex(self)
+            return self._index
+
+    def __contains__(self, issue_key):
+        return issue_key in self.records
+
+    def __iter__(self):
+        return iter(list(self.records.values()))
+
+    def __len__(self):
+        return len(self.records)
+
+
+# Values an issue counts under in each dimension of IssueAggregates
+AGGREGATE_DIMENSIONS = {
+    "status": lambda record: (record.status,),
+    "assignee": lambda record: (record.assignee,),
+    "epic": lambda record: (record.epic_link,),
+    "sprint": lambda record: record.sprint_ids or (),
+}
+
+
+def _store_scope(scope):
+    # Project keys upper-case, as Jira returns them, sprint ids as ints
+    kind, value = scope
+    value = str(value)
+    if kind == "project":
+        return kind, value.upper()
+    return kind, int(value) if value.isdigit() else value
+
+
+class IssueAggregates:
+    """
+    Issue counts per status, assignee, epic and sprint for every project
+    and sprint of an IssueStore, updated from the store's change events
+    instead of being recounted.
+
+    ``counts[scope][dimension][value]`` is the number of issues in the scope
+    (("project", key) or ("sprint", id)) with that value. None counts the
+    issues without one, e.g. unassigned issues.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.counts = {}
+        with store.lock:
+            for record in store:
+                self._add(record, 1)
+            store.subscribe(self._changed)
+
+    @staticmethod
+    def _scopes(record):
+        return [("project", record.project_key)] + [
+            ("sprint", sprint_id) for sprint_id in record.sprint_ids or ()
+        ]
+
+    def _add(self, record, delta):
+        for scope in self._scopes(record):
+            tables = self.counts.setdefault(scope, {})
+            for dimension, values in AGGREGATE_DIMENSIONS.items():
+                table = tables.setdefault(dimension, {})
+                for value in values(record):
+                    count = table.get(value, 0) + delta
+                    if count:
+                        table[value] = count
+                    else:
+                        del table[value]
+
+    def _changed(self, event, old, new):
+        if old is not None:
+            self._add(old, -1)
+        if new is not None:
+            self._add(new, 1)
+
+    def count(self, scope, dimension):
+        """
+        :param scope: ("project", key) or ("sprint", id)
+        :param dimension: Key of AGGREGATE_DIMENSIONS
+        :return: Dictionary of value to issue count
+        """
+        with self.store.lock:
+            return dict(self.counts.get(scope, {}).get(dimension, {}))
+
+
+class IssueIndex:
+    """
+    Keys of an IssueStore's issues by project, issue type, status, assignee,
+    sprint, epic and key, updated from the store's change events. Values are
+    kept lower-case, as JQL compares them without case.
+    """
+
+    FIELDS = {
+        "project": lambda record: (record.project_key,),
+        "issuetype": lambda record: (record.issue_type,),
+        "status": lambda record: (record.status,),
+        "assignee": lambda record: (record.assignee,) + tuple(record.assignee_ids or ()),
+        "sprint": lambda record: record.sprint_ids or (),
+        "epic": lambda record: (record.epic_link,),
+        "key": lambda record: (record.key,),
+    }
+
+    def __init__(self, store):
+        self.store = store
+        self.keys = {field: {} for field in self.FIELDS}
+        with store.lock:
+            for record in store:
+                self._add(record, True)
+            store.subscribe(self._changed)
+
+    def _add(self, record, add):
+        for field, values in self.FIELDS.items():
+            table = self.keys[field]
+            for value in {str(value).lower() for value in values(record) if value is not None}:
+                if add:
+                    table.setdefault(value, set()).add(record.key)
+                else:
+                    table[value].discard(record.key)
+                    if not table[value]:
+                        del table[value]
+
+    def _changed(self, event, old, new):
+        if old is not None:
+            self._add(old, False)
+        if new is not None:
+            self._add(new, True)
+
+    def lookup(self, field, values):
+        table = self.keys[field]
+        return set().union(*(table.get(value, ()) for value in values))
+
+    def present(self, field):
+        # Keys of the issues with any value in the field
+        return set().union(*self.keys[field].values())
+
+
+class UnsupportedJql(ValueError):
+    """
+    Raised by parse_jql for JQL outside the subset the local evaluator runs.
+    """
+
+
+# Fields the local evaluator knows, by lower-case JQL name, and the
+# IssueIndex field (or "summary" for text matches) each maps to
+JQL_LOCAL_FIELDS = {
+    "project": "project",
+    "issuetype": "issuetype",
+    "type": "issuetype",
+    "status": "status",
+    "assignee": "assignee",
+    "sprint": "sprint",
+    "epic link": "epic",
+    "cf[10014]": "epic",
+    "key": "key",
+    "issuekey": "key",
+    "summary": "summary",
+}
+
+
+def _issue_number(record):
+    return (record.project_key or "", int(record.key.rsplit("-", 1)[1]))
+
+
+# ORDER BY fields the local evaluator can sort on
+JQL_SORT_KEYS = {
+    "key": _issue_number,
+    "issuekey": _issue_number,
+    "issuetype": lambda record: record.issue_type,
+    "type": lambda record: record.issue_type,
+    "status": lambda record: record.status,
+    "assignee": lambda record: record.assignee,
+    "summary": lambda record: record.summary,
+    "updated": lambda record: record.updated,
+    "duedate": lambda record: record.due_date,
+}
+
+_JQL_TOKEN = re.compile(
+    r"""\s*(?:"((?:[^"\\]|\\.)*)"|'((?:[^'\\]|\\.)*)'|(!=|!~|~|=|\(|\)|,|>=|<=|>|<)|([^\s=!~(),<>"']+))"""
+)
+
+
+class JqlQuery:
+    """
+    A parsed query of the JQL subset the library evaluates locally: =, !=,
+    in, not in, is (not) empty and ~ (summary words) clauses combined with
+    AND, OR, NOT and parentheses, plus ORDER BY.
+
+    ``condition`` is a tree of ("and", [...]), ("or", [...]), ("not", node)
+    and ("clause", field, operator, values) tuples, None for no condition.
+    """
+
+    def __init__(self, condition, order_by):
+        self.condition = condition
+        self.order_by = order_by
+
+    def scopes(self):
+        """
+        Yield, for every project or sprint clause that confines all matches,
+        the store scopes holding everything the query can match.
+        """
+        if self.condition is None:
+            return
+        terms = self.condition[1] if self.condition[0] == "and" else [self.condition]
+        for term in terms:
+            if term[0] == "clause" and term[1] in ("project", "sprint") and term[2] in ("=", "in"):
+                yield [_store_scope((term[1], value)) for value in term[3]]
+
+    def run(self, store):
+        """
+        :param store: IssueStore
+        :return: List of matching IssueRecords, in key order unless the query sorts
+        """
+        with store.lock:
+            index = store.index()
+            if self.condition is None:
+                keys = set(store.records)
+            else:
+                keys = self._keys(self.condition, store, index)
+            records = [store.records[key] for key in keys]
+        records.sort(key=_issue_number)
+        for field, descending in reversed(self.order_by):
+            value = JQL_SORT_KEYS[field]
+            # Empty values sort as the greatest, so last ascending and first descending as in Jira
+            records.sort(
+                key=lambda record: (value(record) is None, value(record) or ""),
+                reverse=descending,
+            )
+        return records
+
+    def _keys(self, node, store, index):
+        kind = node[0]
+        if kind == "and":
+            keys = self._keys(node[1][0], store, index)
+            for term in node[1][1:]:
+                keys &= self._keys(term, store, index)
+            return keys
+        if kind == "or":
+            return set().union(*(self._keys(term, store, index) for term in node[1]))
+        if kind == "not":
+            return set(store.records) - self._keys(node[1], store, index)
+        _, field, operator, values = node
+        if field == "summary":
+            present = {key for key, record in store.records.items() if record.summary}
+            if operator == "is":
+                return set(store.records) - present
+            if operator == "is not":
+                return present
+            # Whole words, as Jira's text search matches them; word* matches a prefix
+            terms = re.findall(r"\w+\*?", " ".join(values).lower())
+            keys = set()
+            for key in present:
+                words = re.findall(r"\w+", store.records[key].summary.lower())
+                if all(
+                    any(word.startswith(term[:-1]) for word in words)
+                    if term.endswith("*")
+                    else term in words
+                    for term in terms
+                ):
+                    keys.add(key)
+            if operator == "!~":
+                return present - keys
+            return keys
+        if operator in ("=", "in"):
+            return index.lookup(field, values)
+        if operator in ("!=", "not in"):
+            # Like Jira, != never matches issues without a value
+            return index.present(field) - index.lookup(field, values)
+        if operator == "is":
+            return set(store.records) - index.present(field)
+        return index.present(field)
+
+
+class _JqlParser:
+    def __init__(self, jql_query):
+        self.tokens = []
+        position = 0
+        jql_query = jql_query.rstrip()
+        while position < len(jql_query):
+            match = _JQL_TOKEN.match(jql_query, position)
+            if not match:
+                raise UnsupportedJql(f"cannot read {jql_query[position:]!r}")
+            double, single, operator, word = match.groups()
+            if operator is not None:
+                self.tokens.append(("op", operator))
+            elif word is not None:
+                self.tokens.append(("word", word))
+            else:
+                text = double if double is not None else single
+                self.tokens.append(("string", re.sub(r"\\(.)", r"\1", text)))
+            position = match.end()
+        self.position = 0
+
+    def peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else (None, None)
+
+    def accept(self, kind, text):
+        token_kind, token_text = self.peek()
+        if token_kind == kind and token_text.lower() == text:
+            self.position += 1
+            return True
+        return False
+
+    def expect(self, kind, text):
+        if not self.accept(kind, text):
+            raise UnsupportedJql(f"expected {text!r} at {self.peek()[1]!r}")
+
+    def parse(self):
+        condition = None
+        if self.peek() != (None, None) and not self.peek()[1].lower() == "order":
+            condition = self.parse_or()
+        order_by = []
+        if self.accept("word", "order"):
+            self.expect("word", "by")
+            while True:
+                kind, field = self.peek()
+                if kind is None or field.lower() not in JQL_SORT_KEYS:
+                    raise UnsupportedJql(f"cannot sort by {field!r}")
+                self.position += 1
+                descending = self.accept("word", "desc")
+                if not descending:
+                    self.accept("word", "asc")
+                order_by.append((field.lower(), descending))
+                if not self.accept("op", ","):
+                    break
+        if self.peek() != (None, None):
+            raise UnsupportedJql(f"unexpected {self.peek()[1]!r}")
+        return JqlQuery(condition, order_by)
+
+    def parse_or(self):
+        terms = [self.parse_and()]
+        while self.accept("word", "or"):
+            terms.append(self.parse_and())
+        return ("or", terms) if len(terms) > 1 else terms[0]
+
+    def parse_and(self):
+        terms = [self.parse_unary()]
+        while self.accept("word", "and"):
+            terms.append(self.parse_unary())
+        return ("and", terms) if len(terms) > 1 else terms[0]
+
+    def parse_unary(self):
+        if self.accept("word", "not"):
+            return ("not", self.parse_unary())
+        if self.accept("op", "("):
+            condition = self.parse_or()
+            self.expect("op", ")")
+            return condition
+        return self.parse_clause()
+
+    def parse_clause(self):
+        kind, name = self.peek()
+        field = JQL_LOCAL_FIELDS.get((name or "").lower())
+        if kind not in ("word", "string") or field is None:
+            raise UnsupportedJql(f"field {name!r} is not evaluated locally")
+        self.position += 1
+        if self.accept("op", "="):
+            operator = "="
+        elif self.accept("op", "!="):
+            operator = "!="
+        elif self.accept("op", "~"):
+            operator = "~"
+        elif self.accept("op", "!~"):
+            operator = "!~"
+        elif self.accept("word", "in"):
+            operator = "in"
+        elif self.accept("word", "is"):
+            operator = "is not" if self.accept("word", "not") else "is"
+            if not (self.accept("word", "empty") or self.accept("word", "null")):
+                raise UnsupportedJql(f"expected EMPTY after {operator!r}")
+            return ("clause", field, operator, ())
+        elif self.accept("word", "not"):
+            self.expect("word", "in")
+            operator = "not in"
+        else:
+            raise UnsupportedJql(f"operator {self.peek()[1]!r} is not evaluated locally")
+        if (field == "summary") != (operator in ("~", "!~")):
+            raise UnsupportedJql(f"{operator} on {name} is not evaluated locally")
+        if operator in ("in", "not in"):
+            self.expect("op", "(")
+            values = [self.parse_value()]
+            while self.accept("op", ","):
+                values.append(self.parse_value())
+            self.expect("op", ")")
+        else:
+            values = [self.parse_value()]
+            if values == [None]:
+                return ("clause", field, "is" if operator == "=" else "is not", ())
+        if None in values:
+            raise UnsupportedJql("EMPTY inside a list is not evaluated locally")
+        return ("clause", field, operator, tuple(values))
+
+    def parse_value(self):
+        kind, text = self.peek()
+        if kind not in ("word", "string"):
+            raise UnsupportedJql(f"expected a value at {text!r}")
+        self.position += 1
+        if kind == "word":
+            if self.peek() == ("op", "("):
+                raise UnsupportedJql(f"function {text}() is not evaluated locally")
+            if text.lower() in ("empty", "null"):
+                return None
+        return text.lower()
+
+
+@functools.lru_cache(maxsize=256)
+def parse_jql(jql_query):
+    """
+    Parse a query of the JQL subset described by JqlQuery.
+
+    :raises UnsupportedJql: For any other JQL, which has to go to Jira
+    :return: JqlQuery
+    """
+    return _JqlParser(jql_query).parse()
+
+
+def _split_order_by(jql_query):
+    # Split "condition ORDER BY ..." so the condition can be combined with others
+    match = re.search(r"\s+ORDER\s+BY\s+", jql_query, re.IGNORECASE)
+    if not match:
+        return jql_query, ""
+    return jql_query[: match.start()], " " + jql_query[match.start() :].strip()
+
+
+def sync_issue_store(jira, store, project_keys=(), sprint_ids=()):
+    """
+    Load every issue of the given projects and sprints into a store and
+    mark them as held completely, so reads through use_issue_store can be
+    answered locally. Keep the store current with a WebhookReceiver or an
+    IssueWatcher afterwards.
+
+    :param jira: JIRA connection
+    :param store: IssueStore
+    :param project_keys: Projects to load
+    :param sprint_ids: Sprints to load
+    :return: The store
+    """
+    queries = [(("project", key), f'project = "{key}"') for key in project_keys]
+    queries += [(("sprint", int(sprint_id)), f"sprint = {sprint_id}") for sprint_id in sprint_ids]
+    for scope, jql_query in queries:
+        started = time.time()
+        for record in search_issue_records(jira, jql_query, workers=SEARCH_WORKERS):
+            store.upsert(record)
+        store.scopes[_store_scope(scope)] = started
+    return store
+
+
+def use_issue_store(store):
+    """
+    Answer project and sprint listings, and other queries parse_jql can
+    evaluate, from ``store`` where it holds the whole project or sprint a
+    query is confined to (None to always ask Jira).
+
+    :return: The previously used store
+    """
+    global _active_store
+    previous = _active_store
+    _active_store = store
+    return previous
+
+
+def _local_records(jql_query):
+    # Records of the active store matching a query, None if the store does not
+    # hold everything the query can match or the query is beyond parse_jql
+    store = _active_store
+    if store is None:
+        return None
+    try:
+        query = parse_jql(jql_query)
+    except UnsupportedJql as e:
+        logging.debug(f"Asking Jira for {jql_query}: {e}")
+        return None
+    if not any(
+        all(store.covers(scope) for scope in scopes) for scopes in query.scopes()
+    ):
+        return None
+    return query.run(store)
+
+
+def _issue_records(jira, jql_query, fields):
+    # Records from the active issue store where it can answer the query, else a search
+    local = _local_records(jql_query)
+    if local is not None:
+        return local
+    return search_issue_records(jira, jql_query, fields)
+
+
+def _breakdown(jira, scope, dimension, jql_query, fields):
+    # Counts from the active store's aggregates when it holds the scope, else from a search
+    try:
+        store = _active_store
+        scope = _store_scope(scope)
+        if store is not None and store.covers(scope):
+            return store.aggregates().count(scope, dimension)
+        counts = {}
+        for record in search_issue_records(jira, jql_query, fields, workers=SEARCH_WORKERS):
+            for value in AGGREGATE_DIMENSIONS[dimension](record):
+                counts[value] = counts.get(value, 0) + 1
+        return counts
+    except Exception as e:
+        logging.error(f"Error counting issues per {dimension} for {jql_query}: {e}")
+        return None
+
+
+# Count the issues of a project per status
+def status_breakdown(jira, project_key):
+    """
+    :return: Dictionary of status name to issue count
+    """
+    return _breakdown(
+        jira, ("project", project_key), "status", f'project="{project_key}"', ("status",)
+    )
+
+
+# Workload columns per status category; statuses without a category count by name
+WORKLOAD_CATEGORIES = {"new": "open", "indeterminate": "in_progress", "done": "done"}
+OPEN_STATUSES = ("To Do", "Open", "Backlog", "Selected for Development")
+
+# Issue fields read by workload_report
+WORKLOAD_FIELDS = ("assignee", "status", STORY_POINTS_FIELD)
+
+
+def _workload_column(record):
+    if record.status_category in WORKLOAD_CATEGORIES:
+        return WORKLOAD_CATEGORIES[record.status_category]
+    if record.status in DONE_STATUSES:
+        return "done"
+    return "open" if record.status in OPEN_STATUSES else "in_progress"
+
+
+def workload_report(jira, project_key=None, sprint_id=None):
+    """
+    Open, in-progress and done issue counts and story points per assignee of
+    a project or a sprint, from one field-projected scan (or the active
+    issue store or run plan when they hold the scope).
+
+    :param jira: JIRA connection
+    :param project_key: Project key
+    :param sprint_id: Sprint ID, instead of a project
+    :return: Dictionary of assignee display name (None for unassigned) to
+        {"open", "in_progress", "done", "points", "done_points"}, busiest
+        assignee first, or None on error
+    """
+    try:
+        if sprint_id is not None:
+            records = _issue_records(jira, f"sprint = {sprint_id}", WORKLOAD_FIELDS)
+        else:
+            records = _project_issue_records(
+                jira,
+                project_key,
+                f'project="{project_key}"',
+                WORKLOAD_FIELDS,
+                workers=SEARCH_WORKERS,
+            )
+        report = {}
+        for record in records:
+            row = report.get(record.assignee)
+            if row is None:
+                row = report[record.assignee] = {
+                    "open": 0,
+                    "in_progress": 0,
+                    "done": 0,
+                    "points": 0,
+                    "done_points": 0,
+                }
+            column = _workload_column(record)
+            row[column] += 1
+            points = record.story_points or 0
+            row["points"] += points
+            if column == "done":
+                row["done_points"] += points
+        return dict(
+            sorted(
+                report.items(),
+                key=lambda item: (-(item[1]["open"] + item[1]["in_progress"]), item[0] is None, item[0] or ""),
+            )
+        )
+    except Exception as e:
+        logging.error(f"Error computing workload for {sprint_id or project_key}: {e}")
+        return None
+
+
+# Count the issues of a project per assignee
+def workload(jira, project_key):
+    """
+    :return: Dictionary of assignee display name (None for unassigned) to issue count
+    """
+    report = workload_report(jira, project_key)
+    if report is None:
+        return None
+    return {
+        assignee: row["open"] + row["in_progress"] + row["done"]
+        for assignee, row in report.items()
+    }
+
+
+# Count the issues of a project per epic
+def epic_breakdown(jira, project_key):
+    """
+    :return: Dictionary of epic key (None for issues outside epics) to issue count
+    """
+    return _breakdown(
+        jira, ("project", project_key), "epic", f'project="{project_key}"', (EPIC_LINK_FIELD,)
+    )
+
+
+# Count the issues of a sprint per status
+def sprint_breakdown(jira, sprint_id):
+    """
+    :return: Dictionary of status name to issue count
+    """
+    scope = ("sprint", int(sprint_id) if str(sprint_id).isdigit() else sprint_id)
+    return _breakdown(jira, scope, "status", f"sprint = {sprint_id}", ("status",))
+
+
+# Where the CLI keeps its full-text index
+DEFAULT_SEARCH_INDEX = os.path.join(os.path.expanduser("~"), ".jirasimplelib", "search.db")
+
+# Fields read from Jira to build the full-text index
+SEARCH_INDEX_FIELDS = ("summary", "description", "comment")
+
+# Hits returned by IssueSearchIndex.search
+SEARCH_RESULTS_LIMIT = 20
+
+
+def _plain_text(value):
+    # Text of a plain or Atlassian Document Format (dict) field value
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, dict):
+        return value.get("text") or " ".join(
+            _plain_text(node) for node in value.get("content", ())
+        )
+    return " ".join(_plain_text(node) for node in value)
+
+
+def _fts_query(terms):
+    # Quote every word so Jira-style text such as PROJ-12 is not read as
+    # FTS5 syntax; a trailing * keeps working as a prefix search
+    words = []
+    for word in terms.split():
+        prefix = word.endswith("*")
+        word = word.rstrip("*")
+        if word:
+            words.append('"' + word.replace('"', '""') + '"' + ("*" if prefix else ""))
+    return " ".join(words)
+
+
+class IssueSearchIndex:
+    """
+    Local full-text index (SQLite FTS5) over issue summaries, descriptions
+    and comments.
+
+    Fill it with sync_search_index and keep it current with later syncs or
+    a WebhookReceiver; search() then ranks matches with bm25, summary
+    matches first, without contacting Jira.
+    """
+
+    SCHEMA = """
+        CREATE VIRTUAL TABLE IF NOT EXISTS issue_text USING fts5(
+            key UNINDEXED, project UNINDEXED, summary, description, comments,
+            tokenize = 'porter unicode61'
+        );
+        CREATE TABLE IF NOT EXISTS sync_state (project TEXT PRIMARY KEY, synced REAL);
+    """
+
+    def __init__(self, path=DEFAULT_SEARCH_INDEX):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.lock = threading.Lock()
+        # Webhook threads write through the same connection, serialized by the lock
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        with self.lock, self.db:
+            self.db.executescript(self.SCHEMA)
+
+    def add(self, *issues):
+        """
+        Add or replace issues.
+
+        :param issues: Issue JSON as returned by search or sent by webhooks
+        """
+        rows = []
+        for issue in issues:
+            fields = issue.get("fields") or {}
+            comments = (fields.get("comment") or {}).get("comments", ())
+            rows.append(
+                (
+                    int(issue["id"]),
+                    issue["key"],
+                    issue["key"].rsplit("-", 1)[0],
+                    fields.get("summary") or "",
+                    _plain_text(fields.get("description")),
+                    " ".join(_plain_text(comment.get("body")) for comment in comments),
+                )
+            )
+        with self.lock, self.db:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO issue_text"
+                " (rowid, key, project, summary, description, comments)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def remove(self, issue_key):
+        with self.lock, self.db:
+            return self.db.execute(
+                "DELETE FROM issue_text WHERE key = ?", (issue_key,)
+            ).rowcount > 0
+
+    def retain(self, project_key, issue_ids):
+        # Drop the project's issues that are not in issue_ids (deleted in Jira)
+        with self.lock, self.db:
+            self.db.execute("CREATE TEMP TABLE IF NOT EXISTS seen (id INTEGER PRIMARY KEY)")
+            self.db.execute("DELETE FROM seen")
+            self.db.executemany("INSERT INTO seen VALUES (?)", ((int(i),) for i in issue_ids))
+            return self.db.execute(
+                "DELETE FROM issue_text WHERE project = ?"
+                " AND rowid NOT IN (SELECT id FROM seen)",
+                (project_key,),
+            ).rowcount
+
+    def search(self, terms, project_key=None, limit=SEARCH_RESULTS_LIMIT):
+        """
+        :param terms: Words to look for; all must match, a trailing * matches a prefix
+        :param project_key: Only search this project
+        :param limit: Most hits to return
+        :return: List of dictionaries with key, summary, snippet and rank, best first
+        """
+        query = _fts_query(terms)
+        if not query:
+            return []
+        sql = (
+            "SELECT key, summary, snippet(issue_text, -1, '[', ']', '...', 12),"
+            " bm25(issue_text, 0, 0, 10.0, 3.0, 1.0) AS rank"
+            " FROM issue_text WHERE issue_text MATCH ?"
+        )
+        params = [query]
+        if project_key:
+            sql += " AND project = ?"
+            params.append(project_key)
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(limit)
+        with self.lock:
+            rows = self.db.execute(sql, params).fetchall()
+        return [
+            {"key": key, "summary": summary, "snippet": snippet, "rank": rank}
+            for key, summary, snippet, rank in rows
+        ]
+
+    def synced_at(self, project_key):
+        with self.lock:
+            row = self.db.execute(
+                "SELECT synced FROM sync_state WHERE project = ?", (project_key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def mark_synced(self, project_key, synced):
+        with self.lock, self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO sync_state VALUES (?, ?)", (project_key, synced)
+            )
+
+    def __len__(self):
+        with self.lock:
+            return self.db.execute("SELECT count(*) FROM issue_text").fetchone()[0]
 
+    def close(self):
+        self.db.close()
 
-def create_jira_project(jira, project_name, project_key):
-    if not jira:
-        logging.error("Failed to create project: Jira connection not established.")
-        return False
 
-    # Attempt to create the project
-    try:
-        project = jira.create_project(project_key, project_name)
-        logging.info(
-            f"Project '{project_name}' created successfully with key '{project_key}'."
-        )
-        return project
-    except JIRAError as e:
-        logging.error(f"Error creating project: {e}")
-        return None
+def sync_search_index(jira, index, project_keys, full=False):
+    """
+    Bring the full-text index up to date for some projects.
 
+    The first sync of a project (or any with ``full``) reads all its issues
+    and drops the ones deleted since; later syncs read only the issues
+    updated since the previous one.
 
-def update_jira_project(jira, project_key, new_name=None, new_key=None):
-    if not jira:
-        logging.error("Failed to update project: Jira connection not established.")
-        return False
+    :param jira: JIRA connection
+    :param index: IssueSearchIndex
+    :param project_keys: Projects to sync
+    :param full: Re-read every issue
+    :return: Number of issues written to the index
+    """
+    written = 0
+    for project_key in project_keys:
+        started = time.time()
+        synced = index.synced_at(project_key)
+        jql_query = f'project = "{project_key}"'
+        if synced is not None and not full:
+            # JQL dates have minute precision; overlap by a minute
+            jql_query += f" AND updated >= -{int((started - synced) // 60) + 1}m"
+        seen = []
+        page = []
+        for issue in _search_issue_json(jira, jql_query, SEARCH_INDEX_FIELDS):
+            seen.append(issue["id"])
+            page.append(issue)
+            if len(page) == SEARCH_PAGE_SIZE:
+                index.add(*page)
+                page = []
+        index.add(*page)
+        if synced is None or full:
+            index.retain(project_key, seen)
+        index.mark_synced(project_key, started)
+        written += len(seen)
+    return written
+
+
+# Watch polls between two full re-reads of the watched query
+WATCH_FULL_REFRESH_TICKS = 20
+
+
+class IssueWatcher:
+    """
+    Keep an IssueStore in sync with a JQL query by incremental polling.
 
-    if not new_name and not new_key:
-        logging.error("Failed to update project: No new name or key provided.")
-        return False
+    The first tick reads the whole query. Later ticks only ask for issues
+    whose ``updated`` timestamp moved since the previous poll, using a
+    relative date so the result does not depend on the Jira user's time
+    zone. Every ``full_refresh_every`` ticks the whole query is read again
+    to drop issues that were deleted or no longer match.
+    """
 
-    try:
-        project = jira.project(project_key)
-        if new_name:
-            project.update(name=new_name)
-            logging.info(f"Project name updated to '{new_name}' successfully.")
-        if new_key:
-            project.update(key=new_key)
-            logging.info(f"Project key updated to '{new_key}' successfully.")
-        return True
-    except JIRAError as e:
-        logging.error(f"Error updating project: {e}")
-        return False
-    except Exception as e:
-        logging.error(f"Error updating project: {e}")
-        return False
+    def __init__(
+        self,
+        jira,
+        jql_query,
+        fields=ISSUE_RECORD_FIELDS,
+        store=None,
+        full_refresh_every=WATCH_FULL_REFRESH_TICKS,
+    ):
+        self.jira = jira
+        self.jql_query = jql_query
+        self.fields = tuple(fields) + (("updated",) if "updated" not in fields else ())
+        self.store = IssueStore() if store is None else store
+        self.full_refresh_every = full_refresh_every
+        self.ticks = 0
+        self.last_poll = None
+
+    def refresh(self):
+        """
+        Read the whole query and drop the issues that no longer match.
+
+        :return: Set of keys that changed
+        """
+        started = time.time()
+        seen = set()
+        changed = set()
+        for record in search_issue_records(
+            self.jira, self.jql_query, self.fields, workers=SEARCH_WORKERS
+        ):
+            seen.add(record.key)
+            if self.store.upsert(record):
+                changed.add(record.key)
+        for issue_key in [key for key in self.store.records if key not in seen]:
+            self.store.remove(issue_key)
+            changed.add(issue_key)
+        self.last_poll = started
+        return changed
+
+    def poll(self):
+        """
+        Read only the issues updated since the previous poll.
+
+        :return: Set of keys that changed
+        """
+        started = time.time()
+        # JQL dates have minute precision; overlap by a minute and let the
+        # store ignore records that did not change
+        minutes = int((started - self.last_poll) // 60) + 1
+        condition, order_by = _split_order_by(self.jql_query)
+        jql_query = f"({condition}) AND updated >= -{minutes}m{order_by}"
+        changed = set()
+        for record in search_issue_records(self.jira, jql_query, self.fields):
+            if self.store.upsert(record):
+                changed.add(record.key)
+        self.last_poll = started
+        return changed
+
+    def tick(self):
+        if self.last_poll is None or self.ticks % self.full_refresh_every == 0:
+            changed = self.refresh()
+        else:
+            changed = self.poll()
+        self.ticks += 1
+        return changed
 
 
-# list of all projects
-def list_projects(jira):
-    try:
-        projects = jira.projects()
-        for project in projects:
-            print(f"Project Key: {project.key}, Name: {project.name}")
-        return projects
-    except JIRAError as e:
-        print(f"Error listing projects: {e}")
-        return None
+# JQL of the listing commands; --watch polls the same queries
+def _stories_jql(project_key):
+    return f"project = {project_key} AND issuetype in (Bug, Task, Story)"
 
 
-def delete_all_projects(jira):
-    try:
-        # Get all projects
-        projects = jira.projects()
+def _epics_jql(project_key):
+    return f"project = {project_key} AND issuetype = Epic"
 
-        # Iterate over projects
-        for project in projects:
-            # Delete project
-            jira.delete_project(project.key)
-            logging.info(f"Project {project.key} deleted successfully.")
 
-        logging.info("All projects have been deleted.")
-        return True
-    except Exception as e:
-        logging.error(f"Error deleting projects: {e}")
-        return False
+def _members_jql(project_key):
+    return f'project="{project_key}"'
 
 
-def delete_project(jira, project_key):
-    try:
-        # Delete project
-        jira.delete_project(project_key)
-        logging.info(f"Project {project_key} deleted successfully.")
-        return True
-    except Exception as e:
-        logging.error(f"Error deleting project {project_key}: {e}")
-        return False
+def _sprint_stories_jql(sprint_id):
+    return f"sprint = {sprint_id} AND issuetype = Task"
+
+
+def _my_stories_jql(project_key, user):
+    # Quoted: user names and e-mail addresses may hold spaces or @
+    return f"project = '{project_key}' AND assignee = '{user}' AND issuetype = Task"
+
+
+def _sprint_report_jql(sprint_id, project_key):
+    return f"project = {project_key} AND issuetype = Story AND Sprint = {sprint_id}"
 
 
 def get_stories_for_project(jira, project_key):
     try:
-        jql_query = f"project = {project_key} AND issuetype in (Bug, Task, Story)"
-        issues = jira.search_issues(jql_query)
-        stories = [
-            {
-                "Issue Type": issue.fields.issuetype.name,
-                "Issue Key": issue.key,
-                "Status": issue.fields.status.name,
-                "Assignee": (
-                    issue.fields.assignee.displayName if issue.fields.assignee else None
-                ),
-                "Summary": issue.fields.summary,
-            }
-            for issue in issues
-        ]
+        jql_query = _stories_jql(project_key)
+        stories = list(
+            _project_issue_records(
+                jira,
+                project_key,
+                jql_query,
+                ISSUE_RECORD_FIELDS,
+                STORY_ISSUE_TYPES,
+                workers=SEARCH_WORKERS,
+            )
+        )
         return stories
     except Exception as e:
         logging.error(f"Error retrieving stories for project: {e}")
         return None
 
 
-def delete_all_stories_in_project(jira, project_key):
+def delete_all_stories_in_project(jira, project_key, journal=None):
+    """
+    Delete every issue of a project.
+
+    :param jira: JIRA connection
+    :param project_key: Project key
+    :param journal: Optional BulkJournal; a resumed journal skips the search
+        and the issues it already recorded as deleted
+    """
     try:
-        # Retrieve all issues (stories) in the project
-        issues = jira.search_issues(f"project={project_key}")
+        # Retrieve all issues (stories) in the project before deleting any,
+        # deleting while paging would shift the pages that are still to come
+        issue_keys = _journaled_items(
+            journal,
+            lambda: [
+                issue.key
+                for issue in search_issue_records(
+                    jira, f"project={project_key}", (), workers=SEARCH_WORKERS
+                )
+            ],
+        )
 
         # Delete each story
-        for issue in issues:
-            issue.delete()
-            logging.info(f"Story deleted successfully. Key: {issue.key}")
-
+        for issue_key in issue_keys:
+            try:
+                jira._session.delete(jira._get_url(f"issue/{issue_key}"))
+            except JIRAError as e:
+                # Deleted by an interrupted run after its last journal entry
+                if journal is None or e.status_code != 404:
+                    raise
+            if journal is not None:
+                journal.complete([issue_key])
+            logging.info(f"Story deleted successfully. Key: {issue_key}")
+
+        if journal is not None:
+            journal.finish()
         logging.info(f"All stories in Project {project_key} have been deleted.")
         return True
     except Exception as e:
         logging.error(f"Error deleting stories in project: {e}")
         raise  # Re-raise the exception to propagate it further
+    finally:
+        if journal is not None:
+            journal.close()
 
 
 # Function to create a new story in Jira
@@ -207,7 +2701,7 @@ def create_story(jira, project_key, summary, description):
 
 def update_story_status(jira, story_key, new_status, print_info=False):
     try:
-        issue = jira.issue(story_key)
+        issue = _get_issue(jira, story_key)
         transitions = jira.transitions(issue)
         for transition in transitions:
             if transition["to"]["name"] == new_status:
@@ -225,7 +2719,7 @@ def update_story_status(jira, story_key, new_status, print_info=False):
 # Function to update a story's summary
 def update_story_summary(jira, story_key, new_summary):
     try:
-        story = jira.issue(story_key)
+        story = _get_issue(jira, story_key)
         story.update(summary=new_summary)
         logging.info(f"Story summary updated successfully. Key: {story_key}")
         return story
@@ -237,7 +2731,7 @@ def update_story_summary(jira, story_key, new_summary):
 # Function to update a story's description
 def update_story_description(jira, story_key, new_description):
     try:
-        story = jira.issue(story_key)
+        story = _get_issue(jira, story_key)
         story.update(description=new_description)
         logging.info(f"Story description updated successfully. Key: {story_key}")
         return story
@@ -261,7 +2755,7 @@ def update_assignee(jira, issue_key, new_assignee):
         user = jira.user(new_assignee)
         if user:
             # Update the assignee
-            issue = jira.issue(issue_key)
+            issue = _get_issue(jira, issue_key)
             issue.update(assignee={'name': new_assignee})
             print(f"Issue {issue_key} successfully assigned to {new_assignee}")
         else:
@@ -275,7 +2769,7 @@ def update_assignee(jira, issue_key, new_assignee):
 def print_issue_assignee(jira, issue_key):
     try:
         # Retrieve the issue object
-        issue = jira.issue(issue_key)
+        issue = _get_issue(jira, issue_key)
 
         # Get the assignee of the issue
         assignee = issue.fields.assignee
@@ -291,7 +2785,7 @@ def print_issue_assignee(jira, issue_key):
 # Function to update a story's reporter
 def update_story_reporter(jira, story_key, new_reporter):
     try:
-        story = jira.issue(story_key)
+        story = _get_issue(jira, story_key)
         story.update(reporter={"name": new_reporter})
         print(f"Story reporter updated successfully. Key: {story_key}")
         return story
@@ -300,24 +2794,104 @@ def update_story_reporter(jira, story_key, new_reporter):
         return None
 
 
+# Fields of the story detail view; comments, links and subtasks come with them
+DETAIL_FIELDS = (
+    "summary",
+    "description",
+    "issuetype",
+    "status",
+    "assignee",
+    "reporter",
+    "created",
+    "updated",
+    "comment",
+    "issuelinks",
+    "subtasks",
+)
+
+# Loaded in the same request as DETAIL_FIELDS
+DETAIL_EXPAND = "changelog,renderedFields"
+
+# Issues per detail search; expanded changelogs make every issue large
+DETAIL_CHUNK_SIZE = 50
+
+
+def read_issue_details(jira, issue_keys, chunk_size=DETAIL_CHUNK_SIZE):
+    """
+    Load the detail view of many issues (DETAIL_FIELDS plus changelog and
+    rendered fields) with one ``key in (...)`` search per chunk instead of a
+    request per issue and per section.
+
+    :param jira: JIRA connection
+    :param issue_keys: Issue keys
+    :param chunk_size: Keys per search
+    :return: Dictionary of issue key to jira Issue, in the order given,
+        without the keys that do not exist
+    """
+    keys = list(dict.fromkeys(issue_keys))
+    details = {}
+    for i in range(0, len(keys), chunk_size):
+        chunk = keys[i : i + chunk_size]
+        for raw in _search_issue_json(
+            jira,
+            f"key in ({', '.join(chunk)})",
+            DETAIL_FIELDS,
+            chunk_size,
+            validate_query="warn",
+            expand=DETAIL_EXPAND,
+        ):
+            details[raw["key"]] = Issue(jira._options, jira._session, raw=raw)
+    return {key: details[key] for key in keys if key in details}
+
+
+def _display_name(user):
+    return user.displayName if user else "Unassigned"
+
+
+def _detail_rows(story):
+    # (label, value) rows of the story detail view
+    fields = story.fields
+    rows = [
+        ("Key", story.key),
+        ("Summary", fields.summary),
+        ("Description", fields.description),
+        ("Status", fields.status.name),
+        ("Assignee", _display_name(fields.assignee)),
+        ("Reporter", _display_name(fields.reporter)),
+        ("Created", fields.created),
+        ("Updated", fields.updated),
+    ]
+    comment = getattr(fields, "comment", None)
+    for item in getattr(comment, "comments", None) or ():
+        rows.append(
+            ("Comment", f"{_display_name(getattr(item, 'author', None))} ({item.created}): {item.body}")
+        )
+    for link in getattr(fields, "issuelinks", None) or ():
+        if hasattr(link, "outwardIssue"):
+            rows.append(("Link", f"{link.type.outward} {link.outwardIssue.key}"))
+        elif hasattr(link, "inwardIssue"):
+            rows.append(("Link", f"{link.type.inward} {link.inwardIssue.key}"))
+    for subtask in getattr(fields, "subtasks", None) or ():
+        rows.append(("Subtask", f"{subtask.key} {subtask.fields.summary}"))
+    changelog = getattr(story, "changelog", None)
+    for history in getattr(changelog, "histories", None) or ():
+        for item in history.items:
+            rows.append(
+                (
+                    "Change",
+                    f"{history.created} {_display_name(getattr(history, 'author', None))}:"
+                    f" {item.field} {item.fromString} -> {item.toString}",
+                )
+            )
+    return rows
+
+
 # Function to read a story's details
 def read_story_details(jira, story_key):
     try:
-        story = jira.issue(story_key)
-        logging.info(f"Key: {story.key}")
-        logging.info(f"Summary: {story.fields.summary}")
-        logging.info(f"Description: {story.fields.description}")
-        logging.info(f"Status: {story.fields.status.name}")
-        if story.fields.assignee:
-            logging.info(f"Assignee: {story.fields.assignee.displayName}")
-        else:
-            logging.info("Assignee: Unassigned")
-        if story.fields.reporter:
-            logging.info(f"Reporter: {story.fields.reporter.displayName}")
-        else:
-            logging.info("Reporter: Unassigned")
-        logging.info(f"Created: {story.fields.created}")
-        logging.info(f"Updated: {story.fields.updated}")
+        story = _get_issue(jira, story_key, ",".join(DETAIL_FIELDS), DETAIL_EXPAND)
+        for label, value in _detail_rows(story):
+            logging.info(f"{label}: {value}")
     except JIRAError as e:
         logging.error(f"Error reading story: {e}")
 
@@ -325,7 +2899,7 @@ def read_story_details(jira, story_key):
 # Function to delete a story
 def delete_story(jira, story_key):
     try:
-        issue = jira.issue(story_key)
+        issue = _get_issue(jira, story_key)
         issue.delete()
         logging.info(f"Story deleted successfully. Key: {story_key}")
         return True
@@ -336,7 +2910,7 @@ def delete_story(jira, story_key):
 
 def add_comment(jira, issue_key, comment_body):
     try:
-        issue = jira.issue(issue_key)
+        issue = _get_issue(jira, issue_key)
         jira.add_comment(issue, comment_body)
         logging.info(f"Comment added to issue {issue_key}")
         return 1  # Return 1 to indicate success
@@ -363,8 +2937,12 @@ def create_epic(jira, project_key, epic_name, epic_summary):
 # Function to list all Epics in a project
 def list_epics(jira, project_key):
     try:
-        jql_query = f"project = {project_key} AND issuetype = Epic"
-        epics = jira.search_issues(jql_query)
+        jql_query = _epics_jql(project_key)
+        epics = list(
+            _project_issue_records(
+                jira, project_key, jql_query, ISSUE_RECORD_FIELDS, ("Epic",)
+            )
+        )
         return epics
     except Exception as e:
         logging.error(f"Error listing epics: {e}")
@@ -373,7 +2951,7 @@ def list_epics(jira, project_key):
 
 def update_epic(jira, epic_key, new_summary, new_description):
     try:
-        epic = jira.issue(epic_key)
+        epic = _get_issue(jira, epic_key)
         epic.update(
             summary=new_summary,
             description=new_description,
@@ -388,23 +2966,21 @@ def update_epic(jira, epic_key, new_summary, new_description):
 # Function to read the details of an Epic
 def read_epic_details(jira, epic_key):
     try:
-        epic = jira.issue(epic_key)
+        epic = _get_issue(jira, epic_key)
         logging.info(f"Epic Key: {epic.key}")
         logging.info(f"Summary: {epic.fields.summary}")
 
         # Read stories in the epic
-        stories = jira.search_issues(f"'Epic Link' = {epic_key}")
+        stories = list(search_issue_records(jira, f"'Epic Link' = {epic_key}"))
         if stories:
             logging.info("Stories in the Epic:")
             for story in stories:
                 logging.info(f"Story Key: {story.key}")
-                logging.info(f"Summary: {story.fields.summary}")
-                logging.info(f"Status: {story.fields.status}")
-                logging.info(f"Assignee: {story.fields.assignee}")
-                logging.info(f"Due Date: {story.fields.duedate}")
-                logging.info(
-                    f"Start Date: {story.fields.customfield_10015}"
-                )  # Replace 'xxxxx' with the custom field ID for start date
+                logging.info(f"Summary: {story.summary}")
+                logging.info(f"Status: {story.status}")
+                logging.info(f"Assignee: {story.assignee}")
+                logging.info(f"Due Date: {story.due_date}")
+                logging.info(f"Start Date: {story.start_date}")
         else:
             logging.info("No stories found in the Epic.")
 
@@ -415,8 +2991,8 @@ def read_epic_details(jira, epic_key):
 # Add story to epic
 def add_story_to_epic(jira, epic_key, story_key):
     try:
-        epic = jira.issue(epic_key)
-        story = jira.issue(story_key)
+        epic = _get_issue(jira, epic_key)
+        story = _get_issue(jira, story_key)
         jira.add_issues_to_epic(epic.id, [story.id])
         logging.info(f"Story {story_key} added to Epic {epic_key}")
         return True
@@ -428,12 +3004,12 @@ def add_story_to_epic(jira, epic_key, story_key):
 # Function to unlink a Story from an Epic
 def unlink_story_from_epic(jira, story_key):
     try:
-        story = jira.issue(story_key)
+        story = _get_issue(jira, story_key)
 
         # Update the 'Epic Link' custom field of the story to remove its association with the epic
         story.update(
-            fields={"customfield_10014": None}
-        )  # Replace 'customfield_123456' with the actual Epic Link field ID
+            fields={EPIC_LINK_FIELD: None}
+        )
 
         logging.info(f"Story {story_key} unlinked from its Epic")
         return True
@@ -444,7 +3020,7 @@ def unlink_story_from_epic(jira, story_key):
 
 def delete_epic(jira, epic_key):
     try:
-        issue = jira.issue(epic_key)
+        issue = _get_issue(jira, epic_key)
         issue.delete()
         logging.info(f"Epic deleted successfully. Key: {epic_key}")
         return True
@@ -454,16 +3030,22 @@ def delete_epic(jira, epic_key):
 
 
 # Function to create a new sprint
-def create_sprint(jira_url, jira_username, api_token, board_id, sprint_name):
+def create_sprint(jira_url, jira_username, api_token, board_id, sprint_name, jira=None):
     create_sprint_api_url = f"{jira_url}/rest/agile/1.0/sprint"
     auth = (jira_username, api_token)
     sprint_data = {
         "name": sprint_name,
         "originBoardId": board_id,
     }
-    response_create_sprint = requests.post(
-        create_sprint_api_url, json=sprint_data, auth=auth
-    )
+    if jira is not None:
+        # Post on the connection's session instead of authenticating again
+        response_create_sprint = _agile_post(jira, create_sprint_api_url, json=sprint_data)
+    else:
+        started = time.perf_counter()
+        response_create_sprint = requests.post(
+            create_sprint_api_url, json=sprint_data, auth=auth
+        )
+        _record_raw_response("POST", response_create_sprint, started)
     if response_create_sprint.status_code == 201:
         created_sprint_data = response_create_sprint.json()
         sprint_id = created_sprint_data.get("id")
@@ -476,6 +3058,16 @@ def create_sprint(jira_url, jira_username, api_token, board_id, sprint_name):
         return None
 
 
+def _agile_post(jira, url, **kwargs):
+    # The JIRA session raises on error statuses; hand them back as responses like requests.post does
+    try:
+        return jira._session.post(url, **kwargs)
+    except JIRAError as e:
+        if e.response is None:
+            raise
+        return e.response
+
+
 # Get all sprints for the specified board
 def get_sprints_for_board(jira, board_id):
     try:
@@ -486,20 +3078,100 @@ def get_sprints_for_board(jira, board_id):
         return None
 
 
+# Most issues the Agile API moves into a sprint per request
+SPRINT_MOVE_BATCH = 50
+
+
+def _range_move_plan(jira, project_key, start_issue_key, end_issue_key):
+    # Keys of the existing issues in a range, for a journaled move
+    return lambda: [
+        issue.key
+        for issue in resolve_issue_keys(
+            jira, issue_keys_in_range(project_key, start_issue_key, end_issue_key)
+        )
+    ]
+
+
 def move_issues_to_sprint(
-    jira, project_key, start_issue_key, end_issue_key, target_sprint_id
+    jira, project_key, start_issue_key, end_issue_key, target_sprint_id, journal=None
 ):
-    start_issue_number = int(start_issue_key.split("-")[1])
-    end_issue_number = int(end_issue_key.split("-")[1])
+    try:
+        issue_keys = _journaled_items(
+            journal, _range_move_plan(jira, project_key, start_issue_key, end_issue_key)
+        )
+    except Exception as e:
+        logging.error(f"Error resolving issues to move to Sprint: {e}")
+        if journal is not None:
+            journal.close()
+        return
 
-    for i in range(start_issue_number, end_issue_number + 1):
-        issue_key = f"{project_key}-{i}"
-        try:
-            issue = jira.issue(issue_key)
-            jira.add_issues_to_sprint(target_sprint_id, [issue.key])
-            logging.info(f"Issue {issue_key} moved to Sprint {target_sprint_id}")
-        except Exception as e:
-            logging.error(f"Error moving issue {issue_key} to Sprint: {e}")
+    failed = False
+    try:
+        for i in range(0, len(issue_keys), SPRINT_MOVE_BATCH):
+            batch = issue_keys[i : i + SPRINT_MOVE_BATCH]
+            try:
+                jira.add_issues_to_sprint(target_sprint_id, batch)
+                if journal is not None:
+                    journal.complete(batch)
+                for issue_key in batch:
+                    logging.info(f"Issue {issue_key} moved to Sprint {target_sprint_id}")
+            except Exception as e:
+                failed = True
+                for issue_key in batch:
+                    logging.error(f"Error moving issue {issue_key} to Sprint: {e}")
+        # Keep the journal open for --resume while some batch still has to be retried
+        if journal is not None and not failed:
+            journal.finish()
+    finally:
+        if journal is not None:
+            journal.close()
+
+
+def move_backlog_to_sprint(jira, board_id, target_sprint_id, count, jql=None):
+    """
+    Move the top ``count`` backlog issues of a board, in rank order, into a sprint.
+
+    Moved issues leave the backlog, so every batch is read from the top of
+    it again: two requests per SPRINT_MOVE_BATCH issues and nothing but one
+    batch of keys held, however long the backlog is.
+
+    :param jira: JIRA connection
+    :param board_id: Board ID
+    :param target_sprint_id: Sprint to move the issues into
+    :param count: Most issues to move
+    :param jql: Only move backlog issues matching this JQL
+    :return: Number of issues moved
+    """
+    moved = 0
+    previous = None
+    try:
+        while moved < count:
+            batch = [
+                raw["key"]
+                for raw in _stream_board_page(
+                    jira,
+                    board_id,
+                    "backlog",
+                    0,
+                    min(SPRINT_MOVE_BATCH, count - moved),
+                    (),
+                    {},
+                    jql,
+                )
+            ]
+            if not batch:
+                break
+            if batch == previous:
+                logging.error(f"Issues {', '.join(batch)} stayed in the backlog after the move.")
+                break
+            jira.add_issues_to_sprint(target_sprint_id, batch)
+            for issue_key in batch:
+                logging.info(f"Issue {issue_key} moved to Sprint {target_sprint_id}")
+            moved += len(batch)
+            previous = batch
+    except JIRAError as e:
+        logging.error(f"Error moving backlog issues to Sprint: {e}")
+    return moved
 
 
 def start_sprint(jira, sprint_id, new_summary, start_date, end_date):
@@ -527,13 +3199,13 @@ def start_sprint(jira, sprint_id, new_summary, start_date, end_date):
 def get_stories_in_sprint(jira, sprint_id, print_info=False):
     try:
         # Construct JQL to search for issues in the given sprint
-        jql = f"sprint = {sprint_id} AND issuetype = Task"
+        jql = _sprint_stories_jql(sprint_id)
 
-        # Search for issues using the constructed JQL
-        issues = jira.search_issues(jql)
-
-        # Extract issue keys from the search result
-        story_keys = [issue.key for issue in issues]
+        # Search for issues using the constructed JQL and keep only their keys
+        story_keys = [
+            issue.key
+            for issue in _issue_records(jira, jql, ())
+        ]
 
         if print_info:
             logging.info(f"Retrieved {len(story_keys)} stories in sprint {sprint_id}")
@@ -611,17 +3283,15 @@ def sprint_report(jira, sprint_id, project_key):
             print(f"{key}: {value}")
 
         # Define the JQL query to search for issues of type 'Story' in the sprint
-        jql_query = (
-            f"project = {project_key} AND issuetype = Story AND Sprint = {sprint_id}"
-        )
+        jql_query = _sprint_report_jql(sprint_id, project_key)
 
         # Search for issues using the JQL query
-        issues = jira.search_issues(jql_query)
+        issues = _issue_records(jira, jql_query, ("status",))
 
         # Count issue statuses
         status_counts = {"To Do": 0, "In Progress": 0, "Done": 0}
         for issue in issues:
-            status = issue.fields.status.name
+            status = issue.status
             if status in status_counts:
                 status_counts[status] += 1
 
@@ -634,6 +3304,430 @@ def sprint_report(jira, sprint_id, project_key):
         print(f"Error generating sprint report: {e}")
 
 
+# Where the CLI caches parsed changelogs, see ChangelogCache
+DEFAULT_CHANGELOG_CACHE = os.path.join(
+    os.path.expanduser("~"), ".jirasimplelib", "changelog.db"
+)
+
+# Issues per expand=changelog search
+CHANGELOG_CHUNK_SIZE = 50
+
+# Statuses that start the cycle-time clock, and those that stop it
+CYCLE_START_STATUSES = ("In Progress",)
+DONE_STATUSES = ("Done",)
+
+
+def issue_transitions(raw):
+    """
+    Status transitions of an issue from its JSON with the changelog expanded.
+
+    :param raw: Issue JSON with fields created and status and a changelog
+    :return: (created, initial status, [(time, status), ...]) with times in
+        epoch seconds, oldest transition first
+    """
+    fields = raw.get("fields") or {}
+    changes = []
+    for history in (raw.get("changelog") or {}).get("histories", ()):
+        for item in history.get("items", ()):
+            if item.get("field") == "status":
+                changes.append(
+                    (
+                        _jira_datetime(history["created"]).timestamp(),
+                        item.get("fromString"),
+                        item.get("toString"),
+                    )
+                )
+    changes.sort(key=lambda change: change[0])
+    initial = changes[0][1] if changes else _field_name(fields.get("status"))
+    return (
+        _jira_datetime(fields["created"]).timestamp(),
+        initial,
+        [(moment, status) for moment, _, status in changes],
+    )
+
+
+class TransitionArrays:
+    """
+    Status transitions of many issues packed into flat arrays: for the
+    transitions of issue i, times[offsets[i]:offsets[i + 1]] and the status
+    codes at the same positions, names in status_names. NumPy arrays when
+    NumPy is installed, array.array otherwise.
+    """
+
+    def __init__(self, rows):
+        """
+        :param rows: Iterable of (key, created, initial status, [(time, status), ...])
+        """
+        self.keys = []
+        self.status_names = []
+        codes = {}
+
+        def code(status):
+            if status not in codes:
+                codes[status] = len(self.status_names)
+                self.status_names.append(status)
+            return codes[status]
+
+        created, initial, offsets, times, statuses = [], [], [0], [], []
+        for key, issue_created, issue_initial, changes in rows:
+            self.keys.append(key)
+            created.append(issue_created)
+            initial.append(code(issue_initial))
+            for moment, status in changes:
+                times.append(moment)
+                statuses.append(code(status))
+            offsets.append(len(times))
+        if numpy is not None:
+            self.created = numpy.array(created, dtype=numpy.float64)
+            self.initial = numpy.array(initial, dtype=numpy.int32)
+            self.offsets = numpy.array(offsets, dtype=numpy.int64)
+            self.times = numpy.array(times, dtype=numpy.float64)
+            self.statuses = numpy.array(statuses, dtype=numpy.int32)
+        else:
+            self.created = array.array("d", created)
+            self.initial = array.array("i", initial)
+            self.offsets = array.array("q", offsets)
+            self.times = array.array("d", times)
+            self.statuses = array.array("i", statuses)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def codes(self, status_names):
+        return [code for code, name in enumerate(self.status_names) if name in status_names]
+
+
+class ChangelogCache:
+    """
+    Parsed status transitions per issue, kept in SQLite with the issue's
+    ``updated`` timestamp. An issue's changelog is fetched again only when
+    Jira reports a different ``updated`` for it.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS transitions (
+            key TEXT PRIMARY KEY, updated TEXT, created REAL, initial TEXT,
+            times BLOB, statuses TEXT
+        );
+    """
+
+    def __init__(self, path=DEFAULT_CHANGELOG_CACHE):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        with self.lock, self.db:
+            self.db.executescript(self.SCHEMA)
+
+    def updated(self, issue_keys):
+        """
+        :return: Dictionary of issue key to the cached ``updated`` timestamp
+        """
+        found = {}
+        keys = list(issue_keys)
+        with self.lock:
+            # Stay below SQLite's bound parameter limit
+            for i in range(0, len(keys), 500):
+                chunk = keys[i : i + 500]
+                found.update(
+                    self.db.execute(
+                        "SELECT key, updated FROM transitions"
+                        f" WHERE key IN ({', '.join('?' * len(chunk))})",
+                        chunk,
+                    )
+                )
+        return found
+
+    def add(self, raw_issues):
+        """
+        Parse and store the transitions of issues.
+
+        :param raw_issues: Issue JSON with fields created, status and updated and the changelog
+        """
+        rows = []
+        for raw in raw_issues:
+            created, initial, changes = issue_transitions(raw)
+            rows.append(
+                (
+                    raw["key"],
+                    (raw.get("fields") or {}).get("updated"),
+                    created,
+                    initial,
+                    array.array("d", (moment for moment, _ in changes)).tobytes(),
+                    json.dumps([status for _, status in changes]),
+                )
+            )
+        with self.lock, self.db:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO transitions VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+
+    def arrays(self, issue_keys):
+        """
+        :return: TransitionArrays of the cached issues among issue_keys, in that order
+        """
+        keys = list(issue_keys)
+        rows = {}
+        with self.lock:
+            for i in range(0, len(keys), 500):
+                chunk = keys[i : i + 500]
+                for key, created, initial, times, statuses in self.db.execute(
+                    "SELECT key, created, initial, times, statuses FROM transitions"
+                    f" WHERE key IN ({', '.join('?' * len(chunk))})",
+                    chunk,
+                ):
+                    moments = array.array("d")
+                    moments.frombytes(times)
+                    rows[key] = (key, created, initial, list(zip(moments, json.loads(statuses))))
+        return TransitionArrays(rows[key] for key in keys if key in rows)
+
+    def __len__(self):
+        with self.lock:
+            return self.db.execute("SELECT COUNT(*) FROM transitions").fetchone()[0]
+
+    def close(self):
+        self.db.close()
+
+
+def _issue_changelogs(jira, issue_keys):
+    # Issue JSON with the full changelog; a search embeds only the first page of histories
+    raw_issues = list(
+        _search_issue_json(
+            jira,
+            f"key in ({', '.join(issue_keys)})",
+            ("created", "status", "updated"),
+            CHANGELOG_CHUNK_SIZE,
+            validate_query="warn",
+            expand="changelog",
+        )
+    )
+    for raw in raw_issues:
+        changelog = raw.setdefault("changelog", {})
+        histories = changelog.setdefault("histories", [])
+        while len(histories) < changelog.get("total", 0):
+            response = jira._session.get(
+                jira._get_url(f"issue/{raw['key']}/changelog"),
+                params={"startAt": len(histories), "maxResults": 100},
+            )
+            page = response.json().get("values", ())
+            if not page:
+                break
+            histories.extend(page)
+    return raw_issues
+
+
+def load_changelogs(jira, jql_query, cache):
+    """
+    Transitions of every issue a query matches, fetching only the changelogs
+    of issues that are new or were updated since they were cached.
+
+    One search lists the keys and ``updated`` timestamps (or the active issue
+    store answers it); the stale issues are then read with their changelogs
+    CHANGELOG_CHUNK_SIZE at a time, SEARCH_WORKERS searches at once.
+
+    :param jira: JIRA connection
+    :param jql_query: JQL query string
+    :param cache: ChangelogCache
+    :return: TransitionArrays of the matching issues
+    """
+    updated = {record.key: record.updated for record in _issue_records(jira, jql_query, ("updated",))}
+    cached = cache.updated(updated)
+    stale = [key for key, stamp in updated.items() if cached.get(key) != stamp]
+    chunks = [
+        stale[i : i + CHANGELOG_CHUNK_SIZE] for i in range(0, len(stale), CHANGELOG_CHUNK_SIZE)
+    ]
+    with ThreadPoolExecutor(max_workers=SEARCH_WORKERS) as executor:
+        for raw_issues in executor.map(lambda chunk: _issue_changelogs(jira, chunk), chunks):
+            cache.add(raw_issues)
+    return cache.arrays(updated)
+
+
+def issue_cycle_times(arrays, start_statuses=CYCLE_START_STATUSES, done_statuses=DONE_STATUSES):
+    """
+    Cycle and lead time of every issue, in days.
+
+    An issue is done when its last status is a done status; it was done at
+    its last move into one. Cycle time runs from the first move into a start
+    (or done) status, lead time from creation.
+
+    :param arrays: TransitionArrays
+    :return: (lead times, cycle times), one value per issue, NaN for issues not done
+    """
+    start = arrays.codes(start_statuses) + arrays.codes(done_statuses)
+    done = arrays.codes(done_statuses)
+    day = 24 * 60 * 60
+    if numpy is not None:
+        count = len(arrays)
+        owner = numpy.repeat(numpy.arange(count), numpy.diff(arrays.offsets))
+        started = numpy.full(count, numpy.inf)
+        is_start = numpy.isin(arrays.statuses, start)
+        numpy.minimum.at(started, owner[is_start], arrays.times[is_start])
+        done_at = numpy.full(count, numpy.nan)
+        is_done = numpy.isin(arrays.statuses, done)
+        numpy.fmax.at(done_at, owner[is_done], arrays.times[is_done])
+        last = arrays.initial.copy()
+        moved = arrays.offsets[1:] > arrays.offsets[:-1]
+        last[moved] = arrays.statuses[arrays.offsets[1:][moved] - 1]
+        # Created done, never moved: done at creation
+        done_at[~moved & numpy.isin(last, done)] = arrays.created[~moved & numpy.isin(last, done)]
+        done_at[~numpy.isin(last, done)] = numpy.nan
+        started = numpy.where(numpy.isinf(started), arrays.created, started)
+        return (done_at - arrays.created) / day, (done_at - started) / day
+    start, done = set(start), set(done)
+    lead_times, cycle_times = [], []
+    for i in range(len(arrays)):
+        first, end = arrays.offsets[i], arrays.offsets[i + 1]
+        last = arrays.statuses[end - 1] if end > first else arrays.initial[i]
+        if last not in done:
+            lead_times.append(math.nan)
+            cycle_times.append(math.nan)
+            continue
+        started, done_at = None, arrays.created[i]
+        for position in range(first, end):
+            status = arrays.statuses[position]
+            if started is None and status in start:
+                started = arrays.times[position]
+            if status in done:
+                done_at = arrays.times[position]
+        lead_times.append((done_at - arrays.created[i]) / day)
+        cycle_times.append((done_at - (arrays.created[i] if started is None else started)) / day)
+    return lead_times, cycle_times
+
+
+def _time_summary(values):
+    # Count, mean, median and 85th percentile of the values that are not NaN
+    values = sorted(value for value in values if not math.isnan(value))
+    if not values:
+        return {"issues": 0, "mean": None, "median": None, "p85": None}
+
+    def percentile(fraction):
+        position = (len(values) - 1) * fraction
+        lower = math.floor(position)
+        upper = min(lower + 1, len(values) - 1)
+        return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+    return {
+        "issues": len(values),
+        "mean": sum(values) / len(values),
+        "median": percentile(0.5),
+        "p85": percentile(0.85),
+    }
+
+
+def cycle_time_report(jira, project_key, days=182, cache=None):
+    """
+    Cycle and lead time of the project's issues done in the last ``days`` days.
+
+    :param jira: JIRA connection
+    :param project_key: Project key
+    :param days: Look-back window
+    :param cache: ChangelogCache (default: an in-memory one for this call)
+    :return: {"cycle_time": summary, "lead_time": summary}, summaries with
+        issues, mean, median and p85 in days, or None on error
+    """
+    try:
+        if cache is None:
+            cache = ChangelogCache(":memory:")
+        statuses = ", ".join(f'"{status}"' for status in DONE_STATUSES)
+        # Anything done in the window was updated in it; old issues touched
+        # since are dropped below by the done time in their changelog
+        arrays = load_changelogs(
+            jira,
+            f"project = {project_key} AND status in ({statuses}) AND updated >= -{days}d",
+            cache,
+        )
+        lead_times, cycle_times = issue_cycle_times(arrays)
+        since = time.time() - int(days) * 24 * 60 * 60
+        # Done at created + lead time; NaN (not done) compares false
+        recent = [
+            i
+            for i, (created, lead_time) in enumerate(zip(arrays.created, lead_times))
+            if created + lead_time * 24 * 60 * 60 >= since
+        ]
+        lead_times = [lead_times[i] for i in recent]
+        cycle_times = [cycle_times[i] for i in recent]
+        return {
+            "cycle_time": _time_summary(cycle_times),
+            "lead_time": _time_summary(lead_times),
+        }
+    except Exception as e:
+        logging.error(f"Error computing cycle times for {project_key}: {e}")
+        return None
+
+
+def burndown(arrays, start, end, step=24 * 60 * 60, done_statuses=DONE_STATUSES):
+    """
+    Issues not done at the end of each step between start and end.
+
+    :param arrays: TransitionArrays of the issues to burn down
+    :param start: Start time, epoch seconds
+    :param end: End time, epoch seconds
+    :param step: Seconds between two points
+    :return: List of (time, remaining issues)
+    """
+    done = arrays.codes(done_statuses)
+    points = [min(start + step * n, end) for n in range(1, math.ceil((end - start) / step) + 1)]
+    if numpy is not None:
+        is_done = numpy.isin(arrays.statuses, done).astype(numpy.int64)
+        was_done = numpy.isin(arrays.initial, done).astype(numpy.int64)
+        # Previous status of every transition: the issue's initial status for its first one
+        previous = numpy.empty_like(is_done)
+        previous[1:] = is_done[:-1]
+        firsts = arrays.offsets[:-1][arrays.offsets[1:] > arrays.offsets[:-1]]
+        previous[firsts] = was_done[arrays.offsets[1:] > arrays.offsets[:-1]]
+        order = numpy.argsort(arrays.times, kind="stable")
+        finished = numpy.cumsum((is_done - previous)[order])
+        positions = numpy.searchsorted(arrays.times[order], points, side="right")
+        finished = numpy.concatenate(([0], finished))[positions] + was_done.sum()
+        return [(point, int(len(arrays) - count)) for point, count in zip(points, finished)]
+    done = set(done)
+    events = []
+    for i in range(len(arrays)):
+        previous = arrays.initial[i] in done
+        for position in range(arrays.offsets[i], arrays.offsets[i + 1]):
+            now_done = arrays.statuses[position] in done
+            if now_done != previous:
+                events.append((arrays.times[position], 1 if now_done else -1))
+            previous = now_done
+    events.sort()
+    finished = sum(1 for status in arrays.initial if status in done)
+    result, position = [], 0
+    for point in points:
+        while position < len(events) and events[position][0] <= point:
+            finished += events[position][1]
+            position += 1
+        result.append((point, len(arrays) - finished))
+    return result
+
+
+def sprint_burndown(jira, sprint_id, cache=None, now=None):
+    """
+    Daily burndown of a sprint's issues from their changelogs.
+
+    :param jira: JIRA connection
+    :param sprint_id: Sprint ID
+    :param cache: ChangelogCache (default: an in-memory one for this call)
+    :param now: Current time for sprints still running (default: now)
+    :return: List of (date, remaining issues), or None on error
+    """
+    try:
+        if cache is None:
+            cache = ChangelogCache(":memory:")
+        sprint = jira.sprint(sprint_id).raw
+        start = _jira_datetime(sprint["startDate"]).timestamp()
+        end = _jira_datetime(sprint.get("completeDate") or sprint["endDate"]).timestamp()
+        end = min(end, (now or datetime.now(timezone.utc)).timestamp())
+        arrays = load_changelogs(jira, f"sprint = {sprint_id}", cache)
+        return [
+            (datetime.fromtimestamp(point, timezone.utc).date(), remaining)
+            for point, remaining in burndown(arrays, start, end)
+        ]
+    except Exception as e:
+        logging.error(f"Error computing burndown of sprint {sprint_id}: {e}")
+        return None
+
+
 # Function to delete a sprint
 def delete_sprint(jira, sprint_id):
     try:
@@ -646,24 +3740,235 @@ def delete_sprint(jira, sprint_id):
         return False
 
 
-def delete_all_sprints(jira, board_id):
-    try:
-        # Retrieve all sprints in the board
-        sprints = jira.sprints(board_id)
+def delete_all_sprints(jira, board_id):
+    try:
+        # Retrieve all sprints in the board
+        sprints = jira.sprints(board_id)
+
+        # Delete each sprint
+        for sprint in sprints:
+            sprint.delete()
+            logging.info(f"Sprint deleted successfully. ID: {sprint.id}")
+
+        logging.info("All sprints have been deleted.")
+        return True
+    except JIRAError as e:
+        logging.error(f"Error deleting sprints: {e}")
+        return False
+
+
+# Boards plan_sprints works on at the same time
+SPRINT_PLAN_WORKERS = 8
+
+# Date format the Agile API takes for sprint dates
+SPRINT_DATE_FORMAT = "%Y-%m-%dT%H:%M:%S.000+0000"
+
+# Planning spec defaults, see plan_sprints
+SPRINT_PLAN_DEFAULTS = {
+    "name": "Sprint {number}",
+    "first_number": 1,
+    "cadence_days": 14,
+    "count": 1,
+    "start_current": False,
+    "close_ended": False,
+}
+
+
+def _jira_datetime(value):
+    # Jira dates come back as "2024-04-01T09:00:00.000+0000", an offset fromisoformat
+    # only reads from Python 3.11 on; spec dates may be plain dates
+    try:
+        moment = datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%f%z")
+    except ValueError:
+        moment = datetime.fromisoformat(value)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment
+
+
+def planned_sprints(spec, board):
+    """
+    Sprints a planning spec asks for on one board.
+
+    :param spec: Planning spec, see plan_sprints
+    :param board: Board ID, or a dict with "id" and spec keys that override the spec for this board
+    :return: List of {"name", "start", "end"} dicts in date order
+    """
+    options = dict(SPRINT_PLAN_DEFAULTS, **spec)
+    options.pop("boards", None)
+    if isinstance(board, dict):
+        options.update(board)
+    start = _jira_datetime(str(options["start"]))
+    cadence = timedelta(days=options["cadence_days"])
+    sprints = []
+    for n in range(options["count"]):
+        sprint_start = start + n * cadence
+        sprint_end = sprint_start + cadence
+        sprints.append(
+            {
+                "name": options["name"].format(
+                    board=options["id"] if isinstance(board, dict) else board,
+                    number=options["first_number"] + n,
+                    start=sprint_start.date(),
+                    end=sprint_end.date(),
+                ),
+                "start": sprint_start,
+                "end": sprint_end,
+            }
+        )
+    return sprints
+
+
+def plan_board_sprints(jira, spec, board, now=None):
+    """
+    Bring the sprints of one board in line with a planning spec: close active
+    sprints that have ended, rename future sprints planned for the same
+    start date under another name, create the missing sprints and start the
+    one covering today. Sprints that already exist by name are left alone,
+    so running the same spec again changes nothing.
+
+    :param jira: JIRA object
+    :param spec: Planning spec, see plan_sprints
+    :param board: Board ID or per-board dict from spec["boards"]
+    :param now: Current time (default: now)
+    :return: Dictionary of action ("closed", "renamed", "created", "started",
+        "existing", "failed") to sprint names
+    """
+    board_id = board["id"] if isinstance(board, dict) else board
+    options = dict(SPRINT_PLAN_DEFAULTS, **spec)
+    if isinstance(board, dict):
+        options.update(board)
+    now = now or datetime.now(timezone.utc)
+    result = {action: [] for action in ("closed", "renamed", "created", "started", "existing", "failed")}
+    sprint_url = jira._get_url("sprint", base=jira.AGILE_BASE_URL)
+
+    def update(sprint, action, **changes):
+        try:
+            response = jira._session.post(f"{sprint_url}/{sprint['id']}", json=changes)
+            sprint.update(response.json())
+            result[action].append(sprint["name"])
+        except JIRAError as e:
+            logging.error(f"Error updating sprint {sprint['id']} on board {board_id}: {e}")
+            result["failed"].append(sprint["name"])
+
+    # Every sprint of the board in one paged read, including closed ones, so old names count as existing
+    sprints = [sprint.raw for sprint in jira.sprints(board_id, maxResults=False)]
+    if options["close_ended"]:
+        for sprint in sprints:
+            if sprint["state"] == "active" and sprint.get("endDate"):
+                if _jira_datetime(sprint["endDate"]) <= now:
+                    update(sprint, "closed", state="closed")
+
+    plan = planned_sprints(spec, board)
+    planned_names = {planned["name"] for planned in plan}
+    by_name = {sprint["name"]: sprint for sprint in sprints}
+    current = None
+    for planned in plan:
+        dates = {
+            "startDate": planned["start"].strftime(SPRINT_DATE_FORMAT),
+            "endDate": planned["end"].strftime(SPRINT_DATE_FORMAT),
+        }
+        sprint = by_name.get(planned["name"])
+        if sprint is not None:
+            result["existing"].append(planned["name"])
+        else:
+            sprint = next(
+                (
+                    sprint
+                    for sprint in sprints
+                    if sprint["state"] == "future"
+                    and sprint["name"] not in planned_names
+                    and sprint.get("startDate")
+                    and _jira_datetime(sprint["startDate"]).date() == planned["start"].date()
+                ),
+                None,
+            )
+            if sprint is not None:
+                update(sprint, "renamed", name=planned["name"])
+                by_name[planned["name"]] = sprint
+            else:
+                try:
+                    response = jira._session.post(
+                        sprint_url,
+                        json={"name": planned["name"], "originBoardId": board_id, **dates},
+                    )
+                    sprint = response.json()
+                    sprints.append(sprint)
+                    by_name[planned["name"]] = sprint
+                    result["created"].append(planned["name"])
+                except JIRAError as e:
+                    logging.error(f"Error creating sprint {planned['name']} on board {board_id}: {e}")
+                    result["failed"].append(planned["name"])
+                    continue
+        if planned["start"] <= now < planned["end"]:
+            current = (sprint, dates)
+
+    if options["start_current"] and current is not None:
+        sprint, dates = current
+        if sprint["state"] == "future" and not any(s["state"] == "active" for s in sprints):
+            update(sprint, "started", state="active", **dates)
+    return result
+
+
+def plan_sprints(jira, spec, workers=SPRINT_PLAN_WORKERS, now=None):
+    """
+    Create, rename, start and close sprints on many boards from one planning
+    spec. Boards are planned in parallel over the connection's session.
+
+    The spec is a dictionary (or a JSON file holding one):
+
+        {
+            "boards": [12, 13, {"id": 14, "name": "Platform {number}"}],
+            "name": "Sprint {number}",   # also {board}, {start}, {end}
+            "first_number": 1,
+            "start": "2024-04-01",
+            "cadence_days": 14,
+            "count": 6,
+            "start_current": true,      # start the sprint covering today
+            "close_ended": true         # close active sprints that have ended
+        }
 
-        # Delete each sprint
-        for sprint in sprints:
-            sprint.delete()
-            logging.info(f"Sprint deleted successfully. ID: {sprint.id}")
+    :param jira: JIRA object
+    :param spec: Planning spec, or the path of a JSON file holding it
+    :param workers: Most boards planned at the same time
+    :param now: Current time (default: now)
+    :return: Dictionary of board ID to the result of plan_board_sprints, or None
+    """
+    try:
+        if not isinstance(spec, dict):
+            with open(spec, "r") as file:
+                spec = json.load(file)
+        boards = spec["boards"]
+        if not boards:
+            raise ValueError("no boards")
+    except (OSError, ValueError, LookupError, TypeError) as e:
+        logging.error(f"Invalid sprint planning spec: {e}")
+        return None
+    # Every board's overrides are checked before any board is touched
+    for board in boards:
+        try:
+            planned_sprints(spec, board)
+        except (ValueError, LookupError, TypeError) as e:
+            logging.error(f"Invalid sprint planning spec for board {board}: {e!r}")
+            return None
+    now = now or datetime.now(timezone.utc)
 
-        logging.info("All sprints have been deleted.")
-        return True
-    except JIRAError as e:
-        logging.error(f"Error deleting sprints: {e}")
-        return False
+    def plan_board(board):
+        try:
+            return plan_board_sprints(jira, spec, board, now)
+        except JIRAError as e:
+            logging.error(f"Error planning sprints for board {board}: {e}")
+            return {"failed": [str(e)]}
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(plan_board, boards)
+        return {
+            board["id"] if isinstance(board, dict) else board: result
+            for board, result in zip(boards, results)
+        }
 
 
-def create_board(jira_url, api_token, user_email, project_key, project_lead):
+def create_board(jira_url, api_token, user_email, project_key, project_lead, jira=None):
     create_board_api_url = f"{jira_url}/rest/agile/1.0/board"
 
     headers = {
@@ -680,7 +3985,14 @@ def create_board(jira_url, api_token, user_email, project_key, project_lead):
         }
     )
 
-    response = requests.post(create_board_api_url, data=payload, headers=headers)
+    if jira is not None:
+        # The connection's session is already authenticated
+        del headers["Authorization"]
+        response = _agile_post(jira, create_board_api_url, data=payload, headers=headers)
+    else:
+        started = time.perf_counter()
+        response = requests.post(create_board_api_url, data=payload, headers=headers)
+        _record_raw_response("POST", response, started)
 
     if response.status_code == 201:
         board_data = response.json()
@@ -709,15 +4021,549 @@ def get_board_id(jira, board_name):
         return None
 
 
-def my_stories(jira, project_key, user):
+# Issues per bulk create (Jira's limit) and per epic or sprint move
+CLONE_BATCH_SIZE = 50
+
+# Bulk creates and moves in flight at once while cloning
+CLONE_WORKERS = 4
+
+# Source issue fields a clone copies or needs for its links
+CLONE_FIELDS = (
+    "summary",
+    "description",
+    "issuetype",
+    "labels",
+    "parent",
+    STORY_POINTS_FIELD,
+    EPIC_LINK_FIELD,
+    SPRINT_FIELD,
+)
+
+
+class CloneJournal(BulkJournal):
+    """
+    BulkJournal of a project clone. The planned items are the clone's
+    stages; "mapped" entries record the source to target key of every issue
+    (and "sprint:<id>" of every sprint) as it is created, so a resumed clone
+    creates nothing twice.
+    """
+
+    def __init__(self, path, resume=False):
+        self.key_map = {}
+        super().__init__(path, resume)
+
+    def _load(self):
+        super()._load()
+        if self.planned is None:
+            return
+        with open(self.path) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if entry.get("event") == "planned":
+                    self.key_map = {}
+                elif entry.get("event") == "mapped":
+                    self.key_map.update(entry["items"])
+
+    def map(self, pairs):
+        self.key_map.update(pairs)
+        self._write({"event": "mapped", "items": pairs})
+
+
+def _agile_url(jira, path):
+    return jira._get_url(path, base=jira.AGILE_BASE_URL)
+
+
+def _project_board(jira, project_key):
+    # First scrum board of a project, or None; kanban boards have no sprints
+    response = jira._session.get(
+        _agile_url(jira, "board"),
+        params={"projectKeyOrId": project_key, "type": "scrum", "maxResults": 1},
+    )
+    boards = response.json().get("values", ())
+    return boards[0]["id"] if boards else None
+
+
+def _clone_target_project(jira, source_key, target_key, target_name):
     try:
-        jql_query = (
-            f"project = {project_key} AND assignee = {user} AND issuetype = Task"
-        )
-        issues = jira.search_issues(jql_query)
-        stories = [
-            {"key": issue.key, "summary": issue.fields.summary} for issue in issues
+        return jira._session.get(jira._get_url(f"project/{target_key}")).json()
+    except JIRAError as e:
+        if e.status_code != 404:
+            raise
+    source = jira._session.get(jira._get_url(f"project/{source_key}")).json()
+    payload = {
+        "key": target_key,
+        "name": target_name or f"{source.get('name', source_key)} (copy)",
+        "projectTypeKey": source.get("projectTypeKey", "software"),
+    }
+    lead = (source.get("lead") or {}).get("accountId")
+    if lead:
+        payload["leadAccountId"] = lead
+    created = jira._session.post(jira._get_url("project"), data=json.dumps(payload)).json()
+    logging.info(f"Project '{payload['name']}' created with key '{target_key}'.")
+    return created
+
+
+def _clone_issue_fields(raw, target_key, key_map):
+    fields = raw.get("fields") or {}
+    copied = {
+        "project": {"key": target_key},
+        "summary": fields.get("summary") or "",
+        "issuetype": {"name": _field_name(fields.get("issuetype")) or "Task"},
+    }
+    if fields.get("description"):
+        copied["description"] = fields["description"]
+    if fields.get("labels"):
+        copied["labels"] = fields["labels"]
+    if fields.get(STORY_POINTS_FIELD) is not None:
+        copied[STORY_POINTS_FIELD] = fields[STORY_POINTS_FIELD]
+    parent = (fields.get("parent") or {}).get("key")
+    if parent:
+        copied["parent"] = {"key": key_map[parent]}
+    return copied
+
+
+def _bulk_create(jira, raw_issues, target_key, key_map):
+    # One issue/bulk request; returns {source key: target key} of the issues created
+    response = jira._session.post(
+        jira._get_url("issue/bulk"),
+        data=json.dumps(
+            {
+                "issueUpdates": [
+                    {"fields": _clone_issue_fields(raw, target_key, key_map)}
+                    for raw in raw_issues
+                ]
+            }
+        ),
+    )
+    result = response.json()
+    failed = {error.get("failedElementNumber") for error in result.get("errors", ())}
+    for error in result.get("errors", ()):
+        raw = raw_issues[error.get("failedElementNumber", 0)]
+        logging.error(f"Error cloning issue {raw['key']}: {error.get('elementErrors')}")
+    sources = [raw["key"] for index, raw in enumerate(raw_issues) if index not in failed]
+    return dict(zip(sources, (issue["key"] for issue in result.get("issues", ()))))
+
+
+def _clone_issues(jira, source_key, target_key, journal, workers):
+    # Stream the source and bulk create what is not mapped yet; returns the
+    # source epic and sprints of every source issue for the link stages
+    links = {}
+    # Sub-tasks need their parent's target key, so they go after everything else
+    subtasks = []
+    pending = deque()
+    errors = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+
+        def collect():
+            # Record every batch that made it, even after another one failed
+            try:
+                journal.map(pending.popleft().result())
+            except Exception as e:
+                errors.append(e)
+
+        def submit(batch):
+            pending.append(
+                executor.submit(_bulk_create, jira, batch, target_key, dict(journal.key_map))
+            )
+            # Bounded read-ahead: wait for the oldest create before reading further
+            while len(pending) > workers:
+                collect()
+
+        batch = []
+        for raw in _search_issue_json(
+            jira, f"project = {source_key} ORDER BY key ASC", CLONE_FIELDS
+        ):
+            fields = raw.get("fields") or {}
+            links[raw["key"]] = (
+                fields.get(EPIC_LINK_FIELD),
+                _sprint_ids(fields.get(SPRINT_FIELD)),
+            )
+            if raw["key"] in journal.key_map:
+                continue
+            if fields.get("parent"):
+                subtasks.append(raw)
+                continue
+            batch.append(raw)
+            if len(batch) == CLONE_BATCH_SIZE:
+                submit(batch)
+                batch = []
+                if errors:
+                    break
+        else:
+            if batch:
+                submit(batch)
+        while pending:
+            collect()
+        if errors:
+            raise errors[0]
+        orphans = [raw for raw in subtasks if raw["fields"]["parent"]["key"] not in journal.key_map]
+        for raw in orphans:
+            logging.error(f"Not cloning sub-task {raw['key']}: its parent was not cloned.")
+        subtasks = [raw for raw in subtasks if raw not in orphans]
+        for i in range(0, len(subtasks), CLONE_BATCH_SIZE):
+            submit(subtasks[i : i + CLONE_BATCH_SIZE])
+        while pending:
+            collect()
+        if errors:
+            raise errors[0]
+    return links
+
+
+def _clone_sprints(jira, source_key, target_key, journal):
+    source_board = _project_board(jira, source_key)
+    if source_board is None:
+        return
+    sprints = [sprint.raw for sprint in jira.sprints(source_board, maxResults=False)]
+    if not sprints:
+        return
+    target_board = _project_board(jira, target_key) or create_board(
+        jira.server_url, None, None, target_key, None, jira=jira
+    )
+    if target_board is None:
+        logging.error(f"Could not create a board for {target_key}; its sprints were not cloned.")
+        return
+    for sprint in sprints:
+        if f"sprint:{sprint['id']}" in journal.key_map:
+            continue
+        payload = {"name": sprint["name"], "originBoardId": target_board}
+        for name in ("startDate", "endDate", "goal"):
+            if sprint.get(name):
+                payload[name] = sprint[name]
+        created = jira._session.post(_agile_url(jira, "sprint"), json=payload).json()
+        journal.map({f"sprint:{sprint['id']}": str(created["id"])})
+
+
+def _clone_links(jira, links, key_map, workers):
+    # Epic and sprint membership of the copies, one move per CLONE_BATCH_SIZE issues
+    moves = {}
+    for source, (epic, sprint_ids) in links.items():
+        target = key_map.get(source)
+        if target is None:
+            continue
+        if epic in key_map:
+            moves.setdefault(("epic", key_map[epic]), []).append(target)
+        # An issue can only be in one open sprint: the latest one
+        if sprint_ids and f"sprint:{sprint_ids[-1]}" in key_map:
+            moves.setdefault(("sprint", key_map[f"sprint:{sprint_ids[-1]}"]), []).append(target)
+
+    def move(kind, target, batch):
+        if kind == "epic":
+            jira._session.post(
+                _agile_url(jira, f"epic/{target}/issue"), data=json.dumps({"issues": batch})
+            )
+        else:
+            jira.add_issues_to_sprint(int(target), batch)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(move, kind, target, keys[i : i + CLONE_BATCH_SIZE])
+            for (kind, target), keys in moves.items()
+            for i in range(0, len(keys), CLONE_BATCH_SIZE)
         ]
+        for future in futures:
+            future.result()
+
+
+def clone_project(
+    jira, source_key, target_key, target_name=None, journal=None, workers=CLONE_WORKERS
+):
+    """
+    Copy a project's issues, epics and sprints into a new or existing project.
+
+    The source is read in streaming search pages and written with bulk
+    creates of CLONE_BATCH_SIZE issues, CLONE_WORKERS at a time; sprints are
+    recreated on the target's board, then epic and sprint membership is set
+    with concurrent batched moves. With a journal the source to target key
+    map is recorded as issues are created, and a resumed clone carries on
+    where it stopped.
+
+    :param jira: JIRA connection
+    :param source_key: Project to copy
+    :param target_key: Key of the copy (created if it does not exist)
+    :param target_name: Name of the copy when it has to be created
+    :param journal: CloneJournal (optional)
+    :param workers: Requests in flight at once
+    :return: Dictionary of source issue key to target issue key, or None on error
+    """
+    # Without a journal the key map is only kept in memory
+    journal = journal or CloneJournal(os.devnull)
+    stages = _journaled_items(journal, lambda: ["project", "issues", "sprints", "links"])
+    try:
+        if "project" in stages:
+            _clone_target_project(jira, source_key, target_key, target_name)
+            journal.complete(["project"])
+        # The link stage needs every source issue's epic and sprints, so the source is always read
+        links = _clone_issues(jira, source_key, target_key, journal, workers)
+        journal.complete(["issues"])
+        if "sprints" in stages:
+            _clone_sprints(jira, source_key, target_key, journal)
+            journal.complete(["sprints"])
+        if "links" in stages:
+            _clone_links(jira, links, journal.key_map, workers)
+            journal.complete(["links"])
+        journal.finish()
+        issue_map = {
+            source: target
+            for source, target in journal.key_map.items()
+            if not source.startswith("sprint:")
+        }
+        logging.info(f"Cloned {len(issue_map)} issues of {source_key} into {target_key}.")
+        return issue_map
+    except Exception as e:
+        logging.error(f"Error cloning project {source_key} into {target_key}: {e}")
+        return None
+    finally:
+        journal.close()
+
+
+# Compressed NDJSON file suffix per backup compression
+BACKUP_COMPRESSIONS = {"gzip": ".ndjson.gz", "zstd": ".ndjson.zst"}
+
+# Issues fetched ahead of the writer while a backup compresses the ones before
+BACKUP_PREFETCH = 2 * SEARCH_PAGE_SIZE
+
+# Entities a backup writes, one file each
+BACKUP_ENTITIES = ("projects", "epics", "issues", "comments", "sprints")
+
+
+class _HashingFile:
+    # Output file that keeps the size and SHA-256 of the bytes written to it
+
+    def __init__(self, file):
+        self.file = file
+        self.size = 0
+        self.sha256 = hashlib.sha256()
+
+    def write(self, data):
+        self.size += len(data)
+        self.sha256.update(data)
+        return self.file.write(data)
+
+    def flush(self):
+        self.file.flush()
+
+
+class NdjsonWriter:
+    """
+    Write JSON objects, one per line, to a gzip or zstd compressed file.
+
+    Keeps the number of objects and the size and SHA-256 of the compressed
+    file. The file appears under its name only once closed.
+    """
+
+    def __init__(self, path, compression="gzip"):
+        self.path = path
+        self.count = 0
+        self._temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        self._file = open(self._temp_path, "wb")
+        self._output = _HashingFile(self._file)
+        if compression == "gzip":
+            # mtime=0 keeps the output of the same data byte-identical
+            self._stream = gzip.GzipFile(fileobj=self._output, mode="wb", mtime=0)
+        elif compression == "zstd":
+            if zstandard is None:
+                self._file.close()
+                os.remove(self._temp_path)
+                raise ValueError("zstd compression needs the zstandard package")
+            self._stream = zstandard.ZstdCompressor().stream_writer(
+                self._output, closefd=False
+            )
+        else:
+            self._file.close()
+            os.remove(self._temp_path)
+            raise ValueError(f"Unknown compression: {compression}")
+
+    def write(self, value):
+        self._stream.write(json.dumps(value, separators=(",", ":")).encode("utf-8") + b"\n")
+        self.count += 1
+
+    def close(self):
+        self._stream.close()
+        self._file.close()
+        os.replace(self._temp_path, self.path)
+        return {
+            "file": os.path.basename(self.path),
+            "count": self.count,
+            "bytes": self._output.size,
+            "sha256": self._output.sha256.hexdigest(),
+        }
+
+    def abort(self):
+        with contextlib.suppress(Exception):
+            self._stream.close()
+        self._file.close()
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(self._temp_path)
+
+
+def _prefetched(items, depth):
+    # Iterate items in a background thread, at most `depth` ahead of the consumer
+    buffer = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    finished = object()
+    context = contextvars.copy_context()
+    context.run(_profiled_function.set, _calling_function())
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in items:
+                if not put(item):
+                    return
+            put(finished)
+        except Exception as e:
+            put(e)
+
+    thread = threading.Thread(target=context.run, args=(produce,), daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is finished:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+
+
+def _issue_comments(jira, raw):
+    # Every comment of an issue; a search embeds only the first page
+    comment = (raw.get("fields") or {}).pop("comment", None) or {}
+    comments = list(comment.get("comments", ()))
+    while len(comments) < comment.get("total", 0):
+        page = jira._session.get(
+            jira._get_url(f"issue/{raw['key']}/comment"),
+            params={"startAt": len(comments), "maxResults": 100},
+        ).json()
+        if not page.get("comments"):
+            break
+        comments.extend(page["comments"])
+    return comments
+
+
+def backup_instance(
+    jira, directory, project_keys=None, compression="gzip", prefetch=BACKUP_PREFETCH
+):
+    """
+    Back up projects, epics, issues, comments and sprints to compressed
+    NDJSON files, one per entity, plus a manifest.json with the count, size
+    and SHA-256 of each file.
+
+    Issues are parsed from the search response stream and written one at a
+    time while a background thread already fetches the next page, so memory
+    stays flat whatever the size of the projects.
+
+    :param jira: JIRA connection
+    :param directory: Output directory (created if missing)
+    :param project_keys: Projects to back up (default: all)
+    :param compression: "gzip" or "zstd" (needs the zstandard package)
+    :param prefetch: Issues fetched ahead of the writer
+    :return: The manifest, or None on error
+    """
+    writers = {}
+    try:
+        os.makedirs(directory, exist_ok=True)
+        suffix = BACKUP_COMPRESSIONS.get(compression, "")
+        for entity in BACKUP_ENTITIES:
+            writers[entity] = NdjsonWriter(
+                os.path.join(directory, entity + suffix), compression
+            )
+        projects = jira._session.get(jira._get_url("project")).json()
+        if project_keys:
+            projects = [project for project in projects if project["key"] in project_keys]
+        sprint_ids = set()
+        for project in projects:
+            writers["projects"].write(project)
+            for raw in _prefetched(
+                _search_issue_json(
+                    jira, f"project = {project['key']} ORDER BY key ASC", ("*all",)
+                ),
+                prefetch,
+            ):
+                for comment in _issue_comments(jira, raw):
+                    writers["comments"].write(dict(comment, issueKey=raw["key"]))
+                issue_type = _field_name((raw.get("fields") or {}).get("issuetype"))
+                writers["epics" if issue_type == "Epic" else "issues"].write(raw)
+            # Kanban boards have no sprints; Jira answers 400 for them
+            for board in jira.boards(
+                maxResults=False, type="scrum", projectKeyOrID=project["key"]
+            ):
+                for sprint in jira.sprints(board.id, maxResults=False):
+                    # Boards of one project can share sprints
+                    if sprint.id not in sprint_ids:
+                        sprint_ids.add(sprint.id)
+                        writers["sprints"].write(sprint.raw)
+        manifest = {
+            "created": datetime.now(timezone.utc).isoformat(),
+            "server": jira.server_url,
+            "compression": compression,
+            "projects": [project["key"] for project in projects],
+            "files": {entity: writers.pop(entity).close() for entity in BACKUP_ENTITIES},
+        }
+        temp_path = os.path.join(
+            directory, f"manifest.json.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        with open(temp_path, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(temp_path, os.path.join(directory, "manifest.json"))
+        logging.info(
+            "Backup written to "
+            f"{directory}: "
+            + ", ".join(f"{entry['count']} {entity}" for entity, entry in manifest["files"].items())
+        )
+        return manifest
+    except Exception as e:
+        logging.error(f"Error backing up to {directory}: {e}")
+        return None
+    finally:
+        for writer in writers.values():
+            writer.abort()
+
+
+def verify_backup(directory):
+    """
+    Check the files of a backup against its manifest.
+
+    :param directory: Backup directory
+    :return: List of the files whose size or SHA-256 do not match (empty if all do)
+    """
+    with open(os.path.join(directory, "manifest.json")) as f:
+        manifest = json.load(f)
+    damaged = []
+    for entry in manifest["files"].values():
+        sha256 = hashlib.sha256()
+        size = 0
+        try:
+            with open(os.path.join(directory, entry["file"]), "rb") as f:
+                for chunk in iter(lambda: f.read(SEARCH_CHUNK_SIZE), b""):
+                    sha256.update(chunk)
+                    size += len(chunk)
+        except OSError:
+            damaged.append(entry["file"])
+            continue
+        if size != entry["bytes"] or sha256.hexdigest() != entry["sha256"]:
+            damaged.append(entry["file"])
+    return damaged
+
+
+def my_stories(jira, project_key, user):
+    try:
+        jql_query = _my_stories_jql(project_key, user)
+        stories = list(_issue_records(jira, jql_query, ("summary",)))
         return stories
     except Exception as e:
         logging.error(f"Error retrieving stories for user: {e}")
@@ -784,37 +4630,16 @@ def render_tui(issues, fetching_data=False):
             inp = term.inkey()
 
 
-def read_story_details_tui(jira, story_key):
+def read_story_details_tui(jira, story_key, story=None):
     try:
         term = blessed.Terminal()
-        story = jira.issue(story_key)
+        if story is None:
+            story = _get_issue(jira, story_key, ",".join(DETAIL_FIELDS), DETAIL_EXPAND)
 
         headers = ["Field", "Value"]
 
-        data = [
-            ("Key", story.key),
-            ("Summary", story.fields.summary),
-            ("Description", story.fields.description),
-            ("Status", story.fields.status.name),
-            (
-                "Assignee",
-                (
-                    story.fields.assignee.displayName
-                    if story.fields.assignee
-                    else "Unassigned"
-                ),
-            ),
-            (
-                "Reporter",
-                (
-                    story.fields.reporter.displayName
-                    if story.fields.reporter
-                    else "Unassigned"
-                ),
-            ),
-            ("Created", story.fields.created),
-            ("Updated", story.fields.updated),
-        ]
+        # One line per row, so multi-line descriptions and comments keep the table intact
+        data = [(label, " ".join(str(value).split())) for label, value in _detail_rows(story)]
 
         max_lengths = [len(header) for header in headers]
         for row in data:
@@ -845,12 +4670,14 @@ def read_story_details_tui(jira, story_key):
 def list_epics_tui(jira, project_key):
     try:
         term = blessed.Terminal()
-        jql_query = f"project = {project_key} AND issuetype = Epic"
-        epics = jira.search_issues(jql_query)
+        jql_query = _epics_jql(project_key)
+        epics = list(
+            _project_issue_records(jira, project_key, jql_query, ("summary",), ("Epic",))
+        )
 
         headers = ["Epic Key", "Summary"]
 
-        data = [(epic.key, epic.fields.summary) for epic in epics]
+        data = [(epic.key, epic.summary) for epic in epics]
 
         max_lengths = [len(header) for header in headers]
         for row in data:
@@ -874,6 +4701,7 @@ def list_epics_tui(jira, project_key):
         for row in data:
             print_row(row)
             print_boundary()
+        return epics
     except JIRAError as e:
         logging.error(f"Error listing epics: {e}")
 
@@ -927,28 +4755,24 @@ def list_projects_tui(jira):
 def read_epic_details_tui(jira, epic_key):
     try:
         term = blessed.Terminal()
-        epic = jira.issue(epic_key)
+        epic = _get_issue(jira, epic_key)
 
         epic_headers = ["Field", "Value"]
         story_headers = ["Issue Type", "Issue Key", "Status", "Assignee", "Summary"]
 
         epic_data = [("Epic Key", epic.key), ("Summary", epic.fields.summary)]
 
-        stories = jira.search_issues(f"'Epic Link' = {epic_key}")
+        stories = list(search_issue_records(jira, f"'Epic Link' = {epic_key}"))
         story_data = []
         if stories:
             for story in stories:
                 story_data.append(
                     (
-                        story.fields.issuetype.name,
+                        story.issue_type,
                         story.key,
-                        story.fields.status.name,
-                        (
-                            story.fields.assignee.displayName
-                            if story.fields.assignee
-                            else "Unassigned"
-                        ),
-                        story.fields.summary,
+                        story.status,
+                        story.assignee or "Unassigned",
+                        story.summary,
                     )
                 )
         else:
@@ -1033,6 +4857,135 @@ def get_sprints_for_board_tui(jira, board_id):
         logging.error(f"Error retrieving sprints for board: {e}")
 
 
+def cycle_time_report_tui(jira, project_key, days=182, cache=None):
+    try:
+        term = blessed.Terminal()
+        report = cycle_time_report(jira, project_key, int(days), cache)
+        if report is None:
+            return None
+
+        headers = ["Measure", "Issues", "Mean (days)", "Median (days)", "85th pct (days)"]
+
+        def days_text(value):
+            return "-" if value is None else f"{value:.1f}"
+
+        data = [
+            (
+                label,
+                report[measure]["issues"],
+                *(days_text(report[measure][name]) for name in ("mean", "median", "p85")),
+            )
+            for label, measure in (("Cycle time", "cycle_time"), ("Lead time", "lead_time"))
+        ]
+
+        max_lengths = [len(header) for header in headers]
+        for row in data:
+            for i, value in enumerate(row):
+                max_lengths[i] = max(max_lengths[i], len(str(value)))
+
+        def print_row(row):
+            formatted_row = []
+            for i, field in enumerate(row):
+                formatted_row.append(f"{field:<{max_lengths[i]}}")
+            print(f"| {' | '.join(formatted_row)} |")
+
+        def print_boundary():
+            boundary = "+-" + "-+-".join("-" * length for length in max_lengths) + "-+"
+            print(term.green(boundary))
+
+        print(term.bold(f"Cycle Time for {project_key}, last {days} days:"))
+        print_boundary()
+        print_row(headers)
+        print_boundary()
+        for row in data:
+            print_row(row)
+            print_boundary()
+        return report
+    except Exception as e:
+        logging.error(f"Error generating cycle time report: {e}")
+
+
+def sprint_burndown_tui(jira, sprint_id, cache=None):
+    try:
+        term = blessed.Terminal()
+        points = sprint_burndown(jira, sprint_id, cache)
+        if points is None:
+            return None
+        scale = max((remaining for _, remaining in points), default=0) or 1
+        print(term.bold(f"Burndown of Sprint {sprint_id}:"))
+        for day, remaining in points:
+            bar = "#" * round(40 * remaining / scale)
+            print(f"{day}  {remaining:>6}  {term.green(bar)}")
+        return points
+    except Exception as e:
+        logging.error(f"Error generating burndown: {e}")
+
+
+def get_backlog_tui(jira, board_id, jql=None):
+    try:
+        term = blessed.Terminal()
+        # Streamed: rows are printed as pages arrive, so widths are fixed instead of measured
+        print(term.bold(f"Backlog of Board {board_id}:"))
+        print(term.green(f"{'Rank':>6}  {'Issue Key':<12} {'Status':<14} Summary"))
+        count = 0
+        for count, issue in enumerate(
+            board_issue_records(
+                jira, board_id, backlog=True, fields=("status", "summary"), jql=jql
+            ),
+            1,
+        ):
+            print(f"{count:>6}  {issue.key:<12} {issue.status or '':<14} {issue.summary}")
+        print(term.green(f"{count} issues"))
+        return count
+    except Exception as e:
+        logging.error(f"Error retrieving backlog for board: {e}")
+
+
+def plan_sprints_tui(jira, spec):
+    try:
+        term = blessed.Terminal()
+        results = plan_sprints(jira, spec)
+        if results is None:
+            return None
+
+        actions = ("created", "renamed", "started", "closed", "existing", "failed")
+        headers = ["Board", *(action.capitalize() for action in actions)]
+
+        data = [
+            (board_id, *(len(result.get(action, ())) for action in actions))
+            for board_id, result in results.items()
+        ]
+
+        max_lengths = [len(header) for header in headers]
+        for row in data:
+            for i, value in enumerate(row):
+                max_lengths[i] = max(max_lengths[i], len(str(value)))
+
+        def print_row(row):
+            formatted_row = []
+            for i, field in enumerate(row):
+                formatted_row.append(f"{field:<{max_lengths[i]}}")
+            print(f"| {' | '.join(formatted_row)} |")
+
+        def print_boundary():
+            boundary = "+-" + "-+-".join("-" * length for length in max_lengths) + "-+"
+            print(term.green(boundary))
+
+        print(term.bold("Sprint Plan:"))
+        print_boundary()
+        print_row(headers)
+        print_boundary()
+        for row in data:
+            print_row(row)
+            print_boundary()
+        for board_id, result in results.items():
+            for name in result.get("failed", ()):
+                logging.error(f"Board {board_id}: {name} failed")
+        return results
+    except Exception as e:
+        logging.error(f"Error planning sprints: {e}")
+
+
 def sprint_report_tui(jira, sprint_id, project_key):
     try:
         term = blessed.Terminal()
@@ -1049,14 +5002,12 @@ def sprint_report_tui(jira, sprint_id, project_key):
         print(f"Start Date: {sprint_info.startDate}")
         print(f"End Date: {sprint_info.endDate}")
 
-        jql_query = (
-            f"project = {project_key} AND issuetype = Story AND Sprint = {sprint_id}"
-        )
-        issues = jira.search_issues(jql_query)
+        jql_query = _sprint_report_jql(sprint_id, project_key)
+        issues = _issue_records(jira, jql_query, ("status",))
 
         status_counts = {"To Do": 0, "In Progress": 0, "Done": 0}
         for issue in issues:
-            status = issue.fields.status.name
+            status = issue.status
             if status in status_counts:
                 status_counts[status] += 1
 
@@ -1069,13 +5020,19 @@ def sprint_report_tui(jira, sprint_id, project_key):
 
 
 def move_issues_to_sprint_tui(
-    jira, project_key, start_issue_key, end_issue_key, target_sprint_id
+    jira, project_key, start_issue_key, end_issue_key, target_sprint_id, journal=None
 ):
     try:
         term = blessed.Terminal()
 
-        start_issue_number = int(start_issue_key.split("-")[1])
-        end_issue_number = int(end_issue_key.split("-")[1])
+        requested_keys = issue_keys_in_range(
+            project_key, start_issue_key, end_issue_key
+        )
+        resumed = journal is not None and journal.planned is not None
+        issue_keys = _journaled_items(
+            journal, _range_move_plan(jira, project_key, start_issue_key, end_issue_key)
+        )
+        failed = False
 
         headers = ["Issue Key", "Status", "Info"]
 
@@ -1084,25 +5041,37 @@ def move_issues_to_sprint_tui(
         print_row(headers)
         print_boundary()
 
-        for i in range(start_issue_number, end_issue_number + 1):
-            issue_key = f"{project_key}-{i}"
+        for i in range(0, len(issue_keys), SPRINT_MOVE_BATCH):
+            batch = issue_keys[i : i + SPRINT_MOVE_BATCH]
             try:
-                issue = jira.issue(issue_key)
-                jira.add_issues_to_sprint(target_sprint_id, [issue.key])
-                print_row(
-                    [
-                        issue.key,
-                        "Moved",
-                        f"Issue {issue_key} moved to Sprint {target_sprint_id}",
-                    ]
-                )
-                print_boundary()
+                jira.add_issues_to_sprint(target_sprint_id, batch)
+                if journal is not None:
+                    journal.complete(batch)
+                for issue_key in batch:
+                    print_row(
+                        [
+                            issue_key,
+                            "Moved",
+                            f"Issue {issue_key} moved to Sprint {target_sprint_id}",
+                        ]
+                    )
+                    print_boundary()
             except Exception as e:
-                print_row([issue_key, f"Error: {e}", ""])
-                print_boundary()
-                logging.error(f"Error moving issue {issue_key} to Sprint: {e}")
+                failed = True
+                for issue_key in batch:
+                    print_row([issue_key, f"Error: {e}", ""])
+                    print_boundary()
+                    logging.error(f"Error moving issue {issue_key} to Sprint: {e}")
+        skipped = len(requested_keys) - len(issue_keys)
+        if skipped > 0 and not resumed:
+            print(f"{skipped} keys in the range do not exist and were skipped.")
+        if journal is not None and not failed:
+            journal.finish()
     except JIRAError as e:
         logging.error(f"Error reading story: {e}")
+    finally:
+        if journal is not None:
+            journal.close()
 
 
 def print_row(row):
@@ -1128,15 +5097,10 @@ def get_stories_in_sprint_tui(jira, sprint_id):
         term = blessed.Terminal()
 
         # Construct JQL to search for issues in the given sprint
-        jql = f"sprint = {sprint_id} AND issuetype = Task"
+        jql = _sprint_stories_jql(sprint_id)
 
         # Search for issues using the constructed JQL
-        issues = jira.search_issues(jql)
-
-        # Extract issue keys and summaries from the search result
-        story_info = [
-            {"key": issue.key, "summary": issue.fields.summary} for issue in issues
-        ]
+        story_info = list(_issue_records(jira, jql, ("summary",)))
 
         print(term.bold(f"Stories in Sprint {sprint_id}:"))
         print_boundary()
@@ -1144,12 +5108,12 @@ def get_stories_in_sprint_tui(jira, sprint_id):
         print_boundary()
 
         for story in story_info:
-            print_row([story["key"], story["summary"]])
+            print_row([story.key, story.summary])
 
         print_boundary()
         logging.info(f"Retrieved {len(story_info)} stories in sprint {sprint_id}")
 
-        return story_info  # Return list of dictionaries
+        return story_info  # Return list of IssueRecords
     except JIRAError as e:
         logging.error(f"Error retrieving stories in sprint: {e}")
         return None
@@ -1185,17 +5149,15 @@ def sprint_report_tui(jira, sprint_id, project_key):
         print_boundary(term)
 
         # Define the JQL query to search for issues of type 'Story' in the sprint
-        jql_query = (
-            f"project = {project_key} AND issuetype = Story AND Sprint = {sprint_id}"
-        )
+        jql_query = _sprint_report_jql(sprint_id, project_key)
 
         # Search for issues using the JQL query
-        issues = jira.search_issues(jql_query)
+        issues = _issue_records(jira, jql_query, ("status",))
 
         # Count issue statuses
         status_counts = {"To Do": 0, "In Progress": 0, "Done": 0}
         for issue in issues:
-            status = issue.fields.status.name
+            status = issue.status
             if status in status_counts:
                 status_counts[status] += 1
 
@@ -1225,12 +5187,10 @@ def my_stories_tui(jira, project_key, user):
         term = blessed.Terminal()
 
         # Construct JQL query to retrieve stories for the user
-        jql_query = (
-            f"project = '{project_key}' AND assignee = '{user}' AND issuetype = Task"
-        )
+        jql_query = _my_stories_jql(project_key, user)
 
         # Search for issues using the JQL query
-        issues = jira.search_issues(jql_query)
+        issues = list(_issue_records(jira, jql_query, ("summary",)))
 
         # Check if any issues are found
         if not issues:
@@ -1241,11 +5201,11 @@ def my_stories_tui(jira, project_key, user):
         print(term.bold(f"Stories assigned to  {user}:"))
         print_boundary(term)
         for issue in issues:
-            print_row(term, [issue.key, issue.fields.summary])
+            print_row(term, [issue.key, issue.summary])
         print_boundary(term)
 
         # Return the list of user stories
-        return [{"key": issue.key, "summary": issue.fields.summary} for issue in issues]
+        return issues
 
     except Exception as e:
         logging.error(f"Error retrieving stories for user: {e}")
@@ -1262,29 +5222,107 @@ def print_boundary(term):
     print(term.green(boundary))
 
 
-def get_members(jira, project_key):
+def get_members(jira, project_key):
+    try:
+        # Construct JQL query to search for issues in the project
+        jql_query = _members_jql(project_key)
+
+        # Search for issues in the project
+        issues = _project_issue_records(
+            jira, project_key, jql_query, ("assignee",), workers=SEARCH_WORKERS
+        )
+
+        # Extract unique user names from the issues' assignees
+        user_names = set(issue.assignee for issue in issues if issue.assignee)
+
+        # Log the user names
+        logging.info(f"Users in project {project_key}: {', '.join(user_names)}")
+
+        return list(user_names)
+    except Exception as e:
+        # Log any exceptions that occur during the process
+        logging.error(f"Error fetching users for project {project_key}: {e}")
+        return None
+
+
+def workload_report_json(jira, json_path, project_key=None, sprint_id=None):
+    """
+    Write the workload of a project, a sprint or both as one JSON array with
+    an object per assignee and scope ("project" or "sprint" key).
+
+    :param json_path: Output file, "-" for stdout
+    :return: List of the rows written, or None on error
+    """
+    try:
+        reports = []
+        if project_key is not None:
+            reports.append(("project", project_key, workload_report(jira, project_key)))
+        if sprint_id is not None:
+            reports.append(("sprint", sprint_id, workload_report(jira, sprint_id=sprint_id)))
+        rows = []
+        for scope, value, report in reports:
+            if report is None:
+                return None
+            rows.extend(
+                {scope: value, "assignee": assignee, **row} for assignee, row in report.items()
+            )
+        if json_path == "-":
+            print(json.dumps(rows, indent=2))
+        else:
+            with open(json_path, "w") as file:
+                json.dump(rows, file, indent=2)
+        return rows
+    except Exception as e:
+        logging.error(f"Error writing workload report: {e}")
+
+
+def workload_report_tui(jira, project_key=None, sprint_id=None):
     try:
-        # Construct JQL query to search for issues in the project
-        jql_query = f'project="{project_key}"'
+        report = workload_report(jira, project_key, sprint_id)
+        if report is None:
+            return None
 
-        # Search for issues in the project
-        issues = jira.search_issues(jql_query, maxResults=False)
+        term = blessed.Terminal()
+        headers = ["Assignee", "Open", "In Progress", "Done", "Points", "Points Done"]
 
-        # Extract unique user names from the issues' assignees
-        user_names = set(
-            issue.fields.assignee.displayName
-            for issue in issues
-            if issue.fields.assignee
-        )
+        data = [
+            (
+                assignee or "Unassigned",
+                row["open"],
+                row["in_progress"],
+                row["done"],
+                f"{row['points']:g}",
+                f"{row['done_points']:g}",
+            )
+            for assignee, row in report.items()
+        ]
 
-        # Log the user names
-        logging.info(f"Users in project {project_key}: {', '.join(user_names)}")
+        max_lengths = [len(header) for header in headers]
+        for row in data:
+            for i, value in enumerate(row):
+                max_lengths[i] = max(max_lengths[i], len(str(value)))
 
-        return list(user_names)
+        def print_row(row):
+            formatted_row = []
+            for i, field in enumerate(row):
+                formatted_row.append(f"{field:<{max_lengths[i]}}")
+            print(f"| {' | '.join(formatted_row)} |")
+
+        def print_boundary():
+            boundary = "+-" + "-+-".join("-" * length for length in max_lengths) + "-+"
+            print(term.green(boundary))
+
+        scope = f"Sprint {sprint_id}" if sprint_id is not None else project_key
+        print(term.bold(f"Workload for {scope}:"))
+        print_boundary()
+        print_row(headers)
+        print_boundary()
+        for row in data:
+            print_row(row)
+            print_boundary()
+        return report
     except Exception as e:
-        # Log any exceptions that occur during the process
-        logging.error(f"Error fetching users for project {project_key}: {e}")
-        return None
+        logging.error(f"Error generating workload report: {e}")
 
 
 def get_members_tui(jira, project_key):
@@ -1292,17 +5330,15 @@ def get_members_tui(jira, project_key):
         term = blessed.Terminal()
 
         # Construct JQL query to search for issues in the project
-        jql_query = f'project="{project_key}"'
+        jql_query = _members_jql(project_key)
 
         # Search for issues in the project
-        issues = jira.search_issues(jql_query, maxResults=False)
+        issues = _project_issue_records(
+            jira, project_key, jql_query, ("assignee",), workers=SEARCH_WORKERS
+        )
 
         # Extract unique user names from the issues' assignees
-        user_names = set(
-            issue.fields.assignee.displayName
-            for issue in issues
-            if issue.fields.assignee
-        )
+        user_names = set(issue.assignee for issue in issues if issue.assignee)
 
         # Check if any users are found
         if not user_names:
@@ -1334,7 +5370,7 @@ def print_boundary(term):
 def assign_issue(jira, issue_key, assignee_username):
     try:
         # Retrieve the issue object
-        issue = jira.issue(issue_key)
+        issue = _get_issue(jira, issue_key)
         print(issue)
 
         issue.update(assignee={"name": assignee_username})
@@ -1351,6 +5387,505 @@ def assign_issue(jira, issue_key, assignee_username):
         )
 
 
+def search_issues_tui(index, terms, project_key=None):
+    try:
+        term = blessed.Terminal()
+        hits = index.search(terms, project_key)
+        if not hits:
+            print(f"No issues in the local index match '{terms}'.")
+            return hits
+        print(term.bold(f"Issues matching '{terms}':"))
+        _print_table(
+            term,
+            ["Issue Key", "Summary", "Match"],
+            [
+                (hit["key"], term.truncate(hit["summary"], 60), term.truncate(hit["snippet"], 60))
+                for hit in hits
+            ],
+        )
+        return hits
+    except sqlite3.Error as e:
+        logging.error(f"Error searching the local index: {e}")
+        return None
+
+
+# Largest webhook body the receiver accepts
+WEBHOOK_MAX_BODY = 10 * 1024 * 1024
+
+# Resource families of the response cache each webhook event family touches
+WEBHOOK_CACHE_FAMILIES = {
+    "jira:issue": CACHE_INVALIDATES["issue"],
+    "comment": CACHE_INVALIDATES["issue"],
+    "sprint": CACHE_INVALIDATES["sprint"],
+    "board": CACHE_INVALIDATES["board"],
+    "project": CACHE_INVALIDATES["project"],
+}
+
+
+class WebhookReceiver:
+    """
+    Small HTTP listener for Jira webhooks.
+
+    Issue created/updated events upsert the issue into an IssueStore and an
+    IssueSearchIndex and issue deleted events remove it; issue, sprint,
+    board and project events also drop the affected ResponseCache entries.
+    With ``secret`` set, only requests signed with it
+    (X-Hub-Signature: sha256=<hmac of the body>) are accepted.
+
+    receiver = WebhookReceiver(store, cache, port=8765).start()
+    """
+
+    def __init__(self, store=None, cache=None, host="127.0.0.1", port=0, secret=None, path="/webhook", index=None):
+        self.store = store
+        self.cache = cache
+        self.index = index
+        self.host = host
+        self.port = port
+        self.secret = secret
+        self.path = path
+        self.server = None
+        self.thread = None
+        self.events = 0
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}{self.path}"
+
+    def verify(self, body, signature):
+        if not self.secret:
+            return True
+        expected = hmac.new(self.secret.encode(), body, hashlib.sha256).hexdigest()
+        return hmac.compare_digest(f"sha256={expected}", signature or "")
+
+    def apply(self, payload):
+        """
+        Apply one webhook payload.
+
+        :param payload: Decoded webhook JSON
+        :return: True if the event was one the receiver handles
+        """
+        event = payload.get("webhookEvent", "")
+        family = event.rsplit("_", 1)[0] if event.startswith("jira:issue") else event.split("_")[0]
+        if family not in WEBHOOK_CACHE_FAMILIES:
+            return False
+        if self.cache is not None:
+            self.cache.invalidate(WEBHOOK_CACHE_FAMILIES[family])
+        issue = payload.get("issue") or {}
+        targets = [target for target in (self.store, self.index) if target is not None]
+        if targets and issue.get("key"):
+            if event == "jira:issue_deleted":
+                for target in targets:
+                    target.remove(issue["key"])
+            elif event in ("jira:issue_created", "jira:issue_updated"):
+                # A move to another project changes the key
+                for item in (payload.get("changelog") or {}).get("items", ()):
+                    if item.get("field") == "Key" and item.get("fromString"):
+                        for target in targets:
+                            target.remove(item["fromString"])
+                if self.store is not None:
+                    self.store.upsert(IssueRecord.from_json(issue))
+                if self.index is not None:
+                    self.index.add(issue)
+        self.events += 1
+        return True
+
+    def start(self):
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                if urlparse(self.path).path != receiver.path:
+                    return self._reply(404, {"error": "Not found"})
+                length = int(self.headers.get("Content-Length") or 0)
+                if length > WEBHOOK_MAX_BODY:
+                    return self._reply(413, {"error": "Payload too large"})
+                body = self.rfile.read(length)
+                if not receiver.verify(body, self.headers.get("X-Hub-Signature")):
+                    return self._reply(401, {"error": "Bad signature"})
+                try:
+                    payload = json.loads(body)
+                except ValueError:
+                    return self._reply(400, {"error": "Body is not JSON"})
+                try:
+                    applied = receiver.apply(payload)
+                except Exception as e:
+                    logging.error(f"Error applying webhook: {e}")
+                    return self._reply(500, {"error": str(e)})
+                self._reply(200, {"applied": applied})
+
+            def _reply(self, status, body):
+                content = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, format, *args):
+                logging.debug(f"Webhook {self.address_string()}: {format % args}")
+
+        self.server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.port = self.server.server_address[1]
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        logging.info(f"Listening for Jira webhooks on {self.url}")
+        return self
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+
+# Seconds between two polls of --watch when no interval is given
+WATCH_INTERVAL = 10
+
+
+class LiveTable:
+    """
+    Full-screen view that only rewrites the terminal lines that changed
+    since the previous frame.
+    """
+
+    def __init__(self, term):
+        self.term = term
+        self.lines = []
+
+    def draw(self, lines, status=""):
+        """
+        Draw a frame.
+
+        :param lines: Lines to show from the top of the screen
+        :param status: Text for the status bar on the last line
+        :return: Number of lines rewritten
+        """
+        term = self.term
+        rewritten = 0
+        for row, line in enumerate(lines):
+            if row >= len(self.lines) or self.lines[row] != line:
+                print(
+                    term.move_xy(0, row) + term.truncate(line, term.width) + term.clear_eol,
+                    end="",
+                )
+                rewritten += 1
+        for row in range(len(lines), len(self.lines)):
+            print(term.move_xy(0, row) + term.clear_eol, end="")
+            rewritten += 1
+        print(
+            term.move_xy(0, term.height - 1) + term.green(status) + term.clear_eol,
+            end="",
+            flush=True,
+        )
+        self.lines = list(lines)
+        return rewritten
+
+
+def _story_table_lines(term, store):
+    headers = ["Issue Type", "Issue Key", "Status", "Assignee", "Summary"]
+    rows = [[issue.get(header) or "" for header in headers] for issue in store]
+    return _table_lines(term, headers, rows)
+
+
+def _key_summary_lines(headers):
+    def lines(term, store):
+        return _table_lines(
+            term, headers, [[issue.key, issue.summary or ""] for issue in store]
+        )
+
+    return lines
+
+
+def _member_lines(term, store):
+    members = sorted({issue.assignee for issue in store if issue.assignee})
+    return _table_lines(term, ["Member"], [[member] for member in members])
+
+
+def _status_count_lines(term, store):
+    status_counts = {"To Do": 0, "In Progress": 0, "Done": 0}
+    for issue in store:
+        if issue.status in status_counts:
+            status_counts[issue.status] += 1
+    return _table_lines(
+        term, ["Status", "Count"], [[status, count] for status, count in status_counts.items()]
+    )
+
+
+def _watch_views(args):
+    # (title, JQL, fields, line builder) for each watchable command given
+    views = []
+    if args.get_stories:
+        views.append(
+            (
+                f"Stories in {args.get_stories}",
+                _stories_jql(args.get_stories),
+                ISSUE_RECORD_FIELDS,
+                _story_table_lines,
+            )
+        )
+    if args.list_epics:
+        views.append(
+            (
+                f"Epics in {args.list_epics}",
+                _epics_jql(args.list_epics),
+                ("summary",),
+                _key_summary_lines(["Epic Key", "Summary"]),
+            )
+        )
+    if args.get_members:
+        views.append(
+            (
+                f"Members in project {args.get_members}",
+                _members_jql(args.get_members),
+                ("assignee",),
+                _member_lines,
+            )
+        )
+    if args.get_stories_in_sprint:
+        sprint_id = args.get_stories_in_sprint[0]
+        views.append(
+            (
+                f"Stories in Sprint {sprint_id}",
+                _sprint_stories_jql(sprint_id),
+                ("summary",),
+                _key_summary_lines(["Issue Key", "Summary"]),
+            )
+        )
+    if args.my_stories:
+        project_key, user = args.my_stories
+        views.append(
+            (
+                f"Stories assigned to {user}",
+                _my_stories_jql(project_key, user),
+                ("summary",),
+                _key_summary_lines(["Issue Key", "Summary"]),
+            )
+        )
+    if args.sprint_report:
+        sprint_id, project_key = args.sprint_report
+        views.append(
+            (
+                f"Issue Status Distribution in Sprint {sprint_id}",
+                _sprint_report_jql(sprint_id, project_key),
+                ("status",),
+                _status_count_lines,
+            )
+        )
+    return views
+
+
+def watch_commands(jira, args, interval=WATCH_INTERVAL):
+    """
+    Show the listing and sprint report commands given on the command line
+    in a live full-screen view that refreshes every ``interval`` seconds.
+
+    Each tick asks Jira only for the issues updated since the previous one
+    and redraws only the rows that changed. Press q to quit.
+    """
+    views = _watch_views(args)
+    if not views:
+        logging.error("--watch needs a listing or --sprint-report command to watch.")
+        return
+    term = blessed.Terminal()
+    watchers = [IssueWatcher(jira, jql_query, fields) for _, jql_query, fields, _ in views]
+    table = LiveTable(term)
+    with term.fullscreen(), term.hidden_cursor(), term.cbreak():
+        while True:
+            changed = 0
+            error = None
+            for watcher in watchers:
+                try:
+                    changed += len(watcher.tick())
+                except Exception as e:
+                    error = e
+                    logging.error(f"Error polling {watcher.jql_query}: {e}")
+            lines = []
+            for (title, _, _, build_lines), watcher in zip(views, watchers):
+                lines.append(term.bold(title))
+                lines.extend(build_lines(term, watcher.store))
+                lines.append("")
+            status = (
+                f"Last poll {time.strftime('%H:%M:%S')}: "
+                + (f"error: {error}" if error else f"{changed} changed")
+                + f" | every {interval:g}s | q to quit"
+            )
+            table.draw(lines, status)
+            if term.inkey(timeout=interval).lower() == "q":
+                break
+
+
+def load_sites(paths):
+    """
+    Read the sites of a --sites run.
+
+    Every path is either the config.json of one site or a site list: a JSON
+    array, or an object with a ``sites`` array, whose entries are config
+    objects or paths of config files relative to the list. A config may
+    carry a ``name``; otherwise the host of its ``jira_url`` tags the output.
+
+    :param paths: Paths of config files and site lists
+    :return: List of (name, config) pairs, config being a path or a dictionary
+    """
+    sites = []
+    for path in paths:
+        try:
+            with open(path, "r") as file:
+                data = json.load(file)
+        except (OSError, ValueError) as e:
+            logging.error(f"Cannot read site config {path}: {e}")
+            continue
+        if isinstance(data, dict) and "sites" not in data:
+            sites.append((_site_name(data, path), path))
+            continue
+        for entry in data["sites"] if isinstance(data, dict) else data:
+            if isinstance(entry, dict):
+                sites.append((_site_name(entry, path), entry))
+            else:
+                sites.extend(load_sites([os.path.join(os.path.dirname(path), entry)]))
+    # Keep tags unique when two configs point at the same host
+    seen = {}
+    for i, (name, config) in enumerate(sites):
+        seen[name] = seen.get(name, 0) + 1
+        if seen[name] > 1:
+            sites[i] = (f"{name}-{seen[name]}", config)
+    return sites
+
+
+def _site_name(config_data, path):
+    return (
+        config_data.get("name")
+        or urlparse(config_data.get("jira_url") or "").hostname
+        or path
+    )
+
+
+class SiteOutput:
+    """
+    Stand-in for stdout during a --sites run.
+
+    Lines written by a thread tagged with a site name are prefixed with
+    ``[name]`` and written whole, so the output of sites running at the same
+    time never mixes within a line. Output of untagged threads passes
+    through unchanged.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+    def tag(self, name):
+        self.local.name = name
+        self.local.pending = ""
+
+    def untag(self):
+        if getattr(self.local, "pending", ""):
+            self.write("\n")
+        self.local.name = None
+
+    def write(self, text):
+        name = getattr(self.local, "name", None)
+        if name is None:
+            with self.lock:
+                return self.stream.write(text)
+        lines = (self.local.pending + text).split("\n")
+        self.local.pending = lines.pop()
+        if lines:
+            with self.lock:
+                self.stream.write("".join(f"[{name}] {line}\n" for line in lines))
+                self.stream.flush()
+        return len(text)
+
+    def flush(self):
+        with self.lock:
+            self.stream.flush()
+
+    def tag_record(self, record):
+        # logging filter that tags the log lines of a site the same way
+        # Every handler runs it on the same record, so tag a record only once
+        name = getattr(self.local, "name", None)
+        if name is not None and getattr(record, "site", None) is None:
+            record.site = name
+            record.msg = f"[{name}] {record.getMessage()}"
+            record.args = ()
+        return True
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+def _site_args(args, name):
+    # Copy of the arguments with the files a run writes kept apart per site
+    site_args = argparse.Namespace(**vars(args))
+    directory = re.sub(r"[^A-Za-z0-9_.-]", "_", name)
+    site_args.journal_dir = os.path.join(args.journal_dir, directory)
+    if args.changelog_cache != ":memory:":
+        # Issue keys of different sites collide in one cache
+        site_args.changelog_cache = os.path.join(
+            os.path.dirname(args.changelog_cache), directory, os.path.basename(args.changelog_cache)
+        )
+    if args.backup:
+        site_args.backup = [os.path.join(args.backup[0], directory), *args.backup[1:]]
+    return site_args
+
+
+def run_sites(sites, args, profiler=None, workers=None):
+    """
+    Run the commands given on the command line against several Jira sites
+    at once.
+
+    Every site gets its own connection, thread, RunPlan, journal directory,
+    changelog cache and backup (in a subdirectory named after the site).
+    Output lines and log messages are tagged with the site name and written as soon as
+    the site produces them, so a slow site holds up nobody but itself.
+
+    :param sites: List of (name, config) pairs from load_sites
+    :param args: Parsed arguments
+    :param profiler: ApiProfiler shared by all sites, if profiling
+    :param workers: Most sites to run at the same time (default: all)
+    :return: Dictionary of site name to True if its commands ran
+    """
+    output = SiteOutput(sys.stdout)
+
+    def run_site(name, config):
+        output.tag(name)
+        try:
+            jira = create_jira_connection(
+                config, profiler=profiler, session_dir=args.session_dir
+            )
+            if not jira:
+                return False
+            if args.cache_dir:
+                enable_response_cache(jira, cache_dir=args.cache_dir, ttl=args.cache_ttl)
+            try:
+                run_commands(jira, _site_args(args, name))
+            finally:
+                save_session(jira)
+            return True
+        except Exception as e:
+            logging.error(f"Error running commands: {e}")
+            return False
+        finally:
+            output.untag()
+
+    handlers = logging.getLogger().handlers
+    for handler in handlers:
+        handler.addFilter(output.tag_record)
+    try:
+        with contextlib.redirect_stdout(output), ThreadPoolExecutor(
+            max_workers=workers or max(len(sites), 1)
+        ) as executor:
+            futures = [(name, executor.submit(run_site, name, config)) for name, config in sites]
+            results = {name: future.result() for name, future in futures}
+    finally:
+        for handler in handlers:
+            handler.removeFilter(output.tag_record)
+    failed = [name for name, ok in results.items() if not ok]
+    if failed:
+        logging.error(f"{len(failed)} of {len(results)} sites failed: {', '.join(failed)}")
+    return results
+
+
 def parse_arguments():
     parser = argparse.ArgumentParser(description="Jira CLI Tool")
     parser.add_argument(
@@ -1448,8 +5983,9 @@ def parse_arguments():
     )
     parser.add_argument(
         "--read-story-details",
+        nargs="+",
         metavar="\tstory_key",
-        help="\nRead story details. Example: --read-story-details ST-1",
+        help="\nRead story details with comments, links, subtasks and history. Several keys are loaded together. Example: --read-story-details ST-1 ST-2",
     )
     parser.add_argument(
         "--delete-story",
@@ -1496,9 +6032,9 @@ def parse_arguments():
     )
     parser.add_argument(
         "--create-sprint",
-        nargs=1,
-        metavar=("\tsprint_name"),
-        help="\nCreate a new sprint",
+        nargs=2,
+        metavar=("\tboard_id", "sprint_name"),
+        help="\nCreate a new sprint on a board",
     )
     parser.add_argument(
         "--get-sprints-for-board",
@@ -1558,6 +6094,76 @@ def parse_arguments():
     parser.add_argument(
         "--delete-all-sprints", action="store_true", help="\nDelete all sprints"
     )
+    parser.add_argument(
+        "--workload",
+        nargs=1,
+        metavar=("\tproject_key"),
+        help="\nOpen, in-progress and done issues and story points per assignee of a project",
+    )
+    parser.add_argument(
+        "--sprint-workload",
+        nargs=1,
+        metavar=("\tsprint_id"),
+        help="\nOpen, in-progress and done issues and story points per assignee of a sprint",
+    )
+    parser.add_argument(
+        "--workload-json",
+        metavar="\tfile_path",
+        help="\nWrite --workload and --sprint-workload as JSON instead of a table (- for stdout)",
+    )
+    parser.add_argument(
+        "--cycle-time",
+        nargs="+",
+        metavar=("\tproject_key", "days"),
+        help="\nCycle and lead time of the issues done in the last days (default 182) from their changelogs",
+    )
+    parser.add_argument(
+        "--burndown",
+        nargs=1,
+        metavar=("\tsprint_id"),
+        help="\nDaily burndown of a sprint from its issues' changelogs",
+    )
+    parser.add_argument(
+        "--changelog-cache",
+        default=DEFAULT_CHANGELOG_CACHE,
+        metavar="\tfile_path",
+        help=f"\nParsed changelogs reused by --cycle-time and --burndown (default {DEFAULT_CHANGELOG_CACHE})",
+    )
+    parser.add_argument(
+        "--get-backlog",
+        nargs=1,
+        metavar=("\tboard_id"),
+        help="\nList the backlog of a board in rank order",
+    )
+    parser.add_argument(
+        "--move-backlog-to-sprint",
+        nargs=3,
+        metavar=("\tboard_id", "target_sprint_id", "count"),
+        help="\nMove the top backlog issues of a board into a sprint",
+    )
+    parser.add_argument(
+        "--clone-project",
+        nargs="+",
+        metavar=("\tsource_project_key", "target_project_key"),
+        help="\nCopy a project's issues, epics and sprints into another project (created if missing), optionally followed by its name",
+    )
+    parser.add_argument(
+        "--backup",
+        nargs="+",
+        metavar=("\tdirectory", "project_key"),
+        help="\nWrite projects, epics, issues, comments and sprints as compressed NDJSON plus a manifest (default all projects)",
+    )
+    parser.add_argument(
+        "--backup-compression",
+        default="gzip",
+        choices=sorted(BACKUP_COMPRESSIONS),
+        help="\nCompression of --backup files (zstd needs the zstandard package)",
+    )
+    parser.add_argument(
+        "--plan-sprints",
+        metavar="\tspec_path",
+        help="\nCreate, rename, start and close sprints on many boards from a JSON planning spec",
+    )
     parser.add_argument(
         "--create-board",
         nargs=3,
@@ -1576,18 +6182,261 @@ def parse_arguments():
         metavar=("\tproject_key", "user"),
         help="\nGet stories assigned to a user",
     )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="\nPrint request counts, bytes and latency per endpoint and function",
+    )
+    parser.add_argument(
+        "--profile-json",
+        metavar="\tfile_path",
+        help="\nWrite the API call profile as JSON. Example: --profile-json profile.json",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        metavar="\tdirectory",
+        help="\nKeep a response cache for metadata and issue reads in this directory",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=60,
+        metavar="\tseconds",
+        help="\nSeconds a cached response without ETag/Last-Modified stays fresh (default 60)",
+    )
+    parser.add_argument(
+        "--session-dir",
+        nargs="?",
+        const=DEFAULT_SESSION_DIR,
+        metavar="\tdirectory",
+        help=f"\nKeep cookies and server info on disk so later runs skip the handshake (off unless given; directory defaults to {DEFAULT_SESSION_DIR})",
+    )
+    parser.add_argument(
+        "--no-session",
+        dest="session_dir",
+        action="store_const",
+        const=None,
+        help="\nAuthenticate from scratch and keep no session state (the default)",
+    )
+    parser.add_argument(
+        "--watch",
+        nargs="?",
+        type=float,
+        const=WATCH_INTERVAL,
+        metavar="\tseconds",
+        help=f"\nKeep the listing and --sprint-report commands on screen and refresh them every few seconds (default {WATCH_INTERVAL})",
+    )
+    parser.add_argument(
+        "--sites",
+        nargs="+",
+        metavar="\tconfig_file",
+        help="\nRun the commands against several Jira sites at once. Each file is a config.json or a JSON list of configs or config paths",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="\nContinue an interrupted --delete-all-stories or --move-issues-to-sprint from its journal",
+    )
+    parser.add_argument(
+        "--journal-dir",
+        default=DEFAULT_JOURNAL_DIR,
+        metavar="\tdirectory",
+        help=f"\nWhere bulk operations keep their journals (default {DEFAULT_JOURNAL_DIR})",
+    )
+    parser.add_argument(
+        "--search",
+        metavar="\tterms",
+        help="\nSearch issue summaries, descriptions and comments in the local full-text index without contacting Jira",
+    )
+    parser.add_argument(
+        "--sync-search-index",
+        nargs="+",
+        metavar="\tproject_key",
+        help="\nAdd new and updated issues of these projects to the local full-text index",
+    )
+    parser.add_argument(
+        "--search-index",
+        default=DEFAULT_SEARCH_INDEX,
+        metavar="\tfile_path",
+        help=f"\nFull-text index file used by --search and --sync-search-index (default {DEFAULT_SEARCH_INDEX})",
+    )
     return parser
 
 
 def main():
-    term = Terminal()
+    global _completion_values
     parser = parse_arguments()
+    try:
+        import argcomplete
+
+        # Only reached without a completion index yet (see the top of the file)
+        argcomplete.autocomplete(parser)
+    except ImportError:
+        pass
     args = parser.parse_args()
-    # Create Jira connection
-    jira = create_jira_connection(args.config)
-    if not jira:
+    _completion_values = {}
+    profiler = ApiProfiler() if args.profile or args.profile_json else None
+    if args.search:
+        # Answered locally; connect only if other commands were given too
+        search_issues_tui(IssueSearchIndex(args.search_index), args.search)
+        if not requested_commands(parser, args):
+            return
+    if args.sites:
+        if args.watch is not None:
+            logging.error("--watch works with one site at a time, not with --sites.")
+            return
+        sites = load_sites(args.sites)
+        if not sites:
+            return
+    else:
+        # Create Jira connection
+        jira = create_jira_connection(
+            args.config, profiler=profiler, session_dir=args.session_dir
+        )
+        if not jira:
+            return
+        initialize()
+        if args.cache_dir:
+            enable_response_cache(jira, cache_dir=args.cache_dir, ttl=args.cache_ttl)
+    try:
+        if args.sites:
+            run_sites(sites, args, profiler=profiler)
+        else:
+            run_commands(jira, args)
+            save_session(jira)
+    finally:
+        if profiler:
+            disable_profiling()
+            if args.profile:
+                profiler.print_report()
+            if args.profile_json:
+                profiler.dump_json(args.profile_json)
+    # Not reached when a command raised, so a failing run leaves the index alone
+    _save_completions(parser, args)
+
+
+def plan_commands(args):
+    """
+    Build the RunPlan for the commands requested on the command line.
+
+    :param args: Parsed arguments
+    :return: RunPlan
+    """
+    plan = RunPlan()
+    if args.get_stories:
+        plan.add_project_scan(args.get_stories, ISSUE_RECORD_FIELDS, STORY_ISSUE_TYPES)
+    if args.get_members:
+        plan.add_project_scan(args.get_members, ("assignee",))
+    if args.list_epics:
+        plan.add_project_scan(args.list_epics, ("summary",), ("Epic",))
+    return plan
+
+
+# Options that change how commands run rather than requesting one
+RUN_OPTIONS = (
+    "config",
+    "profile",
+    "profile_json",
+    "cache_dir",
+    "cache_ttl",
+    "session_dir",
+    "watch",
+    "sites",
+    "resume",
+    "journal_dir",
+    "search",
+    "search_index",
+    "changelog_cache",
+    "workload_json",
+    "backup_compression",
+)
+
+
+def requested_commands(parser, args):
+    """
+    :return: Names of the commands given on the command line that need Jira
+    """
+    return [
+        name
+        for name, value in vars(args).items()
+        if name not in RUN_OPTIONS and value != parser.get_default(name)
+    ]
+
+
+def remember_completions(kind, values):
+    # Offer these values in shell completion from now on (CLI runs only)
+    if _completion_values is not None:
+        _completion_values.setdefault(kind, []).extend(
+            str(value) for value in values if value is not None
+        )
+
+
+def completion_options(parser):
+    """
+    :return: Option table of the completion index: the nargs of every option
+        and the kind of value (see jslcomplete.METAVAR_KINDS) each argument takes
+    """
+    options = {}
+    for action in parser._actions:
+        if isinstance(action.metavar, tuple):
+            metavars = action.metavar
+        else:
+            metavars = (action.metavar or action.dest,)
+        kinds = [jslcomplete.METAVAR_KINDS.get(metavar.strip()) for metavar in metavars]
+        for option in action.option_strings:
+            options[option] = {"nargs": action.nargs, "kinds": kinds}
+    return options
+
+
+def _remember_arguments(args, options):
+    # Keys typed on the command line are the likeliest to be typed again
+    for name, spec in options.items():
+        dest = name.lstrip("-").replace("-", "_")
+        value = getattr(args, dest, None)
+        if value is None or not any(spec["kinds"]):
+            continue
+        values = value if isinstance(value, list) else [value]
+        for position, value in enumerate(values):
+            kind = jslcomplete.argument_kind(spec, position)
+            if kind:
+                remember_completions(kind, [value])
+
+
+def _save_completions(parser, args):
+    options = completion_options(parser)
+    _remember_arguments(args, options)
+    try:
+        jslcomplete.update_index(options=options, values=_completion_values)
+    except OSError as e:
+        logging.debug(f"Could not update the completion index: {e}")
+
+
+# Commands --watch keeps on screen instead of running them once
+WATCHABLE_COMMANDS = (
+    "get_stories",
+    "list_epics",
+    "get_members",
+    "get_stories_in_sprint",
+    "my_stories",
+    "sprint_report",
+)
+
+
+def run_commands(jira, args):
+    if args.watch is not None:
+        # Run everything else once, then watch the listings
+        once = argparse.Namespace(**vars(args))
+        for name in WATCHABLE_COMMANDS:
+            setattr(once, name, None)
+        with plan_commands(once).activate(jira):
+            _run_commands(jira, once)
+        watch_commands(jira, args, args.watch)
         return
-    initialize()
+    with plan_commands(args).activate(jira):
+        _run_commands(jira, args)
+
+
+def _run_commands(jira, args):
     if args.issue_key:
         print_issue_assignee(jira, args.issue_key)
     # Check if the --assign-issue argument is provided
@@ -1618,6 +6467,7 @@ def main():
             )
     if args.list_projects:
         projects = list_projects_tui(jira)
+        remember_completions("project", [project.key for project in projects or ()])
     if args.delete_all_projects:
         if delete_all_projects(jira):
             logging.info("All projects deleted successfully.")
@@ -1632,6 +6482,7 @@ def main():
     if args.get_stories:
         project_key = args.get_stories
         stories = get_stories_for_project(jira, project_key)
+        remember_completions("issue", [story.key for story in stories or ()])
         if stories:
             render_tui(
                 stories, fetching_data=False
@@ -1640,7 +6491,13 @@ def main():
         # Logic for other options if needed
         pass
     if args.delete_all_stories:
-        if delete_all_stories_in_project(jira, args.delete_all_stories):
+        journal = BulkJournal(
+            journal_path(
+                args.journal_dir, "delete_all_stories_in_project", args.delete_all_stories
+            ),
+            resume=args.resume,
+        )
+        if delete_all_stories_in_project(jira, args.delete_all_stories, journal):
             logging.info("All stories deleted successfully.")
         else:
             logging.error("Failed to delete all stories.")
@@ -1666,7 +6523,19 @@ def main():
         add_comment(jira, args.issue_key, args.comment_body)
 
     if args.read_story_details:
-        read_story_details_tui(jira, *args.read_story_details)
+        if len(args.read_story_details) == 1:
+            read_story_details_tui(jira, *args.read_story_details)
+        else:
+            try:
+                stories = read_issue_details(jira, args.read_story_details)
+            except Exception as e:
+                logging.error(f"Error reading story details: {e}")
+                stories = {}
+            for story_key in args.read_story_details:
+                if story_key in stories:
+                    read_story_details_tui(jira, story_key, stories[story_key])
+                else:
+                    logging.error(f"Story {story_key} does not exist.")
 
     if args.delete_story:
         if delete_story(jira, args.delete_story):
@@ -1674,11 +6543,6 @@ def main():
         else:
             logging.error(f"Failed to delete story '{args.delete_story}'.")
 
-    if args.create_epic:
-        if create_epic(jira, *args.create_epic):
-            logging.info("Epic created successfully.")
-        else:
-            logging.error("Failed to create epic.")
     if args.create_epic:
         epic_result = create_epic(jira, *args.create_epic)
         if epic_result:
@@ -1688,10 +6552,11 @@ def main():
 
     if args.list_epics:
         epic_list = list_epics_tui(jira, args.list_epics)
+        remember_completions("issue", [epic.key for epic in epic_list or ()])
         if epic_list:
             logging.info("List of epics:")
             for epic in epic_list:
-                logging.info(f"Epic Key: {epic.key}, Summary: {epic.fields.summary}")
+                logging.info(f"Epic Key: {epic.key}, Summary: {epic.summary}")
         else:
             logging.error("Failed to retrieve the list of epics.")
 
@@ -1726,26 +6591,35 @@ def main():
         else:
             logging.error("Failed to delete epic.")
     if args.create_sprint:
+        board_id, sprint_name = args.create_sprint
         sprint_id = create_sprint(
-            args.url, args.username, args.api_token, args.board_id, *args.create_sprint
+            jira.server_url, None, None, int(board_id), sprint_name, jira=jira
         )
         if sprint_id:
+            remember_completions("sprint", [sprint_id])
             logging.info(f"Sprint created successfully with ID: {sprint_id}")
         else:
             logging.error("Failed to create sprint.")
-            get_sprints_for_board_tui(jira, args.board_id)
+            get_sprints_for_board_tui(jira, board_id)
     if args.move_issues_to_sprint:
         project_key, start_issue_key, end_issue_key, target_sprint_id = (
             args.move_issues_to_sprint
         )
+        journal = BulkJournal(
+            journal_path(
+                args.journal_dir, "move_issues_to_sprint", *args.move_issues_to_sprint
+            ),
+            resume=args.resume,
+        )
         move_issues_to_sprint_tui(
-            jira, project_key, start_issue_key, end_issue_key, target_sprint_id
+            jira, project_key, start_issue_key, end_issue_key, target_sprint_id, journal
         )
     if args.start_sprint:
         sprint_id, new_summary, start_date, end_date = args.start_sprint
         sprint = start_sprint(jira, *args.start_sprint)
     if args.get_stories_in_sprint:
         stories = get_stories_in_sprint_tui(jira, *args.get_stories_in_sprint)
+        remember_completions("issue", [story.key for story in stories or ()])
     if args.complete_stories_in_sprint:
         complete_stories_in_sprint(jira, *args.complete_stories_in_sprint)
     if args.complete_sprint:
@@ -1774,8 +6648,63 @@ def main():
             logging.info("All sprints deleted successfully.")
         else:
             logging.error("Failed to delete all sprints.")
+    if args.workload_json and (args.workload or args.sprint_workload):
+        # Both scopes go into the one file
+        workload_report_json(
+            jira,
+            args.workload_json,
+            args.workload[0] if args.workload else None,
+            args.sprint_workload[0] if args.sprint_workload else None,
+        )
+    else:
+        if args.workload:
+            workload_report_tui(jira, *args.workload)
+        if args.sprint_workload:
+            workload_report_tui(jira, sprint_id=args.sprint_workload[0])
+    if args.cycle_time or args.burndown:
+        cache = ChangelogCache(args.changelog_cache)
+        try:
+            if args.cycle_time:
+                cycle_time_report_tui(jira, *args.cycle_time[:2], cache=cache)
+            if args.burndown:
+                sprint_burndown_tui(jira, *args.burndown, cache=cache)
+        finally:
+            cache.close()
+    if args.get_backlog:
+        get_backlog_tui(jira, *args.get_backlog)
+    if args.move_backlog_to_sprint:
+        board_id, target_sprint_id, count = args.move_backlog_to_sprint
+        moved = move_backlog_to_sprint(jira, board_id, target_sprint_id, int(count))
+        logging.info(f"{moved} backlog issues moved to Sprint {target_sprint_id}.")
+    if args.plan_sprints:
+        plan_sprints_tui(jira, args.plan_sprints)
+    if args.clone_project:
+        if len(args.clone_project) < 2:
+            logging.error("--clone-project needs a source and a target project key.")
+        else:
+            source_key, target_key, *target_name = args.clone_project
+            journal = CloneJournal(
+                journal_path(args.journal_dir, "clone_project", source_key, target_key),
+                resume=args.resume,
+            )
+            key_map = clone_project(
+                jira, source_key, target_key, " ".join(target_name) or None, journal
+            )
+            if key_map is not None:
+                remember_completions("project", [target_key])
+                remember_completions("issue", key_map.values())
+    if args.backup:
+        directory, *project_keys = args.backup
+        manifest = backup_instance(
+            jira, directory, project_keys or None, args.backup_compression
+        )
+        if manifest is not None:
+            remember_completions("project", manifest["projects"])
     if args.create_board:
-        board_id = create_board(*args.create_board)
+        project_key, project_lead, user_email = args.create_board
+        board_id = create_board(
+            jira.server_url, None, user_email, project_key, project_lead, jira=jira
+        )
         if board_id is not None:
             logging.info(f"Board created successfully. Board ID: {board_id}")
         else:
@@ -1784,12 +6713,24 @@ def main():
     if args.get_board_id:
         board_id = get_board_id(jira, args.get_board_id[0])
         if board_id is not None:
+            remember_completions("board", [board_id])
             logging.info(f"Board ID for '{args.get_board_id[0]}': {board_id}")
         else:
             logging.error("Failed to retrieve board ID.")
 
     if args.my_stories:
-        my_stories_tui(jira, *args.my_stories)
+        stories = my_stories_tui(jira, *args.my_stories)
+        remember_completions("issue", [story.key for story in stories or ()])
+
+    if args.sync_search_index:
+        index = IssueSearchIndex(args.search_index)
+        try:
+            written = sync_search_index(jira, index, args.sync_search_index)
+            logging.info(f"Indexed {written} new or updated issues in {args.search_index}.")
+        except Exception as e:
+            logging.error(f"Failed to sync the search index: {e}")
+        finally:
+            index.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,184 @@
+import json
+import os
+import shlex
+import sys
+
+# Shell completion for jirasimplelib.py answered from a small local index
+# instead of importing jira and blessed and asking Jira. jirasimplelib.py
+# keeps the index current: every normal run records its option table and
+# the project keys, issue keys, sprint ids and board names it saw or was
+# given.
+#
+# With argcomplete (jirasimplelib.py hands completion requests over before
+# its slow imports):
+#   eval "$(register-python-argcomplete jirasimplelib.py)"
+# Without argcomplete, in bash:
+#   complete -o default -C "python3 /path/to/jslcomplete.py" jirasimplelib.py
+
+DEFAULT_COMPLETION_INDEX = os.environ.get(
+    "JIRASIMPLELIB_COMPLETION_INDEX",
+    os.path.join(os.path.expanduser("~"), ".jirasimplelib", "completion.json"),
+)
+
+# Values kept per kind, most recently seen first
+COMPLETION_LIMIT = 5000
+
+# Most completions offered at once
+COMPLETION_RESULTS = 200
+
+# Kind of value an option argument completes, by its metavar (or dest)
+METAVAR_KINDS = {
+    "project_key": "project",
+    "issue_key": "issue",
+    "story_key": "issue",
+    "epic_key": "issue",
+    "start_issue_key": "issue",
+    "end_issue_key": "issue",
+    "sprint_id": "sprint",
+    "target_sprint_id": "sprint",
+    "board_id": "board",
+    "board_name": "board_name",
+}
+
+
+def load_index(path=DEFAULT_COMPLETION_INDEX):
+    try:
+        with open(path, "r") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def update_index(path=DEFAULT_COMPLETION_INDEX, options=None, values=None):
+    """
+    Merge newly seen values, and the option table if given, into the index.
+    The file is only rewritten when that changes it.
+
+    :param path: Index file
+    :param options: {option: {"nargs": ..., "kinds": [...]}} from jirasimplelib
+    :param values: {kind: [value, ...]}, most recent last
+    """
+    stored = load_index(path)
+    if stored:
+        index = {"options": stored["options"], "values": dict(stored["values"])}
+    else:
+        index = {"options": {}, "values": {}}
+    if options is not None:
+        index["options"] = options
+    for kind, new_values in (values or {}).items():
+        seen = [str(value) for value in reversed(new_values)]
+        merged = list(dict.fromkeys(seen + index["values"].get(kind, [])))
+        index["values"][kind] = merged[:COMPLETION_LIMIT]
+    if index == stored:
+        return index
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "w") as file:
+        json.dump(index, file)
+    # Readers never see a half-written index
+    os.replace(temporary, path)
+    return index
+
+
+def argument_kind(spec, position):
+    """
+    :param spec: {"nargs": ..., "kinds": [...]} of one option
+    :param position: Index of the argument among the option's arguments
+    :return: Kind of value the argument takes, None if unknown or past the last
+    """
+    nargs, kinds = spec.get("nargs"), spec.get("kinds") or [None]
+    if nargs in ("+", "*"):
+        # Like argparse reads a tuple metavar here: "first [second ...]"
+        return kinds[min(position, len(kinds) - 1)]
+    if nargs in (None, "?"):
+        return kinds[0] if position == 0 else None
+    return kinds[position] if position < min(nargs, len(kinds)) else None
+
+
+def _split(line):
+    try:
+        return shlex.split(line)
+    except ValueError:
+        # An open quote in the word being completed
+        return shlex.split(line + '"')
+
+
+def complete(comp_line, comp_point, index, start=1):
+    """
+    :param comp_line: Command line being completed
+    :param comp_point: Cursor position in comp_line
+    :param index: Loaded completion index
+    :param start: Words before the first argument (1 for ``script``, 2 for ``python script``)
+    :return: List of completions for the word under the cursor
+    """
+    line = comp_line[:comp_point]
+    words = _split(line)[start:]
+    prefix = "" if not line or line[-1].isspace() else (words.pop() if words else "")
+    options = index.get("options", {})
+    if prefix.startswith("-") and "=" in prefix:
+        # --option=value: the shell breaks the word at "=", so offer bare values
+        option, prefix = prefix.split("=", 1)
+        words.append(option)
+    elif prefix.startswith("-"):
+        return sorted(option for option in options if option.startswith(prefix))
+    # The option whose values are being typed and how many it already has
+    position = 0
+    for word in reversed(words):
+        option = word.split("=", 1)[0] if word.startswith("-") else word
+        if option in options:
+            # --option=value carries its first value
+            position += option != word
+            break
+        position += 1
+    else:
+        return []
+    kind = argument_kind(options[option], position)
+    if kind is None:
+        return []
+    wanted = prefix.upper()
+    matches = [
+        value for value in index.get("values", {}).get(kind, ()) if value.upper().startswith(wanted)
+    ]
+    return matches[:COMPLETION_RESULTS]
+
+
+def autocomplete(path=DEFAULT_COMPLETION_INDEX):
+    """
+    Answer an argcomplete request (_ARGCOMPLETE set by the shell hook) from
+    the index and exit. Returns without answering when there is no index yet,
+    so argcomplete can complete from the full parser instead.
+    """
+    index = load_index(path)
+    if not index or not index.get("options"):
+        return
+    completions = complete(
+        os.environ["COMP_LINE"],
+        int(os.environ["COMP_POINT"]),
+        index,
+        int(os.environ.get("_ARGCOMPLETE", 1)),
+    )
+    if os.environ.get("_ARGCOMPLETE_SHELL") == "zsh":
+        completions = [f"{completion}:" for completion in completions]
+    filename = os.environ.get("_ARGCOMPLETE_STDOUT_FILENAME")
+    output = open(filename, "w") if filename else os.fdopen(8, "w")
+    output.write(os.environ.get("_ARGCOMPLETE_IFS", "\013").join(completions))
+    output.flush()
+    os._exit(0)
+
+
+def main():
+    # bash "complete -C" protocol: the line is in COMP_LINE, one completion per output line
+    index = load_index()
+    if not index or "COMP_LINE" not in os.environ:
+        return
+    comp_line = os.environ["COMP_LINE"]
+    comp_point = int(os.environ.get("COMP_POINT", len(comp_line)))
+    # "python3 jirasimplelib.py ..." has one word more before the arguments
+    words = _split(comp_line[:comp_point])
+    start = 2 if words and os.path.basename(words[0]).startswith("python") else 1
+    for completion in complete(comp_line, comp_point, index, start):
+        print(completion)
+
+
+if __name__ == "__main__":
+    main()
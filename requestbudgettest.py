@@ -0,0 +1,886 @@
+import contextlib
+import gzip
+import hashlib
+import io
+import json
+import logging
+import os
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import requests
+
+import jirasimplelib
+from fakejira import FakeJira, FakeJiraServer, connect, recording_session
+from jirasimplelib import _endpoint_template
+
+# Most HTTP calls each public function may make for a given dataset shape.
+# The calls are recorded by the FakeJiraAdapter transport, so a change that
+# adds requests (an N+1 loop, a lost batch call) fails here. When a change
+# lowers a count, lower the budget with it.
+REQUEST_BUDGETS = {
+    ("list_projects", "1 project"): 1,
+    # One request per 100-issue page; before IssueRecords only the first 50 were read
+    ("get_stories_for_project", "1000 issues"): 10,
+    ("delete_all_stories_in_project", "40 issues"): 41,
+    ("delete_all_stories_in_project", "300 issues"): 303,
+    ("delete_all_stories_in_project", "resume after 120 of 300"): 180,
+    ("move_issues_to_sprint", "resume after first batch of 95"): 1,
+    ("create_story", "1 issue"): 3,
+    ("update_story_status", "1 issue"): 3,
+    ("update_story_summary", "1 issue"): 3,
+    ("read_story_details", "1 issue"): 1,
+    # Comments, changelog, links and subtasks in the same request; 50 issues per search
+    ("read_issue_details", "200 issues"): 4,
+    ("create_epic", "1 issue"): 3,
+    ("list_epics", "1000 issues"): 1,
+    ("read_epic_details", "30 children"): 2,
+    ("add_story_to_epic", "2 issues"): 3,
+    # One key in (...) search, then moves in batches of 50
+    ("move_issues_to_sprint", "100 keys"): 3,
+    ("resolve_issue_keys", "250 keys, 200 exist"): 3,
+    ("start_sprint", "1 sprint"): 3,
+    ("complete_sprint", "1 sprint"): 3,
+    ("get_stories_in_sprint", "200 issues in sprint"): 1,
+    ("complete_stories_in_sprint", "20 issues in sprint"): 4,
+    ("sprint_report", "1000 issues"): 2,
+    ("get_sprints_for_board", "5 sprints"): 1,
+    ("delete_all_sprints", "5 sprints"): 6,
+    ("get_board_id", "1 board"): 1,
+    ("my_stories", "1000 issues"): 1,
+    ("get_members", "1000 issues"): 10,
+    ("create_sprint", "1 sprint"): 1,
+    ("get_sprints_for_board", "5 sprints, cached with ETag"): 1,
+    ("get_sprints_for_board", "5 sprints, cached with TTL"): 0,
+    # --get-stories, --get-members and --list-epics on one project: one shared scan
+    ("run_commands", "3 project listings, 1000 issues"): 10,
+    ("run_commands", "--create-epic"): 3,
+    ("run_commands", "--create-sprint"): 1,
+    ("read_story_details", "same issue twice in one run"): 1,
+    # --watch: one small search per tick after the first full read
+    ("IssueWatcher.tick", "1000 issues, 1 updated"): 1,
+    # Reads answered from an IssueStore kept current by webhooks
+    ("get_stories_for_project", "synced store, after webhook"): 0,
+    ("get_stories_in_sprint", "synced store, after webhook"): 0,
+    ("status_breakdown", "1000 issues"): 10,
+    ("status_breakdown", "synced store, after webhook"): 0,
+    ("my_stories", "synced store, after webhook"): 0,
+    ("workload_report", "synced store, after webhook"): 0,
+    ("my_stories", "store synced too long ago"): 1,
+    # Full-text index: every issue once, then only what changed
+    ("sync_search_index", "1000 issues"): 10,
+    ("sync_search_index", "1000 issues, 1 updated since last sync"): 1,
+    # --sites: the server-info handshake plus the command, on every site
+    ("run_sites", "--list-projects, per site"): 2,
+    # Session state from an earlier run replaces the server-info handshake
+    ("create_jira_connection", "first run"): 1,
+    ("create_jira_connection", "saved session"): 0,
+    ("create_sprint", "1 sprint, connection session"): 1,
+    # One sprint listing per board, then one request per sprint changed
+    ("plan_sprints", "40 boards x 6 sprints"): 320,
+    ("plan_sprints", "40 boards, already planned"): 40,
+    # Agile board endpoints: 50 issues per page, moves read the backlog top again per batch
+    ("board_issue_records", "backlog of 3032 issues"): 61,
+    ("move_backlog_to_sprint", "120 issues"): 6,
+    # Changelogs: one listing of keys and updated times, then 50 expanded issues per search
+    ("cycle_time_report", "1000 issues, 304 done"): 11,
+    ("cycle_time_report", "changelogs cached, 1 updated"): 5,
+    # Assignee, status and story points only, every page in one scan
+    ("workload_report", "1000 issues"): 10,
+    ("workload_report", "sprint of 200 issues"): 2,
+    # Clone: 10 source pages, 20 bulk creates, sprints, then batched epic and sprint moves
+    ("clone_project", "1000 issues"): 92,
+    # One request per 100-issue page with comments embedded, then boards and sprints
+    ("backup_instance", "1000 issues"): 13,
+}
+
+
+class RequestBudgetTestCase(unittest.TestCase):
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def connect(self, **dataset):
+        fake = FakeJira(**dataset)
+        jira = connect(fake)
+        fake.reset_requests()
+        return jira, fake
+
+    def assertWithinBudget(self, function_name, shape, fake):
+        budget = REQUEST_BUDGETS[(function_name, shape)]
+        calls = list(fake.requests)
+        if len(calls) > budget:
+            sequence = "\n".join(
+                f"  {method} {_endpoint_template(path)}" for method, path in calls
+            )
+            self.fail(
+                f"{function_name} ({shape}) made {len(calls)} requests, "
+                f"budget is {budget}:\n{sequence}"
+            )
+        return calls
+
+
+class TestProjectRequestBudgets(RequestBudgetTestCase):
+    def test_list_projects(self):
+        jira, fake = self.connect(issues=10)
+        with contextlib.redirect_stdout(io.StringIO()):
+            jirasimplelib.list_projects(jira)
+        self.assertWithinBudget("list_projects", "1 project", fake)
+
+    def test_get_members(self):
+        jira, fake = self.connect(issues=1000)
+        members = jirasimplelib.get_members(jira, "BENCH")
+        self.assertEqual(len(members), 25)
+        self.assertWithinBudget("get_members", "1000 issues", fake)
+
+    def test_my_stories(self):
+        jira, fake = self.connect(issues=1000)
+        jirasimplelib.my_stories(jira, "BENCH", "user-1")
+        self.assertWithinBudget("my_stories", "1000 issues", fake)
+
+    def test_status_breakdown(self):
+        jira, fake = self.connect(issues=1000)
+        counts = jirasimplelib.status_breakdown(jira, "BENCH")
+        self.assertEqual(sum(counts.values()), len(fake.issues))
+        self.assertWithinBudget("status_breakdown", "1000 issues", fake)
+
+
+class TestStoryRequestBudgets(RequestBudgetTestCase):
+    def test_get_stories_for_project(self):
+        jira, fake = self.connect(issues=1000)
+        stories = jirasimplelib.get_stories_for_project(jira, "BENCH")
+        expected = [i for i in fake.issues.values() if i.issue_type in ("Bug", "Task", "Story")]
+        self.assertEqual(len(stories), len(expected))
+        self.assertWithinBudget("get_stories_for_project", "1000 issues", fake)
+
+    def test_delete_all_stories_in_project(self):
+        jira, fake = self.connect(issues=40)
+        jirasimplelib.delete_all_stories_in_project(jira, "BENCH")
+        self.assertEqual(len(fake.issues), 0)
+        self.assertWithinBudget("delete_all_stories_in_project", "40 issues", fake)
+
+    def test_delete_all_stories_in_project_beyond_one_page(self):
+        jira, fake = self.connect(issues=300)
+        jirasimplelib.delete_all_stories_in_project(jira, "BENCH")
+        self.assertEqual(len(fake.issues), 0)
+        self.assertWithinBudget("delete_all_stories_in_project", "300 issues", fake)
+
+    def test_delete_all_stories_in_project_resume(self):
+        jira, fake = self.connect(issues=300)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "delete.jsonl")
+            delete = jira._session.delete
+            calls = []
+
+            def interrupted_delete(url, **kwargs):
+                calls.append(url)
+                if len(calls) > 120:
+                    raise KeyboardInterrupt
+                return delete(url, **kwargs)
+
+            with patch.object(jira._session, "delete", side_effect=interrupted_delete):
+                with self.assertRaises(KeyboardInterrupt):
+                    jirasimplelib.delete_all_stories_in_project(
+                        jira, "BENCH", jirasimplelib.BulkJournal(path)
+                    )
+            fake.reset_requests()
+            jirasimplelib.delete_all_stories_in_project(
+                jira, "BENCH", jirasimplelib.BulkJournal(path, resume=True)
+            )
+        self.assertEqual(len(fake.issues), 0)
+        calls = self.assertWithinBudget(
+            "delete_all_stories_in_project", "resume after 120 of 300", fake
+        )
+        self.assertNotIn(("GET", "/rest/api/2/search"), calls)
+
+    def test_create_story(self):
+        jira, fake = self.connect(issues=1)
+        jirasimplelib.create_story(jira, "BENCH", "Summary", "Description")
+        self.assertWithinBudget("create_story", "1 issue", fake)
+
+    def test_update_story_status(self):
+        jira, fake = self.connect(issues=1)
+        self.assertTrue(jirasimplelib.update_story_status(jira, "BENCH-1", "Done"))
+        self.assertWithinBudget("update_story_status", "1 issue", fake)
+
+    def test_update_story_summary(self):
+        jira, fake = self.connect(issues=1)
+        jirasimplelib.update_story_summary(jira, "BENCH-1", "New summary")
+        self.assertWithinBudget("update_story_summary", "1 issue", fake)
+
+    def test_read_story_details(self):
+        jira, fake = self.connect(issues=1)
+        jirasimplelib.read_story_details(jira, "BENCH-1")
+        self.assertWithinBudget("read_story_details", "1 issue", fake)
+
+    def test_read_issue_details(self):
+        jira, fake = self.connect(issues=250)
+        jirasimplelib.add_comment(jira, "BENCH-7", "Needs a release note")
+        fake.reset_requests()
+        details = jirasimplelib.read_issue_details(jira, [f"BENCH-{i}" for i in range(200, 0, -1)])
+        self.assertEqual(list(details)[:2], ["BENCH-200", "BENCH-199"])
+        self.assertEqual(details["BENCH-7"].fields.comment.comments[0].body, "Needs a release note")
+        self.assertTrue(hasattr(details["BENCH-7"], "changelog"))
+        self.assertWithinBudget("read_issue_details", "200 issues", fake)
+
+
+class TestEpicRequestBudgets(RequestBudgetTestCase):
+    def test_create_epic(self):
+        jira, fake = self.connect(issues=1)
+        jirasimplelib.create_epic(jira, "BENCH", "Epic", "Epic summary")
+        self.assertWithinBudget("create_epic", "1 issue", fake)
+
+    def test_list_epics(self):
+        jira, fake = self.connect(issues=1000)
+        jirasimplelib.list_epics(jira, "BENCH")
+        self.assertWithinBudget("list_epics", "1000 issues", fake)
+
+    def test_read_epic_details(self):
+        jira, fake = self.connect(issues=31, epics_per_project=1)
+        jirasimplelib.read_epic_details(jira, "BENCH-1")
+        self.assertWithinBudget("read_epic_details", "30 children", fake)
+
+    def test_add_story_to_epic(self):
+        jira, fake = self.connect(issues=2, epics_per_project=1)
+        jirasimplelib.add_story_to_epic(jira, "BENCH-1", "BENCH-2")
+        self.assertWithinBudget("add_story_to_epic", "2 issues", fake)
+
+
+class TestSprintRequestBudgets(RequestBudgetTestCase):
+    def test_move_issues_to_sprint(self):
+        jira, fake = self.connect(issues=200, gap_every=20)
+        jirasimplelib.move_issues_to_sprint(jira, "BENCH", "BENCH-1", "BENCH-100", 1)
+        existing = [f"BENCH-{n}" for n in range(1, 101) if f"BENCH-{n}" in fake.issues]
+        self.assertTrue(all(fake.issues[key].sprint == 1 for key in existing))
+        self.assertWithinBudget("move_issues_to_sprint", "100 keys", fake)
+
+    def test_move_issues_to_sprint_resume(self):
+        jira, fake = self.connect(issues=200, gap_every=20)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "move.jsonl")
+            add_issues_to_sprint = jira.add_issues_to_sprint
+            batches = []
+
+            def failing_second_batch(sprint_id, keys):
+                batches.append(keys)
+                if len(batches) == 2:
+                    raise ConnectionError("Connection reset")
+                return add_issues_to_sprint(sprint_id, keys)
+
+            with patch.object(jira, "add_issues_to_sprint", side_effect=failing_second_batch):
+                jirasimplelib.move_issues_to_sprint(
+                    jira, "BENCH", "BENCH-1", "BENCH-100", 1, jirasimplelib.BulkJournal(path)
+                )
+            fake.reset_requests()
+            jirasimplelib.move_issues_to_sprint(
+                jira, "BENCH", "BENCH-1", "BENCH-100", 1,
+                jirasimplelib.BulkJournal(path, resume=True),
+            )
+        self.assertTrue(all(fake.issues[key].sprint == 1 for key in batches[1]))
+        self.assertWithinBudget("move_issues_to_sprint", "resume after first batch of 95", fake)
+
+    def test_resolve_issue_keys(self):
+        jira, fake = self.connect(issues=200)
+        keys = jirasimplelib.issue_keys_in_range("BENCH", "BENCH-1", "BENCH-250")
+        records = list(jirasimplelib.resolve_issue_keys(jira, keys, ("summary",)))
+        self.assertEqual(len(records), 200)
+        self.assertWithinBudget("resolve_issue_keys", "250 keys, 200 exist", fake)
+
+    def test_start_sprint(self):
+        jira, fake = self.connect(issues=1000, sprint_size=200)
+        jirasimplelib.start_sprint(jira, 5, "Started", "2024-03-01", "2024-03-15")
+        self.assertWithinBudget("start_sprint", "1 sprint", fake)
+
+    def test_complete_sprint(self):
+        jira, fake = self.connect(issues=1000, sprint_size=200)
+        jirasimplelib.complete_sprint(jira, 4, "2024-03-01", "2024-03-15")
+        self.assertWithinBudget("complete_sprint", "1 sprint", fake)
+
+    def test_get_stories_in_sprint(self):
+        jira, fake = self.connect(issues=1000, sprint_size=200)
+        jirasimplelib.get_stories_in_sprint(jira, 1)
+        self.assertWithinBudget("get_stories_in_sprint", "200 issues in sprint", fake)
+
+    def test_complete_stories_in_sprint(self):
+        jira, fake = self.connect(issues=100, sprint_size=20)
+        jirasimplelib.complete_stories_in_sprint(jira, 1)
+        self.assertWithinBudget("complete_stories_in_sprint", "20 issues in sprint", fake)
+
+    def test_sprint_report(self):
+        jira, fake = self.connect(issues=1000, sprint_size=200)
+        with contextlib.redirect_stdout(io.StringIO()):
+            jirasimplelib.sprint_report(jira, 4, "BENCH")
+        self.assertWithinBudget("sprint_report", "1000 issues", fake)
+
+    def test_get_sprints_for_board(self):
+        jira, fake = self.connect(issues=1000, sprint_size=200)
+        self.assertEqual(len(jirasimplelib.get_sprints_for_board(jira, 1)), 5)
+        self.assertWithinBudget("get_sprints_for_board", "5 sprints", fake)
+
+    def test_get_sprints_for_board_cached(self):
+        jira, fake = self.connect(issues=1000, sprint_size=200)
+        jirasimplelib.enable_response_cache(jira)
+        jirasimplelib.get_sprints_for_board(jira, 1)
+        fake.reset_requests()
+        self.assertEqual(len(jirasimplelib.get_sprints_for_board(jira, 1)), 5)
+        self.assertWithinBudget("get_sprints_for_board", "5 sprints, cached with ETag", fake)
+
+    def test_get_sprints_for_board_cached_without_validators(self):
+        jira, fake = self.connect(issues=1000, sprint_size=200, etags=False)
+        jirasimplelib.enable_response_cache(jira, ttl=60)
+        jirasimplelib.get_sprints_for_board(jira, 1)
+        fake.reset_requests()
+        self.assertEqual(len(jirasimplelib.get_sprints_for_board(jira, 1)), 5)
+        self.assertWithinBudget("get_sprints_for_board", "5 sprints, cached with TTL", fake)
+
+    def test_delete_all_sprints(self):
+        jira, fake = self.connect(issues=1000, sprint_size=200)
+        jirasimplelib.delete_all_sprints(jira, 1)
+        self.assertEqual(fake.sprints, {})
+        self.assertWithinBudget("delete_all_sprints", "5 sprints", fake)
+
+    def test_create_sprint(self):
+        jira, fake = self.connect(issues=10)
+        session = recording_session(fake)
+        with patch("jirasimplelib.requests.post", side_effect=session.post):
+            sprint_id = jirasimplelib.create_sprint(
+                fake.base_url, "bench@example.com", "token", 1, "New sprint"
+            )
+        self.assertIsNotNone(sprint_id)
+        self.assertWithinBudget("create_sprint", "1 sprint", fake)
+
+
+class TestBoardRequestBudgets(RequestBudgetTestCase):
+    def test_get_board_id(self):
+        jira, fake = self.connect(issues=10)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(jirasimplelib.get_board_id(jira, "BENCH board"), 1)
+        self.assertWithinBudget("get_board_id", "1 board", fake)
+
+
+
+class TestRunPlanRequestBudgets(RequestBudgetTestCase):
+    def parse(self, *argv):
+        return jirasimplelib.parse_arguments().parse_args(["--config", "config.json", *argv])
+
+    def test_project_listings_share_one_scan(self):
+        jira, fake = self.connect(issues=1000, epics_per_project=3)
+        args = self.parse(
+            "--get-stories", "BENCH", "--get-members", "BENCH", "--list-epics", "BENCH"
+        )
+        with jirasimplelib.plan_commands(args).activate(jira):
+            stories = jirasimplelib.get_stories_for_project(jira, "BENCH")
+            members = jirasimplelib.get_members(jira, "BENCH")
+            epics = jirasimplelib.list_epics(jira, "BENCH")
+        self.assertEqual((len(stories), len(members), len(epics)), (997, 25, 3))
+        self.assertEqual(stories[0].status, fake.issues[stories[0].key].status)
+        self.assertWithinBudget("run_commands", "3 project listings, 1000 issues", fake)
+
+    def test_issue_read_once_per_run(self):
+        jira, fake = self.connect(issues=10)
+        with jirasimplelib.RunPlan().activate(jira):
+            jirasimplelib.read_story_details(jira, "BENCH-1")
+            jirasimplelib.read_story_details(jira, "BENCH-1")
+        self.assertWithinBudget("read_story_details", "same issue twice in one run", fake)
+
+    def test_write_clears_identity_map(self):
+        jira, fake = self.connect(issues=10)
+        with jirasimplelib.RunPlan().activate(jira):
+            jirasimplelib.read_story_details(jira, "BENCH-1")
+            jirasimplelib.update_story_summary(jira, "BENCH-1", "Renamed")
+            fake.reset_requests()
+            story = jirasimplelib._get_issue(jira, "BENCH-1")
+        self.assertEqual(story.fields.summary, "Renamed")
+        self.assertEqual(fake.request_count(), 1)
+
+    def test_create_epic_dispatched_once(self):
+        jira, fake = self.connect(issues=1)
+        before = len(fake.issues)
+        jirasimplelib.run_commands(jira, self.parse("--create-epic", "BENCH", "Epic", "Summary"))
+        self.assertEqual(len(fake.issues), before + 1)
+        self.assertWithinBudget("run_commands", "--create-epic", fake)
+
+    def test_create_sprint_on_its_board(self):
+        jira, fake = self.connect(issues=10)
+        before = set(fake.sprints)
+        jirasimplelib.run_commands(jira, self.parse("--create-sprint", "1", "Next"))
+        (sprint_id,) = set(fake.sprints) - before
+        self.assertEqual((fake.sprints[sprint_id]["name"], fake.sprints[sprint_id]["originBoardId"]), ("Next", 1))
+        self.assertWithinBudget("run_commands", "--create-sprint", fake)
+
+
+
+class TestWatchRequestBudgets(RequestBudgetTestCase):
+    def test_poll_reads_only_updated_issues(self):
+        jira, fake = self.connect(issues=1000)
+        watcher = jirasimplelib.IssueWatcher(
+            jira, "project = BENCH AND issuetype in (Bug, Task, Story)"
+        )
+        watcher.tick()
+        jirasimplelib.update_story_summary(jira, "BENCH-7", "Changed")
+        fake.reset_requests()
+        self.assertEqual(watcher.tick(), {"BENCH-7"})
+        self.assertEqual(watcher.store.get("BENCH-7").summary, "Changed")
+        self.assertWithinBudget("IssueWatcher.tick", "1000 issues, 1 updated", fake)
+
+
+
+class TestWebhookRequestBudgets(RequestBudgetTestCase):
+    def setUp(self):
+        super().setUp()
+        self.jira, self.fake = self.connect(issues=1000, sprint_size=200)
+        self.store = jirasimplelib.sync_issue_store(
+            self.jira, jirasimplelib.IssueStore(), ["BENCH"], [1]
+        )
+        self.receiver = jirasimplelib.WebhookReceiver(self.store).start()
+        jirasimplelib.use_issue_store(self.store)
+
+    def tearDown(self):
+        jirasimplelib.use_issue_store(None)
+        self.receiver.stop()
+        super().tearDown()
+
+    def post_update(self, issue_key):
+        issue = self.fake.render_issue(self.fake.issues[issue_key])
+        requests.post(self.receiver.url, json={"webhookEvent": "jira:issue_updated", "issue": issue})
+
+    def test_workload_report(self):
+        issue = self.fake.issues["BENCH-3"]
+        issue.status, issue.assignee, issue.points = "Done", 0, 13
+        self.post_update("BENCH-3")
+        self.fake.reset_requests()
+        report = jirasimplelib.workload_report(self.jira, "BENCH")
+        self.assertEqual(sum(sum(row[c] for c in ("open", "in_progress", "done")) for row in report.values()), 1000)
+        self.assertGreaterEqual(report["User 0"]["done_points"], 13)
+        self.assertWithinBudget("workload_report", "synced store, after webhook", self.fake)
+
+    def test_get_stories_for_project(self):
+        self.fake.issues["BENCH-3"].summary = "Changed in Jira"
+        self.post_update("BENCH-3")
+        self.fake.reset_requests()
+        stories = jirasimplelib.get_stories_for_project(self.jira, "BENCH")
+        self.assertIn("Changed in Jira", [story.summary for story in stories])
+        self.assertWithinBudget("get_stories_for_project", "synced store, after webhook", self.fake)
+
+    def test_get_stories_in_sprint(self):
+        issue = next(i for i in self.fake.issues.values() if i.issue_type == "Task" and i.sprint == 2)
+        issue.sprint = 1
+        self.post_update(issue.key)
+        self.fake.reset_requests()
+        self.assertIn(issue.key, jirasimplelib.get_stories_in_sprint(self.jira, 1))
+        self.assertWithinBudget("get_stories_in_sprint", "synced store, after webhook", self.fake)
+
+    def test_my_stories(self):
+        expected = [story.key for story in jirasimplelib.search_issue_records(
+            self.jira, "project = BENCH AND assignee = user-1 AND issuetype = Task", ()
+        )]
+        self.fake.reset_requests()
+        stories = jirasimplelib.my_stories(self.jira, "BENCH", "user-1")
+        self.assertEqual([story.key for story in stories], expected)
+        self.assertWithinBudget("my_stories", "synced store, after webhook", self.fake)
+
+    def test_my_stories_with_stale_store(self):
+        self.store.max_age = 60
+        self.store.scopes[("project", "BENCH")] -= 120
+        self.fake.reset_requests()
+        jirasimplelib.my_stories(self.jira, "BENCH", "user-1")
+        self.assertWithinBudget("my_stories", "store synced too long ago", self.fake)
+
+    def test_status_breakdown(self):
+        before = jirasimplelib.status_breakdown(self.jira, "BENCH")
+        issue = self.fake.issues["BENCH-5"]
+        issue.status = "Done" if issue.status != "Done" else "To Do"
+        self.post_update("BENCH-5")
+        self.fake.reset_requests()
+        after = jirasimplelib.status_breakdown(self.jira, "BENCH")
+        self.assertEqual(sum(after.values()), sum(before.values()))
+        self.assertNotEqual(after, before)
+        self.assertWithinBudget("status_breakdown", "synced store, after webhook", self.fake)
+
+
+
+class TestSearchIndexRequestBudgets(RequestBudgetTestCase):
+    def test_sync_search_index(self):
+        jira, fake = self.connect(issues=1000)
+        index = jirasimplelib.IssueSearchIndex(":memory:")
+        self.assertEqual(jirasimplelib.sync_search_index(jira, index, ["BENCH"]), 1000)
+        self.assertWithinBudget("sync_search_index", "1000 issues", fake)
+        fake.issues["BENCH-7"].summary = "Quarterly reconciliation"
+        fake.issues["BENCH-7"].updated = datetime.now(timezone.utc)
+        fake.reset_requests()
+        self.assertEqual(jirasimplelib.sync_search_index(jira, index, ["BENCH"]), 1)
+        self.assertWithinBudget("sync_search_index", "1000 issues, 1 updated since last sync", fake)
+        self.assertEqual([hit["key"] for hit in index.search("reconciliation")], ["BENCH-7"])
+
+
+class TestSitesRequestBudgets(RequestBudgetTestCase):
+    def test_run_sites(self):
+        with FakeJiraServer(issues=10) as fast, FakeJiraServer(
+            issues=10, projects=("SLOW",), latency_ms=200
+        ) as slow, tempfile.TemporaryDirectory() as directory:
+            site_list = os.path.join(directory, "sites.json")
+            with open(site_list, "w") as f:
+                json.dump(
+                    [
+                        os.path.basename(fast.write_config(os.path.join(directory, "fast.json"))),
+                        {"name": "slow", "jira_url": slow.url, "user": "u", "api_token": "t"},
+                    ],
+                    f,
+                )
+            args = jirasimplelib.parse_arguments().parse_args(
+                ["--sites", site_list, "--list-projects", "--no-session"]
+            )
+            sites = jirasimplelib.load_sites(args.sites)
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                results = jirasimplelib.run_sites(sites, args)
+        self.assertEqual(results, {"127.0.0.1": True, "slow": True})
+        # Whole lines, tagged, and the fast site printed without waiting for the slow one
+        tags = [line.split(" ", 1)[0] for line in output.getvalue().splitlines()]
+        self.assertEqual(tags, sorted(tags, key=lambda tag: tag == "[slow]"))
+        self.assertEqual(set(tags), {"[127.0.0.1]", "[slow]"})
+        self.assertIn("[slow] | SLOW", output.getvalue())
+        self.assertWithinBudget("run_sites", "--list-projects, per site", fast.fake)
+        self.assertWithinBudget("run_sites", "--list-projects, per site", slow.fake)
+
+    def test_run_sites_keep_separate_journals(self):
+        with FakeJiraServer(issues=150) as first, FakeJiraServer(
+            issues=150
+        ) as second, tempfile.TemporaryDirectory() as directory:
+            sites = [
+                ("a", {"jira_url": first.url, "user": "u", "api_token": "t"}),
+                ("b", {"jira_url": second.url, "user": "u", "api_token": "t"}),
+            ]
+            args = jirasimplelib.parse_arguments().parse_args(
+                ["--delete-all-stories", "BENCH", "--journal-dir", directory, "--no-session"]
+            )
+            with contextlib.redirect_stdout(io.StringIO()):
+                results = jirasimplelib.run_sites(sites, args)
+            self.assertEqual(results, {"a": True, "b": True})
+            for name, server in (("a", first), ("b", second)):
+                path = jirasimplelib.journal_path(
+                    os.path.join(directory, name), "delete_all_stories_in_project", "BENCH"
+                )
+                with open(path) as f:
+                    entries = [json.loads(line) for line in f]
+                planned = entries[0]["items"]
+                self.assertTrue(planned)
+                self.assertEqual(entries[-1]["event"], "finished")
+                self.assertEqual(
+                    sum(len(entry["items"]) for entry in entries if entry["event"] == "completed"),
+                    len(planned),
+                )
+                self.assertFalse(set(planned) & set(server.fake.issues))
+
+    def test_run_sites_back_up_into_site_directories(self):
+        with FakeJiraServer(issues=100) as first, FakeJiraServer(
+            issues=50
+        ) as second, tempfile.TemporaryDirectory() as directory:
+            sites = [
+                ("a", {"jira_url": first.url, "user": "u", "api_token": "t"}),
+                ("b", {"jira_url": second.url, "user": "u", "api_token": "t"}),
+            ]
+            args = jirasimplelib.parse_arguments().parse_args(
+                ["--backup", directory, "--no-session"]
+            )
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.assertEqual(jirasimplelib.run_sites(sites, args), {"a": True, "b": True})
+            for name, count in (("a", 100), ("b", 50)):
+                site_directory = os.path.join(directory, name)
+                with open(os.path.join(site_directory, "manifest.json")) as f:
+                    files = json.load(f)["files"]
+                self.assertEqual(files["epics"]["count"] + files["issues"]["count"], count)
+                self.assertEqual(jirasimplelib.verify_backup(site_directory), [])
+                self.assertFalse([name for name in os.listdir(site_directory) if name.endswith(".tmp")])
+
+
+class TestSessionRequestBudgets(RequestBudgetTestCase):
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.session_dir = os.path.join(directory.name, "sessions")
+        self.server = FakeJiraServer(issues=10)
+        self.server.__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+        self.config = self.server.write_config(os.path.join(directory.name, "config.json"))
+
+    def test_saved_session_skips_handshake(self):
+        fake = self.server.fake
+        jira = jirasimplelib.create_jira_connection(self.config, session_dir=self.session_dir)
+        self.assertWithinBudget("create_jira_connection", "first run", fake)
+        (path,) = os.listdir(self.session_dir)
+        self.assertEqual(os.stat(os.path.join(self.session_dir, path)).st_mode & 0o777, 0o600)
+        fake.reset_requests()
+        jira = jirasimplelib.create_jira_connection(self.config, session_dir=self.session_dir)
+        self.assertEqual(jira.deploymentType, "Cloud")
+        self.assertEqual(jira._version, (1001, 0, 0))
+        self.assertWithinBudget("create_jira_connection", "saved session", fake)
+        fake.reset_requests()
+        sprint_id = jirasimplelib.create_sprint(
+            jira.server_url, None, None, 1, "New sprint", jira=jira
+        )
+        self.assertIsNotNone(sprint_id)
+        self.assertWithinBudget("create_sprint", "1 sprint, connection session", fake)
+
+    def test_rejected_credentials_clear_saved_session(self):
+        jirasimplelib.create_jira_connection(self.config, session_dir=self.session_dir)
+        jira = jirasimplelib.create_jira_connection(self.config, session_dir=self.session_dir)
+        self.assertTrue(os.listdir(self.session_dir))
+        unauthorized = (401, {"Content-Type": "application/json"}, b'{"errorMessages": ["Unauthorized"]}')
+        with patch.object(
+            self.server.fake, "handle", return_value=unauthorized
+        ), contextlib.redirect_stdout(io.StringIO()):
+            self.assertIsNone(jirasimplelib.list_projects(jira))
+        jirasimplelib.save_session(jira)
+        self.assertEqual(os.listdir(self.session_dir), [])
+
+
+class TestSprintPlanRequestBudgets(RequestBudgetTestCase):
+    def setUp(self):
+        super().setUp()
+        self.now = datetime(2024, 4, 10, tzinfo=timezone.utc)
+        self.spec = {
+            "boards": list(range(1, 41)),
+            "name": "Q2 Sprint {number}",
+            "start": "2024-04-01",
+            "count": 6,
+            "start_current": True,
+            "close_ended": True,
+        }
+
+    def test_plan_sprints(self):
+        jira, fake = self.connect(issues=10, projects=[f"P{n}" for n in range(40)])
+        results = jirasimplelib.plan_sprints(jira, self.spec, now=self.now)
+        self.assertEqual(len(results), 40)
+        self.assertEqual(results[7]["created"], [f"Q2 Sprint {n}" for n in range(1, 7)])
+        self.assertEqual(results[7]["started"], ["Q2 Sprint 1"])
+        self.assertWithinBudget("plan_sprints", "40 boards x 6 sprints", fake)
+        fake.reset_requests()
+        results = jirasimplelib.plan_sprints(jira, self.spec, now=self.now)
+        self.assertEqual(len(results[7]["existing"]), 6)
+        self.assertEqual(results[7]["created"] + results[7]["started"], [])
+        self.assertWithinBudget("plan_sprints", "40 boards, already planned", fake)
+
+    def test_plan_board_sprints_renames_and_closes(self):
+        jira, fake = self.connect(issues=400, sprint_size=200)
+        # Sprint 1 is active and ended long ago, Sprint 2 is future: move it to the first planned slot
+        fake.sprints[2]["startDate"] = "2024-04-01T00:00:00.000+0000"
+        result = jirasimplelib.plan_board_sprints(jira, dict(self.spec, count=2), 1, self.now)
+        self.assertEqual(result["closed"], ["BENCH Sprint 1"])
+        self.assertEqual(result["renamed"], ["Q2 Sprint 1"])
+        self.assertEqual(result["created"], ["Q2 Sprint 2"])
+        self.assertEqual(result["started"], ["Q2 Sprint 1"])
+        self.assertEqual(
+            [(sprint["name"], sprint["state"]) for sprint in fake.sprints.values()],
+            [("BENCH Sprint 1", "closed"), ("Q2 Sprint 1", "active"), ("Q2 Sprint 2", "future")],
+        )
+
+    def test_bad_board_override_rejects_the_spec(self):
+        jira, fake = self.connect(issues=10, projects=["P1", "P2"])
+        for board in ({"name": "No id {number}"}, {"id": 2, "start": "April"}):
+            spec = dict(self.spec, boards=[1, board])
+            self.assertIsNone(jirasimplelib.plan_sprints(jira, spec, now=self.now))
+        self.assertEqual(fake.request_count(), 0)
+
+
+class TestBoardBacklogRequestBudgets(RequestBudgetTestCase):
+    def test_board_issue_records(self):
+        jira, fake = self.connect(issues=5000, sprint_size=200)
+        backlog = list(jirasimplelib.board_issue_records(jira, 1, backlog=True))
+        self.assertEqual(len(backlog), 3032)
+        ranks = [issue.rank for issue in backlog]
+        self.assertEqual(ranks, sorted(ranks))
+        self.assertWithinBudget("board_issue_records", "backlog of 3032 issues", fake)
+
+    def test_move_backlog_to_sprint(self):
+        jira, fake = self.connect(issues=5000, sprint_size=200)
+        top = [issue.key for issue in jirasimplelib.board_issue_records(jira, 1, True, (), page_size=120)]
+        fake.reset_requests()
+        self.assertEqual(jirasimplelib.move_backlog_to_sprint(jira, 1, 25, 120), 120)
+        self.assertWithinBudget("move_backlog_to_sprint", "120 issues", fake)
+        self.assertEqual({fake.issues[key].sprint for key in top[:120]}, {25})
+        self.assertEqual(next(jirasimplelib.board_issue_records(jira, 1, True)).key, top[120])
+
+
+class TestChangelogRequestBudgets(RequestBudgetTestCase):
+    def test_cycle_time_report(self):
+        jira, fake = self.connect(issues=1000)
+        cache = jirasimplelib.ChangelogCache(":memory:")
+        report = jirasimplelib.cycle_time_report(jira, "BENCH", days=100000, cache=cache)
+        # The fake moves issues to In Progress 2 hours after creation and to Done 30 hours later
+        self.assertEqual(report["cycle_time"]["issues"], 304)
+        self.assertAlmostEqual(report["cycle_time"]["median"], 30 / 24)
+        self.assertAlmostEqual(report["lead_time"]["p85"], 32 / 24)
+        self.assertWithinBudget("cycle_time_report", "1000 issues, 304 done", fake)
+        done = next(key for key, issue in fake.issues.items() if issue.status == "Done")
+        fake._touch(fake.issues[done])
+        fake.reset_requests()
+        report = jirasimplelib.cycle_time_report(jira, "BENCH", days=100000, cache=cache)
+        self.assertEqual(report["cycle_time"]["issues"], 304)
+        self.assertWithinBudget("cycle_time_report", "changelogs cached, 1 updated", fake)
+        # Updated today, but done in 2024
+        report = jirasimplelib.cycle_time_report(jira, "BENCH", days=182, cache=cache)
+        self.assertEqual(report["cycle_time"]["issues"], 0)
+
+    def test_cycle_time_command_default_days(self):
+        jira, fake = self.connect(issues=1000)
+        # The dataset is from 2024; only this issue falls in the default 182 days
+        done = next(key for key, issue in fake.issues.items() if issue.status == "Done")
+        fake._touch(fake.issues[done])
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "changelogs.sqlite")
+            args = jirasimplelib.parse_arguments().parse_args(
+                ["--cycle-time", "BENCH", "--changelog-cache", path]
+            )
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                jirasimplelib.run_commands(jira, args)
+            cache = jirasimplelib.ChangelogCache(path)
+            self.assertEqual(len(cache), 1)
+            cache.close()
+        self.assertIn("Cycle Time for BENCH, last 182 days:", output.getvalue())
+        self.assertIn("| Cycle time |", output.getvalue())
+
+
+class TestWorkloadRequestBudgets(RequestBudgetTestCase):
+    def test_workload_report(self):
+        jira, fake = self.connect(issues=1000, sprint_size=200)
+        report = jirasimplelib.workload_report(jira, "BENCH")
+        expected = {}
+        for issue in fake.issues.values():
+            name = fake.users[issue.assignee]["displayName"] if issue.assignee is not None else None
+            row = expected.setdefault(name, [0, 0])
+            row[0] += 1
+            row[1] += issue.points or 0
+        self.assertEqual(
+            {name: [row["open"] + row["in_progress"] + row["done"], row["points"]] for name, row in report.items()},
+            expected,
+        )
+        self.assertWithinBudget("workload_report", "1000 issues", fake)
+        fake.reset_requests()
+        report = jirasimplelib.workload_report(jira, sprint_id=2)
+        self.assertEqual(sum(row["done"] for row in report.values()), sum(
+            1 for issue in fake.issues.values() if issue.sprint == 2 and issue.status == "Done"
+        ))
+        self.assertWithinBudget("workload_report", "sprint of 200 issues", fake)
+
+    def test_workload_commands_share_one_json_file(self):
+        jira, fake = self.connect(issues=1000, sprint_size=200)
+        counts = jirasimplelib.workload(jira, "BENCH")
+        self.assertEqual(sum(counts.values()), 1000)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "workload.json")
+            args = jirasimplelib.parse_arguments().parse_args(
+                ["--workload", "BENCH", "--sprint-workload", "2", "--workload-json", path]
+            )
+            jirasimplelib.run_commands(jira, args)
+            with open(path) as f:
+                rows = json.load(f)
+        project_rows = [row for row in rows if row.get("project") == "BENCH"]
+        sprint_rows = [row for row in rows if row.get("sprint") == "2"]
+        self.assertEqual(len(project_rows) + len(sprint_rows), len(rows))
+        self.assertEqual({row["assignee"]: row["open"] + row["in_progress"] + row["done"] for row in project_rows}, counts)
+        self.assertEqual(
+            sum(row["open"] + row["in_progress"] + row["done"] for row in sprint_rows),
+            sum(1 for issue in fake.issues.values() if issue.sprint == 2),
+        )
+
+
+class TestCloneRequestBudgets(RequestBudgetTestCase):
+    def test_clone_project(self):
+        jira, fake = self.connect(issues=1000, sprint_size=200)
+        with contextlib.redirect_stdout(io.StringIO()):
+            key_map = jirasimplelib.clone_project(jira, "BENCH", "COPY")
+        self.assertEqual(len(key_map), 1000)
+        for source, target in key_map.items():
+            original, copy = fake.issues[source], fake.issues[target]
+            self.assertEqual((copy.project, copy.summary, copy.issue_type), ("COPY", original.summary, original.issue_type))
+            self.assertEqual(copy.epic, key_map.get(original.epic))
+        copied_sprints = {fake.sprints[fake.issues[target].sprint]["name"] for target in key_map.values() if fake.issues[target].sprint}
+        self.assertEqual(copied_sprints, {f"BENCH Sprint {n}" for n in range(1, 6)})
+        self.assertWithinBudget("clone_project", "1000 issues", fake)
+
+    def test_clone_project_with_kanban_board(self):
+        jira, fake = self.connect(issues=200, sprint_size=50)
+        fake.boards[1]["type"] = "kanban"
+        sprints = len(fake.sprints)
+        with contextlib.redirect_stdout(io.StringIO()):
+            key_map = jirasimplelib.clone_project(jira, "BENCH", "COPY")
+        self.assertEqual(len(key_map), 200)
+        self.assertEqual(len(fake.sprints), sprints)
+        self.assertFalse([target for target in key_map.values() if fake.issues[target].sprint])
+
+    def test_clone_project_without_target_board(self):
+        jira, fake = self.connect(issues=200, sprint_size=50)
+        sprints = len(fake.sprints)
+        with contextlib.redirect_stdout(io.StringIO()), patch("jirasimplelib.create_board", return_value=None):
+            with patch("jirasimplelib.logging.error") as error:
+                key_map = jirasimplelib.clone_project(jira, "BENCH", "COPY")
+        self.assertEqual(len(key_map), 200)
+        self.assertEqual(len(fake.sprints), sprints)
+        error.assert_called_once_with("Could not create a board for COPY; its sprints were not cloned.")
+
+    def test_resumed_clone_creates_nothing_twice(self):
+        jira, fake = self.connect(issues=1000, sprint_size=200)
+        bulk_create = jirasimplelib._bulk_create
+        calls = []
+
+        def failing_bulk_create(*args):
+            calls.append(1)
+            if len(calls) == 6:
+                raise jirasimplelib.JIRAError("Service unavailable", status_code=503)
+            return bulk_create(*args)
+
+        with tempfile.TemporaryDirectory() as directory, contextlib.redirect_stdout(io.StringIO()):
+            path = os.path.join(directory, "clone.jsonl")
+            with patch("jirasimplelib._bulk_create", side_effect=failing_bulk_create):
+                self.assertIsNone(jirasimplelib.clone_project(jira, "BENCH", "COPY", journal=jirasimplelib.CloneJournal(path)))
+            created = sum(1 for issue in fake.issues.values() if issue.project == "COPY")
+            self.assertGreater(created, 0)
+            key_map = jirasimplelib.clone_project(
+                jira, "BENCH", "COPY", journal=jirasimplelib.CloneJournal(path, resume=True)
+            )
+        self.assertEqual(len(key_map), 1000)
+        self.assertEqual(sum(1 for issue in fake.issues.values() if issue.project == "COPY"), 1000)
+
+
+
+class TestBackupRequestBudgets(RequestBudgetTestCase):
+    def test_backup_instance(self):
+        jira, fake = self.connect(issues=1000, sprint_size=200)
+        commented = list(fake.issues.values())[::100]
+        fake.boards[2] = {"id": 2, "name": "BENCH kanban", "type": "kanban", "location": {"projectKey": "BENCH"}}
+        for issue in commented:
+            issue.comments = [(0, "First", issue.created), (1, "Second", issue.updated)]
+        with tempfile.TemporaryDirectory() as directory:
+            manifest = jirasimplelib.backup_instance(jira, directory, prefetch=50)
+            self.assertWithinBudget("backup_instance", "1000 issues", fake)
+            files = manifest["files"]
+            epics = sum(1 for issue in fake.issues.values() if issue.issue_type == "Epic")
+            self.assertEqual(files["epics"]["count"], epics)
+            self.assertEqual(files["issues"]["count"], 1000 - epics)
+            self.assertEqual(files["sprints"]["count"], len(fake.sprints))
+            self.assertEqual(files["comments"]["count"], 2 * len(commented))
+            for entity, entry in files.items():
+                path = os.path.join(directory, entry["file"])
+                with open(path, "rb") as f:
+                    self.assertEqual(hashlib.sha256(f.read()).hexdigest(), entry["sha256"])
+                with gzip.open(path, "rt") as f:
+                    lines = [json.loads(line) for line in f]
+                self.assertEqual(len(lines), entry["count"], entity)
+            self.assertEqual(lines[0]["name"], "BENCH Sprint 1")
+            with gzip.open(os.path.join(directory, files["comments"]["file"]), "rt") as f:
+                self.assertEqual(json.loads(f.readline())["issueKey"], commented[0].key)
+            self.assertEqual(jirasimplelib.verify_backup(directory), [])
+            with open(os.path.join(directory, files["issues"]["file"]), "ab") as f:
+                f.write(b"\0")
+            self.assertEqual(jirasimplelib.verify_backup(directory), [files["issues"]["file"]])
+
+
+if __name__ == "__main__":
+    unittest.main()